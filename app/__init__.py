@@ -19,17 +19,34 @@ def create_app(config_name='default'):
     db.init_app(app)
     CORS(app, origins=app.config['CORS_ORIGINS'])
     
+    from app.analytics import cache as analytics_cache
+    analytics_cache.init_app(app)
+    
+    from app.analytics import coalesce as analytics_coalesce
+    analytics_coalesce.init_app(app)
+    
+    from app.events import broker as event_broker
+    event_broker.init_app(app)
+    
+    from app import compression
+    compression.init_app(app)
+    
     # Configure JSON handling
+    from app.serialization import FastJSONProvider
+    app.json = FastJSONProvider(app)
     app.config['JSON_SORT_KEYS'] = False
+    app.json.sort_keys = app.config['JSON_SORT_KEYS']
     app.json.ensure_ascii = False
     
     # Register blueprints
     from app.auth.routes import auth_bp
     from app.booking.routes import booking_bp
     from app.analytics.routes import analytics_bp
+    from app.events.routes import events_bp
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(booking_bp, url_prefix='/api/bookings')
     app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
     
     # Additional blueprints will be added in later tasks
     # Analytics blueprint is now registered above
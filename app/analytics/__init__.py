@@ -1,5 +1,7 @@
 """Analytics module for booking system data processing and reporting."""
 from .analytics_service import AnalyticsService
+from .filters import BookingFilter
 from .routes import analytics_bp
+from . import commands
 
-__all__ = ['AnalyticsService', 'analytics_bp']
\ No newline at end of file
+__all__ = ['AnalyticsService', 'BookingFilter', 'analytics_bp']
\ No newline at end of file
@@ -1,15 +1,42 @@
 """Analytics data processing service for booking system."""
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from sqlalchemy import func, extract, and_, or_
+import uuid
+from contextlib import contextmanager, suppress
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional, Sequence, Tuple
+from flask import current_app
+from sqlalchemy import select, Column, MetaData, Table, Integer, String, DateTime, Float, Numeric
 from app import db
 from app.models.booking import Booking
+from app.analytics.cache import cached_result
+from app.analytics.filters import BookingFilter
+from app.analytics.sources import RowSource, RollupSource, rollup_compatible, rollup_relation
+from app.analytics.columnar import columnar_available, columnar_compatible, get_snapshot
+from app.analytics.export import EXPORT_BATCH_SIZE
+
+
+# Columns copied into the per-request dashboard base table
+DASHBOARD_BASE_COLUMNS = ('id', 'created_at', 'created_year', 'created_month', 'created_quarter',
+                          'project_name', 'type', 'status', 'amount', 'tax_gst', 'area')
+
+# Columns written for each tabular analytics export
+EXPORT_COLUMNS = {
+    'trends': ('period', 'year', 'month', 'booking_count', 'total_revenue', 'total_area',
+               'avg_booking_value', 'non_cancelled_count'),
+    'projects': ('project_name', 'booking_count', 'total_revenue', 'total_area', 'avg_revenue',
+                 'active_complete_count', 'success_rate'),
+    'types': ('property_type', 'booking_count', 'total_revenue', 'total_area', 'avg_revenue',
+              'avg_area', 'revenue_per_sqft'),
+}
+
+# Booking columns written by the raw bookings export
+BOOKING_EXPORT_COLUMNS = tuple(column.name for column in Booking.__table__.columns)
 
 
 class AnalyticsService:
     """Service class for processing booking data into analytics insights."""
     
     @staticmethod
+    @cached_result
     def get_kpi_summary(start_date: Optional[datetime] = None, 
                        end_date: Optional[datetime] = None,
                        filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -24,44 +51,42 @@ class AnalyticsService:
         Returns:
             Dictionary containing KPI metrics
         """
-        # Build base query
-        query = Booking.query
-        
-        # Apply date filters
-        if start_date:
-            query = query.filter(Booking.created_at >= start_date)
-        if end_date:
-            query = query.filter(Booking.created_at <= end_date)
-        
-        # Apply additional filters
-        if filters:
-            query = AnalyticsService._apply_filters(query, filters)
-        
-        # Calculate basic counts
-        total_bookings = query.count()
-        active_bookings = query.filter(Booking.status == 'active').count()
-        completed_bookings = query.filter(Booking.status == 'complete').count()
-        cancelled_bookings = query.filter(Booking.status == 'cancelled').count()
-        
-        # Calculate revenue metrics
-        revenue_query = query.filter(Booking.status.in_(['active', 'complete']))
-        total_revenue = db.session.query(func.sum(Booking.amount)).filter(
-            Booking.id.in_(revenue_query.with_entities(Booking.id))
-        ).scalar() or 0
-        
-        total_tax = db.session.query(func.sum(Booking.tax_gst)).filter(
-            Booking.id.in_(revenue_query.with_entities(Booking.id))
-        ).scalar() or 0
+        spec = BookingFilter(start_date, end_date, filters)
+        snapshot = AnalyticsService._columnar_snapshot(spec)
+        if snapshot is not None:
+            return AnalyticsService._format_kpi_summary(snapshot.kpi_row(spec))
+        return AnalyticsService._kpi_summary(*AnalyticsService._source_for(spec))
+    
+    @staticmethod
+    def _kpi_summary(source, conditions: List[Any]) -> Dict[str, Any]:
+        """Compute KPI metrics over ``source`` rows matching ``conditions``."""
+        # Compute every count and sum in a single pass over the filtered rows
+        revenue_statuses = source.c.status.in_(['active', 'complete'])
+        totals = db.session.query(
+            source.count().label('total_bookings'),
+            source.count(source.c.status == 'active').label('active_bookings'),
+            source.count(source.c.status == 'complete').label('completed_bookings'),
+            source.count(source.c.status == 'cancelled').label('cancelled_bookings'),
+            source.total('amount', revenue_statuses).label('total_revenue'),
+            source.total('tax_gst', revenue_statuses).label('total_tax'),
+            source.total('area').label('total_area')
+        ).filter(*conditions).one()
+        return AnalyticsService._format_kpi_summary(totals)
+    
+    @staticmethod
+    def _format_kpi_summary(totals) -> Dict[str, Any]:
+        """Shape a KPI aggregate row into the KPI summary."""
+        total_bookings = totals.total_bookings
+        active_bookings = totals.active_bookings
+        completed_bookings = totals.completed_bookings
+        cancelled_bookings = totals.cancelled_bookings
+        total_revenue = totals.total_revenue or 0
+        total_tax = totals.total_tax or 0
+        total_area = totals.total_area or 0
         
         # Calculate average metrics
         avg_booking_value = (total_revenue / total_bookings) if total_bookings > 0 else 0
         completion_rate = (completed_bookings / total_bookings * 100) if total_bookings > 0 else 0
-        
-        # Calculate area metrics
-        total_area = db.session.query(func.sum(Booking.area)).filter(
-            Booking.id.in_(query.with_entities(Booking.id))
-        ).scalar() or 0
-        
         avg_area = (total_area / total_bookings) if total_bookings > 0 else 0
         
         return {
@@ -80,6 +105,7 @@ class AnalyticsService:
         }
     
     @staticmethod
+    @cached_result
     def get_monthly_trends(start_date: Optional[datetime] = None,
                           end_date: Optional[datetime] = None,
                           filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
@@ -95,42 +121,37 @@ class AnalyticsService:
             List of monthly trend data points
         """
         # Default to last 12 months if no dates provided
-        if not end_date:
-            end_date = datetime.utcnow()
-        if not start_date:
-            start_date = end_date - timedelta(days=365)
-        
-        # Build query
-        query = Booking.query.filter(
-            and_(
-                Booking.created_at >= start_date,
-                Booking.created_at <= end_date
-            )
-        )
-        
-        # Apply additional filters
-        if filters:
-            query = AnalyticsService._apply_filters(query, filters)
-        
+        spec = BookingFilter(start_date, end_date, filters).with_default_window()
+        snapshot = AnalyticsService._columnar_snapshot(spec)
+        if snapshot is not None:
+            return AnalyticsService._format_monthly_trends(snapshot.monthly_rows(spec))
+        return AnalyticsService._monthly_trends(*AnalyticsService._source_for(spec))
+    
+    @staticmethod
+    def _monthly_trends(source, conditions: List[Any]) -> List[Dict[str, Any]]:
+        """Group ``source`` rows matching ``conditions`` by calendar month."""
         # Group by year and month
         monthly_data = db.session.query(
-            extract('year', Booking.created_at).label('year'),
-            extract('month', Booking.created_at).label('month'),
-            func.count(Booking.id).label('booking_count'),
-            func.sum(Booking.amount).label('total_revenue'),
-            func.sum(Booking.area).label('total_area'),
-            func.count(func.nullif(Booking.status, 'cancelled')).label('non_cancelled_count')
+            source.year.label('year'),
+            source.month.label('month'),
+            source.count().label('booking_count'),
+            source.total('amount').label('total_revenue'),
+            source.total('area').label('total_area'),
+            source.count(source.c.status != 'cancelled').label('non_cancelled_count')
         ).filter(
-            Booking.id.in_(query.with_entities(Booking.id))
+            *conditions
         ).group_by(
-            extract('year', Booking.created_at),
-            extract('month', Booking.created_at)
+            source.year,
+            source.month
         ).order_by(
-            extract('year', Booking.created_at),
-            extract('month', Booking.created_at)
+            source.year,
+            source.month
         ).all()
-        
-        # Format results
+        return AnalyticsService._format_monthly_trends(monthly_data)
+    
+    @staticmethod
+    def _format_monthly_trends(monthly_data) -> List[Dict[str, Any]]:
+        """Shape monthly aggregate rows into trend data points."""
         trends = []
         for data in monthly_data:
             month_str = f"{int(data.year)}-{int(data.month):02d}"
@@ -148,6 +169,7 @@ class AnalyticsService:
         return trends
     
     @staticmethod
+    @cached_result
     def get_project_distribution(start_date: Optional[datetime] = None,
                                end_date: Optional[datetime] = None,
                                filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
@@ -162,36 +184,36 @@ class AnalyticsService:
         Returns:
             List of project distribution data
         """
-        # Build query
-        query = Booking.query
-        
-        # Apply date filters
-        if start_date:
-            query = query.filter(Booking.created_at >= start_date)
-        if end_date:
-            query = query.filter(Booking.created_at <= end_date)
-        
-        # Apply additional filters
-        if filters:
-            query = AnalyticsService._apply_filters(query, filters)
-        
+        spec = BookingFilter(start_date, end_date, filters)
+        snapshot = AnalyticsService._columnar_snapshot(spec)
+        if snapshot is not None:
+            return AnalyticsService._format_project_distribution(snapshot.project_rows(spec))
+        return AnalyticsService._project_distribution(*AnalyticsService._source_for(spec))
+    
+    @staticmethod
+    def _project_distribution(source, conditions: List[Any]) -> List[Dict[str, Any]]:
+        """Group ``source`` rows matching ``conditions`` by project."""
         # Group by project
         project_data = db.session.query(
-            Booking.project_name,
-            func.count(Booking.id).label('booking_count'),
-            func.sum(Booking.amount).label('total_revenue'),
-            func.sum(Booking.area).label('total_area'),
-            func.avg(Booking.amount).label('avg_revenue'),
-            func.count(func.nullif(Booking.status, 'cancelled')).label('active_complete_count')
+            source.c.project_name,
+            source.count().label('booking_count'),
+            source.total('amount').label('total_revenue'),
+            source.total('area').label('total_area'),
+            source.average('amount').label('avg_revenue'),
+            source.count(source.c.status != 'cancelled').label('active_complete_count')
         ).filter(
-            Booking.id.in_(query.with_entities(Booking.id))
+            *conditions
         ).group_by(
-            Booking.project_name
+            source.c.project_name
         ).order_by(
-            func.count(Booking.id).desc()
+            source.count().desc(),
+            source.c.project_name
         ).all()
-        
-        # Format results
+        return AnalyticsService._format_project_distribution(project_data)
+    
+    @staticmethod
+    def _format_project_distribution(project_data) -> List[Dict[str, Any]]:
+        """Shape per-project aggregate rows into distribution entries."""
         distribution = []
         for data in project_data:
             distribution.append({
@@ -207,6 +229,7 @@ class AnalyticsService:
         return distribution
     
     @staticmethod
+    @cached_result
     def get_status_distribution(start_date: Optional[datetime] = None,
                               end_date: Optional[datetime] = None,
                               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
@@ -221,35 +244,35 @@ class AnalyticsService:
         Returns:
             List of status distribution data
         """
-        # Build query
-        query = Booking.query
-        
-        # Apply date filters
-        if start_date:
-            query = query.filter(Booking.created_at >= start_date)
-        if end_date:
-            query = query.filter(Booking.created_at <= end_date)
-        
-        # Apply additional filters (excluding status filter to show all statuses)
-        if filters:
-            status_filters = {k: v for k, v in filters.items() if k != 'status'}
-            query = AnalyticsService._apply_filters(query, status_filters)
-        
+        # Exclude the status filter to show all statuses
+        spec = BookingFilter(start_date, end_date, filters).without('status')
+        snapshot = AnalyticsService._columnar_snapshot(spec)
+        if snapshot is not None:
+            return AnalyticsService._format_status_distribution(snapshot.status_rows(spec))
+        return AnalyticsService._status_distribution(*AnalyticsService._source_for(spec))
+    
+    @staticmethod
+    def _status_distribution(source, conditions: List[Any]) -> List[Dict[str, Any]]:
+        """Group ``source`` rows matching ``conditions`` by booking status."""
         # Group by status
         status_data = db.session.query(
-            Booking.status,
-            func.count(Booking.id).label('booking_count'),
-            func.sum(Booking.amount).label('total_revenue'),
-            func.avg(Booking.amount).label('avg_revenue')
+            source.c.status,
+            source.count().label('booking_count'),
+            source.total('amount').label('total_revenue'),
+            source.average('amount').label('avg_revenue')
         ).filter(
-            Booking.id.in_(query.with_entities(Booking.id))
+            *conditions
         ).group_by(
-            Booking.status
+            source.c.status
         ).order_by(
-            func.count(Booking.id).desc()
+            source.count().desc(),
+            source.c.status
         ).all()
-        
-        # Format results
+        return AnalyticsService._format_status_distribution(status_data)
+    
+    @staticmethod
+    def _format_status_distribution(status_data) -> List[Dict[str, Any]]:
+        """Shape per-status aggregate rows into distribution entries."""
         distribution = []
         status_labels = {
             'active': 'Active',
@@ -269,6 +292,7 @@ class AnalyticsService:
         return distribution
     
     @staticmethod
+    @cached_result
     def get_property_type_analysis(start_date: Optional[datetime] = None,
                                  end_date: Optional[datetime] = None,
                                  filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
@@ -283,36 +307,36 @@ class AnalyticsService:
         Returns:
             List of property type analysis data
         """
-        # Build query
-        query = Booking.query
-        
-        # Apply date filters
-        if start_date:
-            query = query.filter(Booking.created_at >= start_date)
-        if end_date:
-            query = query.filter(Booking.created_at <= end_date)
-        
-        # Apply additional filters
-        if filters:
-            query = AnalyticsService._apply_filters(query, filters)
-        
+        spec = BookingFilter(start_date, end_date, filters)
+        snapshot = AnalyticsService._columnar_snapshot(spec)
+        if snapshot is not None:
+            return AnalyticsService._format_property_type_analysis(snapshot.property_type_rows(spec))
+        return AnalyticsService._property_type_analysis(*AnalyticsService._source_for(spec))
+    
+    @staticmethod
+    def _property_type_analysis(source, conditions: List[Any]) -> List[Dict[str, Any]]:
+        """Group ``source`` rows matching ``conditions`` by property type."""
         # Group by property type
         type_data = db.session.query(
-            Booking.type,
-            func.count(Booking.id).label('booking_count'),
-            func.sum(Booking.amount).label('total_revenue'),
-            func.sum(Booking.area).label('total_area'),
-            func.avg(Booking.amount).label('avg_revenue'),
-            func.avg(Booking.area).label('avg_area')
+            source.c.type,
+            source.count().label('booking_count'),
+            source.total('amount').label('total_revenue'),
+            source.total('area').label('total_area'),
+            source.average('amount').label('avg_revenue'),
+            source.average('area').label('avg_area')
         ).filter(
-            Booking.id.in_(query.with_entities(Booking.id))
+            *conditions
         ).group_by(
-            Booking.type
+            source.c.type
         ).order_by(
-            func.count(Booking.id).desc()
+            source.count().desc(),
+            source.c.type
         ).all()
-        
-        # Format results
+        return AnalyticsService._format_property_type_analysis(type_data)
+    
+    @staticmethod
+    def _format_property_type_analysis(type_data) -> List[Dict[str, Any]]:
+        """Shape per-type aggregate rows into analysis entries."""
         analysis = []
         for data in type_data:
             analysis.append({
@@ -328,6 +352,7 @@ class AnalyticsService:
         return analysis
     
     @staticmethod
+    @cached_result
     def get_revenue_trends(start_date: Optional[datetime] = None,
                           end_date: Optional[datetime] = None,
                           filters: Optional[Dict[str, Any]] = None,
@@ -345,62 +370,58 @@ class AnalyticsService:
             List of revenue trend data points
         """
         # Default to last 12 months if no dates provided
-        if not end_date:
-            end_date = datetime.utcnow()
-        if not start_date:
-            start_date = end_date - timedelta(days=365)
-        
-        # Build query
-        query = Booking.query.filter(
-            and_(
-                Booking.created_at >= start_date,
-                Booking.created_at <= end_date
-            )
-        )
-        
-        # Apply additional filters
-        if filters:
-            query = AnalyticsService._apply_filters(query, filters)
-        
+        spec = BookingFilter(start_date, end_date, filters).with_default_window()
+        snapshot = AnalyticsService._columnar_snapshot(spec)
+        if snapshot is not None:
+            return AnalyticsService._format_revenue_trends(snapshot.revenue_rows(spec, group_by), group_by)
+        source, conditions = AnalyticsService._source_for(spec)
+        return AnalyticsService._revenue_trends(source, conditions, group_by)
+    
+    @staticmethod
+    def _revenue_trends(source, conditions: List[Any], group_by: str = 'month') -> List[Dict[str, Any]]:
+        """Group revenue of ``source`` rows matching ``conditions`` by period."""
         # Determine grouping based on group_by parameter
         if group_by == 'year':
-            group_fields = [extract('year', Booking.created_at).label('year')]
-            order_fields = [extract('year', Booking.created_at)]
+            group_fields = [source.year.label('year')]
+            order_fields = [source.year]
         elif group_by == 'quarter':
             group_fields = [
-                extract('year', Booking.created_at).label('year'),
-                func.ceil(extract('month', Booking.created_at) / 3).label('quarter')
+                source.year.label('year'),
+                source.quarter.label('quarter')
             ]
             order_fields = [
-                extract('year', Booking.created_at),
-                func.ceil(extract('month', Booking.created_at) / 3)
+                source.year,
+                source.quarter
             ]
         else:  # default to month
             group_fields = [
-                extract('year', Booking.created_at).label('year'),
-                extract('month', Booking.created_at).label('month')
+                source.year.label('year'),
+                source.month.label('month')
             ]
             order_fields = [
-                extract('year', Booking.created_at),
-                extract('month', Booking.created_at)
+                source.year,
+                source.month
             ]
         
         # Execute query
         revenue_data = db.session.query(
             *group_fields,
-            func.sum(Booking.amount).label('total_revenue'),
-            func.sum(Booking.tax_gst).label('total_tax'),
-            func.count(Booking.id).label('booking_count'),
-            func.avg(Booking.amount).label('avg_revenue')
+            source.total('amount').label('total_revenue'),
+            source.total('tax_gst').label('total_tax'),
+            source.count().label('booking_count'),
+            source.average('amount').label('avg_revenue')
         ).filter(
-            Booking.id.in_(query.with_entities(Booking.id))
+            *conditions
         ).group_by(
             *group_fields
         ).order_by(
             *order_fields
         ).all()
-        
-        # Format results
+        return AnalyticsService._format_revenue_trends(revenue_data, group_by)
+    
+    @staticmethod
+    def _format_revenue_trends(revenue_data, group_by: str = 'month') -> List[Dict[str, Any]]:
+        """Shape per-period revenue rows into trend data points."""
         trends = []
         for data in revenue_data:
             if group_by == 'year':
@@ -421,6 +442,155 @@ class AnalyticsService:
         
         return trends
     
+    @staticmethod
+    @cached_result
+    def get_dashboard_data(start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None,
+                          filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Get KPIs and every dashboard chart from a single filtered base relation.
+        
+        With the columnar engine enabled, every section is aggregated from the
+        in-memory snapshot. When the filters map onto the daily rollup, every
+        section reads the rollup directly. Otherwise the bookings matching the date range and
+        the non-status filters are copied once into a per-request temporary
+        table, and every section is aggregated from that narrow table instead
+        of re-scanning ``bookings``.
+        
+        Args:
+            start_date: Filter bookings from this date
+            end_date: Filter bookings until this date
+            filters: Additional filters
+            
+        Returns:
+            Dictionary with 'kpis' and 'charts' sections
+        """
+        spec = BookingFilter(start_date, end_date, filters)
+        snapshot = AnalyticsService._columnar_snapshot(spec)
+        
+        if snapshot is not None:
+            trend_spec = spec.with_default_window()
+            kpis = AnalyticsService._format_kpi_summary(snapshot.kpi_row(spec))
+            monthly_trends = AnalyticsService._format_monthly_trends(snapshot.monthly_rows(trend_spec))
+            project_distribution = AnalyticsService._format_project_distribution(snapshot.project_rows(spec))
+            property_types = AnalyticsService._format_property_type_analysis(snapshot.property_type_rows(spec))
+            status_distribution = AnalyticsService._format_status_distribution(
+                snapshot.status_rows(spec.without('status'))
+            )
+            revenue_trends = AnalyticsService._format_revenue_trends(snapshot.revenue_rows(trend_spec))
+        elif AnalyticsService._rollup_enabled() and rollup_compatible(spec):
+            trend_spec = spec.with_default_window()
+            kpis = AnalyticsService._kpi_summary(*AnalyticsService._source_for(spec))
+            monthly_trends = AnalyticsService._monthly_trends(*AnalyticsService._source_for(trend_spec))
+            project_distribution = AnalyticsService._project_distribution(*AnalyticsService._source_for(spec))
+            property_types = AnalyticsService._property_type_analysis(*AnalyticsService._source_for(spec))
+            status_distribution = AnalyticsService._status_distribution(
+                *AnalyticsService._source_for(spec.without('status'))
+            )
+            revenue_trends = AnalyticsService._revenue_trends(*AnalyticsService._source_for(trend_spec))
+        else:
+            # Status is the only filter a section may drop, so it is applied per section
+            with AnalyticsService._materialize(spec.without('status')) as base:
+                source = RowSource(base.c)
+                status_spec = BookingFilter(filters={'status': spec.filters.get('status')})
+                status_conditions = status_spec.clauses(base.c)
+                
+                # Trend sections default to the last 12 months
+                trend_spec = BookingFilter(start_date, end_date, status_spec.filters).with_default_window()
+                trend_conditions = trend_spec.clauses(base.c)
+                
+                kpis = AnalyticsService._kpi_summary(source, status_conditions)
+                monthly_trends = AnalyticsService._monthly_trends(source, trend_conditions)
+                project_distribution = AnalyticsService._project_distribution(source, status_conditions)
+                property_types = AnalyticsService._property_type_analysis(source, status_conditions)
+                status_distribution = AnalyticsService._status_distribution(source, [])
+                revenue_trends = AnalyticsService._revenue_trends(source, trend_conditions)
+        
+        return {
+            'kpis': kpis,
+            'charts': {
+                'monthly_trends': AnalyticsService._format_chart('monthly_trends', monthly_trends),
+                'project_distribution': AnalyticsService._format_chart('project_distribution', project_distribution),
+                'property_types': AnalyticsService._format_chart('property_types', property_types),
+                'status_distribution': AnalyticsService._format_chart('status_distribution', status_distribution),
+                'revenue_trends': AnalyticsService._format_chart('revenue_trends', revenue_trends)
+            }
+        }
+    
+    @staticmethod
+    def _rollup_enabled() -> bool:
+        """Check whether analytics may read from the daily rollup."""
+        return current_app.config.get('ANALYTICS_USE_ROLLUP', True)
+    
+    @staticmethod
+    def _columnar_snapshot(spec: BookingFilter):
+        """
+        Return the refreshed columnar snapshot if it should answer ``spec``.
+        
+        Requires ``ANALYTICS_ENGINE = 'columnar'``, NumPy, and filters the
+        snapshot can evaluate; otherwise returns None and SQL is used.
+        """
+        if current_app.config.get('ANALYTICS_ENGINE', 'sql') != 'columnar':
+            return None
+        if not columnar_available() or not columnar_compatible(spec):
+            return None
+        return get_snapshot()
+    
+    @staticmethod
+    def _source_for(spec: BookingFilter):
+        """
+        Pick the aggregation source for ``spec``.
+        
+        Returns:
+            Tuple of (source, conditions) to pass to a section helper
+        """
+        if AnalyticsService._rollup_enabled() and rollup_compatible(spec):
+            return RollupSource(rollup_relation(spec)), []
+        return RowSource(), spec.clauses()
+    
+    @staticmethod
+    @contextmanager
+    def _materialize(spec: BookingFilter):
+        """
+        Copy the bookings matched by ``spec`` into a temporary table.
+        
+        The table lives on the session's connection and is dropped on exit.
+        A unique name keeps concurrent requests sharing one SQLite connection
+        apart. If a query fails, a failing drop is ignored so the original
+        error propagates: PostgreSQL refuses every statement in an aborted
+        transaction, and its rollback discards the table anyway.
+        """
+        table = Table(
+            f'dashboard_base_{uuid.uuid4().hex[:12]}',
+            MetaData(),
+            Column('id', Integer, primary_key=True),
+            Column('created_at', DateTime),
+            Column('created_year', Integer),
+            Column('created_month', Integer),
+            Column('created_quarter', Integer),
+            Column('project_name', String(255)),
+            Column('type', String(50)),
+            Column('status', String(20)),
+            Column('amount', Numeric(15, 2)),
+            Column('tax_gst', Numeric(15, 2)),
+            Column('area', Float),
+            prefixes=['TEMPORARY']
+        )
+        connection = db.session.connection()
+        table.create(connection)
+        try:
+            columns = [getattr(Booking, name) for name in DASHBOARD_BASE_COLUMNS]
+            connection.execute(table.insert().from_select(
+                DASHBOARD_BASE_COLUMNS,
+                select(*columns).where(*spec.clauses())
+            ))
+            yield table
+        except Exception:
+            with suppress(Exception):
+                table.drop(connection)
+            raise
+        table.drop(connection)
+    
     @staticmethod
     def get_chart_data(chart_type: str, 
                       start_date: Optional[datetime] = None,
@@ -441,6 +611,23 @@ class AnalyticsService:
         """
         if chart_type == 'monthly_trends':
             data = AnalyticsService.get_monthly_trends(start_date, end_date, filters)
+        elif chart_type == 'project_distribution':
+            data = AnalyticsService.get_project_distribution(start_date, end_date, filters)
+        elif chart_type == 'property_types':
+            data = AnalyticsService.get_property_type_analysis(start_date, end_date, filters)
+        elif chart_type == 'status_distribution':
+            data = AnalyticsService.get_status_distribution(start_date, end_date, filters)
+        elif chart_type == 'revenue_trends':
+            data = AnalyticsService.get_revenue_trends(start_date, end_date, filters)
+        else:
+            raise ValueError(f"Unsupported chart type: {chart_type}")
+        
+        return AnalyticsService._format_chart(chart_type, data)
+    
+    @staticmethod
+    def _format_chart(chart_type: str, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Shape section data into chart labels and datasets."""
+        if chart_type == 'monthly_trends':
             return {
                 'labels': [item['period'] for item in data],
                 'datasets': [
@@ -458,7 +645,6 @@ class AnalyticsService:
             }
         
         elif chart_type == 'project_distribution':
-            data = AnalyticsService.get_project_distribution(start_date, end_date, filters)
             return {
                 'labels': [item['project_name'] for item in data],
                 'datasets': [
@@ -471,7 +657,6 @@ class AnalyticsService:
             }
         
         elif chart_type == 'property_types':
-            data = AnalyticsService.get_property_type_analysis(start_date, end_date, filters)
             return {
                 'labels': [item['property_type'] for item in data],
                 'datasets': [
@@ -484,7 +669,6 @@ class AnalyticsService:
             }
         
         elif chart_type == 'status_distribution':
-            data = AnalyticsService.get_status_distribution(start_date, end_date, filters)
             return {
                 'labels': [item['status_label'] for item in data],
                 'datasets': [
@@ -502,7 +686,6 @@ class AnalyticsService:
             }
         
         elif chart_type == 'revenue_trends':
-            data = AnalyticsService.get_revenue_trends(start_date, end_date, filters)
             return {
                 'labels': [item['period'] for item in data],
                 'datasets': [
@@ -521,6 +704,7 @@ class AnalyticsService:
         
         else:
             raise ValueError(f"Unsupported chart type: {chart_type}")
+
     
     @staticmethod
     def _apply_filters(query, filters: Dict[str, Any]):
@@ -534,68 +718,26 @@ class AnalyticsService:
         Returns:
             Modified query with filters applied
         """
-        if 'status' in filters and filters['status']:
-            if isinstance(filters['status'], list):
-                query = query.filter(Booking.status.in_(filters['status']))
-            else:
-                query = query.filter(Booking.status == filters['status'])
-        
-        if 'project_name' in filters and filters['project_name']:
-            query = query.filter(Booking.project_name.ilike(f"%{filters['project_name']}%"))
-        
-        if 'property_type' in filters and filters['property_type']:
-            query = query.filter(Booking.type.ilike(f"%{filters['property_type']}%"))
-        
-        if 'customer_name' in filters and filters['customer_name']:
-            query = query.filter(Booking.customer_name.ilike(f"%{filters['customer_name']}%"))
-        
-        if 'min_amount' in filters and filters['min_amount'] is not None:
-            query = query.filter(Booking.amount >= filters['min_amount'])
-        
-        if 'max_amount' in filters and filters['max_amount'] is not None:
-            query = query.filter(Booking.amount <= filters['max_amount'])
-        
-        if 'min_area' in filters and filters['min_area'] is not None:
-            query = query.filter(Booking.area >= filters['min_area'])
-        
-        if 'max_area' in filters and filters['max_area'] is not None:
-            query = query.filter(Booking.area <= filters['max_area'])
-        
-        return query
+        return BookingFilter(filters=filters).apply(query)
     
     @staticmethod
     def export_data(data_type: str,
                    start_date: Optional[datetime] = None,
                    end_date: Optional[datetime] = None,
-                   filters: Optional[Dict[str, Any]] = None,
-                   format_type: str = 'json') -> Dict[str, Any]:
+                   filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        Export analytics data in specified format.
+        Export analytics data as a JSON document.
         
         Args:
             data_type: Type of data to export ('kpis', 'trends', 'projects', 'types')
             start_date: Start date for data
             end_date: End date for data
             filters: Additional filters
-            format_type: Export format ('json', 'csv')
             
         Returns:
-            Exported data in requested format
+            Export document with metadata and the section data
         """
-        # Get the appropriate data
-        if data_type == 'kpis':
-            data = AnalyticsService.get_kpi_summary(start_date, end_date, filters)
-        elif data_type == 'trends':
-            data = AnalyticsService.get_monthly_trends(start_date, end_date, filters)
-        elif data_type == 'projects':
-            data = AnalyticsService.get_project_distribution(start_date, end_date, filters)
-        elif data_type == 'types':
-            data = AnalyticsService.get_property_type_analysis(start_date, end_date, filters)
-        else:
-            raise ValueError(f"Unsupported data type: {data_type}")
-        
-        # Format for export
-        export_data = {
+        return {
             'data_type': data_type,
             'generated_at': datetime.utcnow().isoformat(),
             'date_range': {
@@ -603,93 +745,67 @@ class AnalyticsService:
                 'end_date': end_date.isoformat() if end_date else None
             },
             'filters': filters or {},
-            'data': data
+            'data': AnalyticsService._export_section(data_type, start_date, end_date, filters)
         }
-        
-        if format_type == 'csv':
-            # Convert to CSV format
-            csv_data = AnalyticsService._convert_to_csv_format(data_type, data)
-            export_data['csv_data'] = csv_data
-            export_data['csv_headers'] = AnalyticsService._get_csv_headers(data_type)
-        
-        return export_data
     
     @staticmethod
-    def _convert_to_csv_format(data_type: str, data: Any) -> List[Dict[str, Any]]:
-        """Convert analytics data to CSV-friendly format."""
-        if data_type == 'kpis':
-            # Convert KPI dictionary to list of records
-            return [
-                {'Metric': 'Total Bookings', 'Value': data.get('total_bookings', 0)},
-                {'Metric': 'Total Revenue', 'Value': f"₹{data.get('total_revenue', 0):,.2f}"},
-                {'Metric': 'Active Bookings', 'Value': data.get('active_bookings', 0)},
-                {'Metric': 'Completed Bookings', 'Value': data.get('completed_bookings', 0)},
-                {'Metric': 'Cancelled Bookings', 'Value': data.get('cancelled_bookings', 0)},
-                {'Metric': 'Completion Rate', 'Value': f"{data.get('completion_rate', 0):.1f}%"},
-                {'Metric': 'Average Booking Value', 'Value': f"₹{data.get('average_booking_value', 0):,.2f}"},
-                {'Metric': 'Total Agreement Cost', 'Value': f"₹{data.get('total_agreement_cost', 0):,.2f}"},
-                {'Metric': 'Total Tax Amount', 'Value': f"₹{data.get('total_tax_amount', 0):,.2f}"},
-            ]
+    def export_rows(data_type: str,
+                    start_date: Optional[datetime] = None,
+                    end_date: Optional[datetime] = None,
+                    filters: Optional[Dict[str, Any]] = None) -> Tuple[List[str], Iterator[Sequence[Any]]]:
+        """
+        Export analytics data or raw bookings as column names plus a row iterator.
         
-        elif data_type == 'projects':
-            # Convert project distribution to CSV format
-            csv_data = []
-            for project in data:
-                csv_data.append({
-                    'Project Name': project.get('project_name', ''),
-                    'Total Bookings': project.get('booking_count', 0),
-                    'Total Revenue': f"₹{project.get('total_revenue', 0):,.2f}",
-                    'Active Bookings': project.get('active_count', 0),
-                    'Completed Bookings': project.get('completed_count', 0),
-                    'Cancelled Bookings': project.get('cancelled_count', 0),
-                    'Average Booking Value': f"₹{project.get('avg_booking_value', 0):,.2f}",
-                })
-            return csv_data
+        Booking rows are read lazily through a server-side cursor in batches of
+        ``EXPORT_BATCH_SIZE``, so a streamed export holds one batch in memory.
         
-        elif data_type == 'types':
-            # Convert property type analysis to CSV format
-            csv_data = []
-            for prop_type in data:
-                csv_data.append({
-                    'Property Type': prop_type.get('property_type', ''),
-                    'Total Bookings': prop_type.get('booking_count', 0),
-                    'Total Revenue': f"₹{prop_type.get('total_revenue', 0):,.2f}",
-                    'Active Bookings': prop_type.get('active_count', 0),
-                    'Completed Bookings': prop_type.get('completed_count', 0),
-                    'Cancelled Bookings': prop_type.get('cancelled_count', 0),
-                    'Average Booking Value': f"₹{prop_type.get('avg_booking_value', 0):,.2f}",
-                    'Average Area': f"{prop_type.get('avg_area', 0):.0f} sq ft",
-                })
-            return csv_data
+        Args:
+            data_type: 'kpis', 'trends', 'projects', 'types' or 'bookings'
+            start_date: Start date for data
+            end_date: End date for data
+            filters: Additional filters
+            
+        Returns:
+            Tuple of (columns, rows) with each row aligned to columns
+        """
+        if data_type == 'bookings':
+            spec = BookingFilter(start_date, end_date, filters)
+            return list(BOOKING_EXPORT_COLUMNS), AnalyticsService._stream_bookings(spec)
         
-        elif data_type == 'trends':
-            # Convert monthly trends to CSV format
-            csv_data = []
-            for trend in data:
-                csv_data.append({
-                    'Period': trend.get('period', ''),
-                    'Total Bookings': trend.get('booking_count', 0),
-                    'Total Revenue': f"₹{trend.get('total_revenue', 0):,.2f}",
-                    'Active Bookings': trend.get('active_count', 0),
-                    'Completed Bookings': trend.get('completed_count', 0),
-                    'Cancelled Bookings': trend.get('cancelled_count', 0),
-                })
-            return csv_data
-        
-        return []
+        data = AnalyticsService._export_section(data_type, start_date, end_date, filters)
+        if data_type == 'kpis':
+            return ['metric', 'value'], iter(data.items())
+        
+        columns = EXPORT_COLUMNS[data_type]
+        return list(columns), ([item.get(column) for column in columns] for item in data)
     
     @staticmethod
-    def _get_csv_headers(data_type: str) -> List[str]:
-        """Get CSV headers for different data types."""
+    def _export_section(data_type: str,
+                        start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None,
+                        filters: Optional[Dict[str, Any]] = None) -> Any:
+        """Fetch the analytics section behind an export data type."""
         if data_type == 'kpis':
-            return ['Metric', 'Value']
+            return AnalyticsService.get_kpi_summary(start_date, end_date, filters)
+        elif data_type == 'trends':
+            return AnalyticsService.get_monthly_trends(start_date, end_date, filters)
         elif data_type == 'projects':
-            return ['Project Name', 'Total Bookings', 'Total Revenue', 'Active Bookings', 
-                   'Completed Bookings', 'Cancelled Bookings', 'Average Booking Value']
+            return AnalyticsService.get_project_distribution(start_date, end_date, filters)
         elif data_type == 'types':
-            return ['Property Type', 'Total Bookings', 'Total Revenue', 'Active Bookings',
-                   'Completed Bookings', 'Cancelled Bookings', 'Average Booking Value', 'Average Area']
-        elif data_type == 'trends':
-            return ['Period', 'Total Bookings', 'Total Revenue', 'Active Bookings',
-                   'Completed Bookings', 'Cancelled Bookings']
-        return []
\ No newline at end of file
+            return AnalyticsService.get_property_type_analysis(start_date, end_date, filters)
+        else:
+            raise ValueError(f"Unsupported data type: {data_type}")
+    
+    @staticmethod
+    def _stream_bookings(spec: BookingFilter) -> Iterator[Sequence[Any]]:
+        """Yield booking rows matching ``spec`` in id order, one cursor batch at a time."""
+        table = Booking.__table__
+        statement = select(
+            *[table.c[name] for name in BOOKING_EXPORT_COLUMNS]
+        ).where(
+            *spec.clauses()
+        ).order_by(
+            table.c.id
+        ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        
+        yield from db.session.execute(statement)
@@ -0,0 +1,222 @@
+"""Write-generation invalidated result cache for analytics queries."""
+import copy
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Dict, Hashable, Optional
+from flask import current_app
+from app.analytics.coalesce import get_flights
+from app.models.write_generation import booking_generation, current_generation
+
+
+class AnalyticsCache:
+    """
+    LRU cache of analytics results bounded by entry count and approximate memory.
+
+    Every entry records the booking write generation it was computed at; an
+    entry from another generation is treated as a miss and replaced, so a
+    committed booking change invalidates all cached results at once. See
+    ``current_generation`` for how writes by other processes are noticed.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024,
+                 ttl: Optional[float] = 300):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, generation: Hashable):
+        """
+        Look up a cached result.
+
+        Returns:
+            Tuple of (found, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_generation, stored_at, size, value = entry
+                expired = self.ttl is not None and time.monotonic() - stored_at > self.ttl
+                if entry_generation == generation and not expired:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                self._remove(key)
+                self.invalidations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key, generation: Hashable, value) -> None:
+        """Store a result computed at ``generation``, evicting least recently used entries."""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (generation, time.monotonic(), size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'generation': booking_generation.value
+            }
+
+    def _remove(self, key) -> None:
+        """Remove an entry; the lock must be held."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry[2]
+
+
+def init_app(app):
+    """Attach an analytics cache configured from ``app.config`` to the application."""
+    app.extensions['analytics_cache'] = AnalyticsCache(
+        max_entries=app.config.get('ANALYTICS_CACHE_MAX_ENTRIES', 256),
+        max_bytes=app.config.get('ANALYTICS_CACHE_MAX_BYTES', 32 * 1024 * 1024),
+        ttl=app.config.get('ANALYTICS_CACHE_TTL', 300)
+    )
+
+
+def get_cache() -> Optional[AnalyticsCache]:
+    """Return the current application's analytics cache if caching is enabled."""
+    if not current_app.config.get('ANALYTICS_CACHE_ENABLED', True):
+        return None
+    return current_app.extensions.get('analytics_cache')
+
+
+def cached_result(func):
+    """
+    Cache an ``AnalyticsService`` method on its normalized arguments.
+
+    The key is (method, start_date, end_date, normalized filters, group_by);
+    results are deep-copied on the way out so callers may mutate them. On a
+    miss, concurrent calls with the same key at the same write generation
+    are coalesced into one computation whose result they all share. The
+    generation includes the change journal head, so both the cache and the
+    coalescing follow writes made by other processes.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = get_cache()
+        flights = get_flights()
+        if cache is None and flights is None:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        key = (
+            func.__name__,
+            arguments.get('start_date'),
+            arguments.get('end_date'),
+            normalize_filters(arguments.get('filters')),
+            arguments.get('group_by')
+        )
+
+        # Read the generation first so a write during computation invalidates the result
+        generation = current_generation()
+        if cache is not None:
+            found, value = cache.get(key, generation)
+            if found:
+                return copy.deepcopy(value)
+
+        def compute():
+            value = func(*args, **kwargs)
+            if cache is not None:
+                cache.put(key, generation, value)
+            return value
+
+        if flights is None:
+            value = compute()
+        else:
+            # Callers after a write wait on a newer generation, not on a stale flight
+            value = flights.do((key, generation), compute, label=describe_key(key))
+        return copy.deepcopy(value)
+
+    return wrapper
+
+
+def describe_key(key: tuple) -> str:
+    """Render a cache key as a readable label for metrics."""
+    name, start_date, end_date, filters, group_by = key
+    label = f"{name} {start_date or ''}..{end_date or ''}"
+    if filters:
+        label += ' ' + ' '.join(
+            f"{field}={','.join(map(str, value)) if isinstance(value, tuple) else value}"
+            for field, value in filters
+        )
+    if group_by:
+        label += f' by {group_by}'
+    return label
+
+
+def normalize_filters(filters: Optional[Dict[str, Any]]) -> tuple:
+    """
+    Reduce filters to a hashable canonical form.
+
+    Empty values are dropped, status lists are sorted and de-duplicated, and
+    substring filters are lower-cased because they match case-insensitively.
+    """
+    normalized = []
+    for key, value in (filters or {}).items():
+        if value in (None, '', []):
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = tuple(sorted(set(value)))
+        elif isinstance(value, str) and key != 'status':
+            value = value.lower()
+        normalized.append((key, value))
+    return tuple(sorted(normalized))
+
+
+def _estimate_size(value, _seen=None) -> int:
+    """Approximate the memory footprint of a result built from dicts, lists and scalars."""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k, _seen) + _estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_estimate_size(item, _seen) for item in value)
+    return size
@@ -0,0 +1,125 @@
+"""Single-flight coalescing of identical concurrent analytics computations."""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+from flask import current_app
+
+
+class _Flight:
+    """One in-progress computation and the outcome its followers wait for."""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        """Start an unfinished flight."""
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run each distinct computation once at a time, sharing its result with concurrent callers.
+
+    The first caller for a key becomes the leader and runs the computation;
+    callers arriving while it is in flight wait for it and receive the same
+    result, or the same exception. Once the leader finishes the key is free
+    again, so later callers start a new computation (or, in practice, hit
+    the result cache the leader filled). A follower that waits longer than
+    ``timeout`` seconds stops waiting and computes the result itself.
+
+    Per-key counters of executions, coalesced callers and timeouts are kept
+    for the ``max_tracked_keys`` most recently used keys.
+    """
+
+    def __init__(self, timeout: Optional[float] = 30.0, max_tracked_keys: int = 256):
+        """Initialize with nothing in flight."""
+        self.timeout = timeout
+        self.max_tracked_keys = max_tracked_keys
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._metrics = OrderedDict()
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any], label: Optional[str] = None) -> Any:
+        """
+        Return ``func()``, or the result of an identical call already in flight.
+
+        Args:
+            key: Identity of the computation; equal keys share one execution
+            func: Computation to run when no call for ``key`` is in flight
+            label: Name the key's counters are reported under, ``str(key)`` by default
+        """
+        label = str(key) if label is None else label
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+            self._count(label, 'executions' if leader else 'coalesced')
+
+        if not leader:
+            if flight.done.wait(self.timeout):
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value
+            with self._lock:
+                self.timeouts += 1
+                self._count(label, 'timeouts')
+            return func()
+
+        try:
+            flight.value = func()
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return overall and per-key counters, keys with the most coalesced callers first."""
+        with self._lock:
+            keys = [dict(key=label, **counters) for label, counters in self._metrics.items()]
+            requests = self.executions + self.coalesced
+            return {
+                'in_flight': len(self._flights),
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'coalesced_rate': (self.coalesced / requests * 100) if requests > 0 else 0,
+                'timeouts': self.timeouts,
+                'keys': sorted(keys, key=lambda counters: counters['coalesced'], reverse=True)
+            }
+
+    def _count(self, label: str, counter: str) -> None:
+        """Increment one per-key counter; the lock must be held."""
+        counters = self._metrics.get(label)
+        if counters is None:
+            counters = self._metrics[label] = {'executions': 0, 'coalesced': 0, 'timeouts': 0}
+            if len(self._metrics) > self.max_tracked_keys:
+                self._metrics.popitem(last=False)
+        else:
+            self._metrics.move_to_end(label)
+        counters[counter] += 1
+
+
+def init_app(app):
+    """Attach a single-flight group configured from ``app.config`` to the application."""
+    app.extensions['analytics_flights'] = SingleFlight(
+        timeout=app.config.get('ANALYTICS_COALESCE_TIMEOUT', 30.0),
+        max_tracked_keys=app.config.get('ANALYTICS_COALESCE_MAX_KEYS', 256)
+    )
+
+
+def get_flights() -> Optional[SingleFlight]:
+    """Return the current application's single-flight group if coalescing is enabled."""
+    if not current_app.config.get('ANALYTICS_COALESCE_ENABLED', True):
+        return None
+    return current_app.extensions.get('analytics_flights')
@@ -0,0 +1,439 @@
+"""Optional in-memory columnar booking snapshot with NumPy-vectorized aggregation."""
+import threading
+from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from flask import current_app
+from sqlalchemy import func, select
+from app import db
+from app.models.booking import Booking
+from app.analytics.filters import BookingFilter
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; analytics stay on SQL without it
+    np = None
+
+
+# Filters the columnar engine evaluates; any other filter falls back to SQL
+COLUMNAR_FILTER_KEYS = {
+    'status', 'project_name', 'property_type',
+    'min_amount', 'max_amount', 'min_area', 'max_area'
+}
+
+# Booking columns stored as int32 codes into a per-column dictionary
+ENCODED_COLUMNS = ('project_name', 'type', 'status')
+
+# SQLite's lower() only folds ASCII letters; match it exactly
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def columnar_available() -> bool:
+    """Check whether NumPy is installed."""
+    return np is not None
+
+
+def columnar_compatible(spec: BookingFilter) -> bool:
+    """Check whether every active filter in ``spec`` can be evaluated on the snapshot."""
+    active = {key for key, value in spec.filters.items() if value not in (None, '', [])}
+    if not active <= COLUMNAR_FILTER_KEYS:
+        return False
+
+    # LIKE wildcards inside substring filters are left to the database
+    for key in ('project_name', 'property_type'):
+        value = spec.filters.get(key)
+        if value and ('%' in str(value) or '_' in str(value)):
+            return False
+
+    return True
+
+
+def get_snapshot() -> 'BookingSnapshot':
+    """Return the current application's booking snapshot, refreshed against the database."""
+    snapshot = current_app.extensions.get('columnar_snapshot')
+    if snapshot is None:
+        snapshot = BookingSnapshot(overlap=current_app.config.get('ANALYTICS_COLUMNAR_OVERLAP', 60))
+        current_app.extensions['columnar_snapshot'] = snapshot
+    snapshot.refresh()
+    return snapshot
+
+
+class ColumnView(NamedTuple):
+    """One consistent, read-only version of the snapshot's arrays and dictionaries."""
+
+    columns: Dict[str, Any]
+    dictionaries: Dict[str, Tuple[str, ...]]
+    codes: Dict[str, Dict[str, int]]
+    length: int
+
+
+class BookingSnapshot:
+    """
+    Typed NumPy column arrays of the analytics-relevant booking columns.
+
+    Project, type and status are dictionary-encoded to int32 codes,
+    ``created_at`` is held as int64 epoch microseconds (so date bounds compare
+    exactly as in SQL) and money as int64 paise. Refreshes are incremental:
+    rows whose ``updated_at`` is at or after the last watermark, less an
+    overlap for transactions that committed late, replace their previous
+    version. A row count that still disagrees with the database afterwards
+    (hard deletes) forces a full reload.
+    """
+
+    def __init__(self, overlap: float = 60):
+        """Initialize an empty snapshot."""
+        self.overlap = timedelta(seconds=overlap)
+        self.version = None
+        self.watermark = None
+        self.full_loads = 0
+        self.incremental_loads = 0
+        # Refreshes build new arrays under _refresh_lock and publish them as
+        # one ColumnView under _lock; readers only ever see a whole view
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._dictionaries = {name: [] for name in ENCODED_COLUMNS}
+        self._codes = {name: {} for name in ENCODED_COLUMNS}
+        self._columns = self._encode([])
+        self._publish()
+
+    def __len__(self):
+        """Number of bookings held in the snapshot."""
+        return self.view().length
+
+    def view(self) -> ColumnView:
+        """Return the current version of the columns, which later refreshes never modify."""
+        with self._lock:
+            return self._view
+
+    def refresh(self, session=None) -> None:
+        """Bring the snapshot up to date with the bookings table."""
+        session = session or db.session
+        with self._refresh_lock:
+            count, last_update = session.query(
+                func.count(Booking.id),
+                func.max(Booking.updated_at)
+            ).one()
+            if (count, last_update) == self.version:
+                return
+
+            if self.watermark is None:
+                self._load(session)
+            else:
+                self._load(session, since=self.watermark - self.overlap)
+                if len(self._columns['id']) != count:
+                    self._load(session)
+
+            self.version = (count, last_update)
+            self.watermark = last_update
+
+    def kpi_row(self, spec: BookingFilter):
+        """Aggregate the KPI row for bookings matching ``spec``."""
+        view = self.view()
+        mask = _mask(view, spec)
+        groups = _aggregate(view, mask, view.columns['status'][mask])
+        statuses = [view.dictionaries['status'][code] for code in groups.keys]
+
+        def count_of(*wanted):
+            return int(sum(groups.count[i] for i, status in enumerate(statuses) if status in wanted))
+
+        def paise_of(column, *wanted):
+            return int(sum(column[i] for i, status in enumerate(statuses) if status in wanted))
+
+        total_bookings = int(groups.count.sum())
+        has_revenue = count_of('active', 'complete') > 0
+        return SimpleNamespace(
+            total_bookings=total_bookings,
+            active_bookings=count_of('active'),
+            completed_bookings=count_of('complete'),
+            cancelled_bookings=count_of('cancelled'),
+            total_revenue=_money(paise_of(groups.amount, 'active', 'complete')) if has_revenue else None,
+            total_tax=_money(paise_of(groups.tax_gst, 'active', 'complete')) if has_revenue else None,
+            total_area=float(groups.area.sum()) if total_bookings else None
+        )
+
+    def monthly_rows(self, spec: BookingFilter) -> List[SimpleNamespace]:
+        """Aggregate per-month rows for bookings matching ``spec``, oldest first."""
+        view = self.view()
+        mask = _mask(view, spec)
+        groups = _aggregate(view, mask, _months(view, mask))
+        return [
+            SimpleNamespace(
+                year=int(month // 12 + 1970),
+                month=int(month % 12 + 1),
+                booking_count=int(groups.count[i]),
+                total_revenue=_money(groups.amount[i]),
+                total_area=float(groups.area[i]),
+                non_cancelled_count=int(groups.non_cancelled[i])
+            )
+            for i, month in enumerate(groups.keys)
+        ]
+
+    def project_rows(self, spec: BookingFilter) -> List[SimpleNamespace]:
+        """Aggregate per-project rows for bookings matching ``spec``."""
+        view = self.view()
+        mask = _mask(view, spec)
+        groups = _aggregate(view, mask, view.columns['project_name'][mask])
+        rows = [
+            SimpleNamespace(
+                project_name=view.dictionaries['project_name'][code],
+                booking_count=int(groups.count[i]),
+                total_revenue=_money(groups.amount[i]),
+                total_area=float(groups.area[i]),
+                avg_revenue=_average(groups.amount[i], groups.count[i]),
+                active_complete_count=int(groups.non_cancelled[i])
+            )
+            for i, code in enumerate(groups.keys)
+        ]
+        return sorted(rows, key=lambda row: (-row.booking_count, row.project_name))
+
+    def status_rows(self, spec: BookingFilter) -> List[SimpleNamespace]:
+        """Aggregate per-status rows for bookings matching ``spec``."""
+        view = self.view()
+        mask = _mask(view, spec)
+        groups = _aggregate(view, mask, view.columns['status'][mask])
+        rows = [
+            SimpleNamespace(
+                status=view.dictionaries['status'][code],
+                booking_count=int(groups.count[i]),
+                total_revenue=_money(groups.amount[i]),
+                avg_revenue=_average(groups.amount[i], groups.count[i])
+            )
+            for i, code in enumerate(groups.keys)
+        ]
+        return sorted(rows, key=lambda row: (-row.booking_count, row.status))
+
+    def property_type_rows(self, spec: BookingFilter) -> List[SimpleNamespace]:
+        """Aggregate per-property-type rows for bookings matching ``spec``."""
+        view = self.view()
+        mask = _mask(view, spec)
+        groups = _aggregate(view, mask, view.columns['type'][mask])
+        rows = [
+            SimpleNamespace(
+                type=view.dictionaries['type'][code],
+                booking_count=int(groups.count[i]),
+                total_revenue=_money(groups.amount[i]),
+                total_area=float(groups.area[i]),
+                avg_revenue=_average(groups.amount[i], groups.count[i]),
+                avg_area=float(groups.area[i]) / int(groups.count[i])
+            )
+            for i, code in enumerate(groups.keys)
+        ]
+        return sorted(rows, key=lambda row: (-row.booking_count, row.type))
+
+    def revenue_rows(self, spec: BookingFilter, group_by: str = 'month') -> List[SimpleNamespace]:
+        """Aggregate per-period revenue rows for bookings matching ``spec``, oldest first."""
+        view = self.view()
+        mask = _mask(view, spec)
+        months = _months(view, mask)
+        if group_by == 'year':
+            keys = months // 12
+        elif group_by == 'quarter':
+            keys = months // 3
+        else:  # default to month
+            keys = months
+        groups = _aggregate(view, mask, keys)
+
+        rows = []
+        for i, key in enumerate(groups.keys):
+            key = int(key)
+            if group_by == 'year':
+                period = {'year': key + 1970}
+            elif group_by == 'quarter':
+                period = {'year': key // 4 + 1970, 'quarter': key % 4 + 1}
+            else:
+                period = {'year': key // 12 + 1970, 'month': key % 12 + 1}
+            rows.append(SimpleNamespace(
+                **period,
+                total_revenue=_money(groups.amount[i]),
+                total_tax=_money(groups.tax_gst[i]),
+                booking_count=int(groups.count[i]),
+                avg_revenue=_average(groups.amount[i], groups.count[i])
+            ))
+        return rows
+
+    def _load(self, session, since: Optional[datetime] = None) -> None:
+        """Read bookings (all, or those updated at or after ``since``) into the snapshot."""
+        statement = select(
+            Booking.id,
+            Booking.created_at,
+            Booking.project_name,
+            Booking.type,
+            Booking.status,
+            Booking.amount,
+            Booking.tax_gst,
+            Booking.area
+        )
+        if since is not None:
+            statement = statement.where(Booking.updated_at >= since)
+        fresh = self._encode(session.execute(statement).all())
+
+        if since is None:
+            self._columns = fresh
+            self.full_loads += 1
+        else:
+            keep = ~np.isin(self._columns['id'], fresh['id'])
+            self._columns = {
+                name: np.concatenate([column[keep], fresh[name]])
+                for name, column in self._columns.items()
+            }
+            self.incremental_loads += 1
+        self._publish()
+
+    def _publish(self) -> None:
+        """Freeze the working columns and dictionaries into a new view for readers."""
+        for column in self._columns.values():
+            column.flags.writeable = False
+        view = ColumnView(
+            columns=dict(self._columns),
+            dictionaries={name: tuple(values) for name, values in self._dictionaries.items()},
+            codes={name: dict(codes) for name, codes in self._codes.items()},
+            length=len(self._columns['id'])
+        )
+        with self._lock:
+            self._view = view
+
+    def _encode(self, rows) -> dict:
+        """Convert booking rows into typed column arrays."""
+        ids, created_at, projects, types, statuses, amounts, taxes, areas = (
+            zip(*rows) if rows else ((),) * 8
+        )
+        return {
+            'id': np.array(ids, dtype=np.int64),
+            'created_at': np.array(created_at, dtype='datetime64[us]').astype(np.int64),
+            'project_name': self._dictionary_encode('project_name', projects),
+            'type': self._dictionary_encode('type', types),
+            'status': self._dictionary_encode('status', statuses),
+            'amount': np.array([_to_paise(value) for value in amounts], dtype=np.int64),
+            'tax_gst': np.array([_to_paise(value) for value in taxes], dtype=np.int64),
+            'area': np.array(areas, dtype=np.float64)
+        }
+
+    def _dictionary_encode(self, name: str, values) -> Any:
+        """Map values to int32 codes, growing the column's dictionary as needed."""
+        codes = self._codes[name]
+        dictionary = self._dictionaries[name]
+        encoded = np.empty(len(values), dtype=np.int32)
+        for index, value in enumerate(values):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(dictionary)
+                dictionary.append(value)
+            encoded[index] = code
+        return encoded
+
+
+def _mask(view: ColumnView, spec: BookingFilter):
+    """Build a boolean row mask over ``view`` equivalent to ``spec.clauses()``."""
+    columns = view.columns
+    filters = spec.filters
+    mask = np.ones(view.length, dtype=bool)
+
+    # Date range
+    if spec.start_date:
+        mask &= columns['created_at'] >= _epoch_us(spec.start_date)
+    if spec.end_date:
+        mask &= columns['created_at'] <= _epoch_us(spec.end_date)
+
+    if filters.get('status'):
+        wanted = filters['status'] if isinstance(filters['status'], list) else [filters['status']]
+        mask &= np.isin(columns['status'], _codes_where(view, 'status', lambda value: value in wanted))
+
+    if filters.get('project_name'):
+        needle = str(filters['project_name']).translate(_ASCII_LOWER)
+        mask &= np.isin(columns['project_name'], _codes_where(
+            view, 'project_name', lambda value: needle in value.translate(_ASCII_LOWER)
+        ))
+
+    if filters.get('property_type'):
+        needle = str(filters['property_type']).translate(_ASCII_LOWER)
+        mask &= np.isin(columns['type'], _codes_where(
+            view, 'type', lambda value: needle in value.translate(_ASCII_LOWER)
+        ))
+
+    if filters.get('min_amount') is not None:
+        mask &= columns['amount'] >= _paise_bound(filters['min_amount'], ROUND_CEILING)
+
+    if filters.get('max_amount') is not None:
+        mask &= columns['amount'] <= _paise_bound(filters['max_amount'], ROUND_FLOOR)
+
+    if filters.get('min_area') is not None:
+        mask &= columns['area'] >= float(filters['min_area'])
+
+    if filters.get('max_area') is not None:
+        mask &= columns['area'] <= float(filters['max_area'])
+
+    return mask
+
+
+def _aggregate(view: ColumnView, mask, keys) -> SimpleNamespace:
+    """
+    Group the masked rows of ``view`` by ``keys`` and total their measures.
+
+    Args:
+        view: Columns the mask was built on
+        mask: Boolean row mask
+        keys: Group key for each masked row
+
+    Returns:
+        Namespace of per-group arrays aligned with the sorted unique keys
+    """
+    columns = view.columns
+    groups, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    size = len(groups)
+
+    # Money stays integral: add.at into int64 rather than float bincount weights
+    amount = np.zeros(size, dtype=np.int64)
+    np.add.at(amount, inverse, columns['amount'][mask])
+    tax_gst = np.zeros(size, dtype=np.int64)
+    np.add.at(tax_gst, inverse, columns['tax_gst'][mask])
+
+    cancelled = view.codes['status'].get('cancelled', -1)
+    non_cancelled = columns['status'][mask] != cancelled
+
+    return SimpleNamespace(
+        keys=groups,
+        count=np.bincount(inverse, minlength=size),
+        amount=amount,
+        tax_gst=tax_gst,
+        area=np.bincount(inverse, weights=columns['area'][mask], minlength=size),
+        non_cancelled=np.bincount(inverse[non_cancelled], minlength=size)
+    )
+
+
+def _months(view: ColumnView, mask):
+    """Months since 1970-01 for each masked row."""
+    created_at = view.columns['created_at'][mask].astype('datetime64[us]')
+    return created_at.astype('datetime64[M]').astype(np.int64)
+
+
+def _codes_where(view: ColumnView, name: str, predicate: Callable[[str], bool]):
+    """Dictionary codes of ``name`` whose value satisfies ``predicate``."""
+    codes = [code for code, value in enumerate(view.dictionaries[name]) if predicate(value)]
+    return np.array(codes, dtype=np.int32)
+
+
+def _epoch_us(value: datetime) -> int:
+    """Convert a timestamp to epoch microseconds, ignoring any offset as SQLite does."""
+    return int(np.datetime64(value.replace(tzinfo=None), 'us').astype(np.int64))
+
+
+def _to_paise(value) -> int:
+    """Convert a money value to integer paise."""
+    return int(Decimal(str(value or 0)).scaleb(2).to_integral_value())
+
+
+def _paise_bound(value, rounding) -> int:
+    """Convert a money filter bound to paise, rounding inward so comparisons stay exact."""
+    return int(Decimal(str(value)).scaleb(2).to_integral_value(rounding=rounding))
+
+
+def _money(paise) -> Decimal:
+    """Convert integer paise to a two-place Decimal, as SQL returns money totals."""
+    return Decimal(int(paise)).scaleb(-2)
+
+
+def _average(paise, count) -> float:
+    """Average money value in rupees."""
+    return int(paise) / 100 / int(count)
@@ -0,0 +1,12 @@
+"""Analytics maintenance CLI commands."""
+import click
+from app.analytics.routes import analytics_bp
+
+
+@analytics_bp.cli.command('rebuild-rollup')
+def rebuild_rollup_command():
+    """Regenerate the daily booking rollup from scratch."""
+    from app.database import rebuild_daily_rollup
+    
+    rows = rebuild_daily_rollup()
+    click.echo(f'Rebuilt booking_daily_rollup with {rows} rows')
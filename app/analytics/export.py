@@ -0,0 +1,86 @@
+"""Incremental CSV and NDJSON encoders for streamed exports."""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Sequence
+
+# Approximate characters buffered before a chunk is yielded to the client
+CHUNK_SIZE = 64 * 1024
+
+# Rows fetched per server-side cursor batch when streaming bookings
+EXPORT_BATCH_SIZE = 1000
+
+
+def csv_stream(columns: List[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """
+    Encode rows as CSV text chunks.
+
+    The header is yielded on its own so the client receives the first byte
+    before any row is fetched; rows are then buffered into chunks of about
+    ``CHUNK_SIZE`` characters.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    yield _drain(buffer)
+
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield _drain(buffer)
+
+    if buffer.tell():
+        yield _drain(buffer)
+
+
+def ndjson_stream(columns: List[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """Encode rows as newline-delimited JSON objects, buffered into chunks."""
+    lines = []
+    size = 0
+    for row in rows:
+        line = json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False)
+        lines.append(line)
+        size += len(line) + 1
+        if size >= CHUNK_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+            size = 0
+
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def _drain(buffer: io.StringIO) -> str:
+    """Return and clear the buffered text."""
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
+
+
+def _csv_value(value: Any) -> Any:
+    """Render a value for CSV, keeping numbers unformatted."""
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values the json module does not handle natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+# Streaming export encoders and their content types
+EXPORT_FORMATS = {
+    'csv': (csv_stream, 'text/csv'),
+    'ndjson': (ndjson_stream, 'application/x-ndjson'),
+}
@@ -0,0 +1,90 @@
+"""Composable booking filter specifications for analytics queries."""
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+from app.models.booking import Booking
+
+
+class BookingFilter:
+    """
+    Date range plus analytics filters that compile to plain WHERE clauses.
+
+    The clauses are built against a column source, so the same filter can be
+    applied to the ``bookings`` table or to any relation exposing the same
+    column names (for example a temporary table's ``.c`` collection).
+    """
+
+    def __init__(self, start_date: Optional[datetime] = None,
+                 end_date: Optional[datetime] = None,
+                 filters: Optional[Dict[str, Any]] = None):
+        """Initialize filter with an optional date range and filter criteria."""
+        self.start_date = start_date
+        self.end_date = end_date
+        self.filters = dict(filters or {})
+
+    def without(self, *keys: str) -> 'BookingFilter':
+        """Return a copy of this filter with the given filter keys removed."""
+        filters = {k: v for k, v in self.filters.items() if k not in keys}
+        return BookingFilter(self.start_date, self.end_date, filters)
+
+    def with_default_window(self, days: int = 365) -> 'BookingFilter':
+        """Return a copy whose open date bounds default to the last ``days`` days."""
+        end_date = self.end_date or datetime.utcnow()
+        start_date = self.start_date or end_date - timedelta(days=days)
+        return BookingFilter(start_date, end_date, self.filters)
+
+    def clauses(self, source=Booking) -> List[Any]:
+        """
+        Build WHERE clauses for this filter.
+
+        Args:
+            source: Column source exposing booking column names
+
+        Returns:
+            List of SQL expressions to pass to ``filter()``/``where()``
+        """
+        filters = self.filters
+        clauses = []
+
+        # Date range
+        if self.start_date:
+            clauses.append(source.created_at >= self.start_date)
+        if self.end_date:
+            clauses.append(source.created_at <= self.end_date)
+
+        if 'status' in filters and filters['status']:
+            if isinstance(filters['status'], list):
+                clauses.append(source.status.in_(filters['status']))
+            else:
+                clauses.append(source.status == filters['status'])
+
+        if 'project_name' in filters and filters['project_name']:
+            clauses.append(source.project_name.ilike(f"%{filters['project_name']}%"))
+
+        if 'property_type' in filters and filters['property_type']:
+            clauses.append(source.type.ilike(f"%{filters['property_type']}%"))
+
+        if 'customer_name' in filters and filters['customer_name']:
+            clauses.append(source.customer_name.ilike(f"%{filters['customer_name']}%"))
+
+        if 'min_amount' in filters and filters['min_amount'] is not None:
+            clauses.append(source.amount >= filters['min_amount'])
+
+        if 'max_amount' in filters and filters['max_amount'] is not None:
+            clauses.append(source.amount <= filters['max_amount'])
+
+        if 'min_area' in filters and filters['min_area'] is not None:
+            clauses.append(source.area >= filters['min_area'])
+
+        if 'max_area' in filters and filters['max_area'] is not None:
+            clauses.append(source.area <= filters['max_area'])
+
+        return clauses
+
+    def apply(self, query):
+        """Apply this filter to an ORM query or Core select."""
+        clauses = self.clauses()
+        return query.filter(*clauses) if clauses else query
+
+    def __repr__(self):
+        """String representation of filter."""
+        return f'<BookingFilter {self.start_date} - {self.end_date} {self.filters}>'
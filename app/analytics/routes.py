@@ -1,15 +1,18 @@
 """Analytics API routes for booking system reporting."""
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from datetime import datetime, timedelta
 from app import db
 from app.analytics.analytics_service import AnalyticsService
+from app.analytics.export import EXPORT_FORMATS
 from app.auth.auth_service import auth_required
+from app.etag import conditional_get
 
 analytics_bp = Blueprint('analytics', __name__)
 
 
 @analytics_bp.route('/dashboard', methods=['GET'])
 @auth_required(['admin'])
+@conditional_get
 def get_dashboard_data():
     """Get comprehensive dashboard data including KPIs and charts."""
     try:
@@ -21,39 +24,12 @@ def get_dashboard_data():
         # Parse dates
         start_dt, end_dt = _parse_date_range(start_date, end_date)
         
-        # Get KPI summary
-        kpis = AnalyticsService.get_kpi_summary(start_dt, end_dt, filters)
-        
-        # Get chart data
-        monthly_trends = AnalyticsService.get_chart_data(
-            'monthly_trends', start_dt, end_dt, filters
-        )
-        
-        project_distribution = AnalyticsService.get_chart_data(
-            'project_distribution', start_dt, end_dt, filters
-        )
-        
-        property_types = AnalyticsService.get_chart_data(
-            'property_types', start_dt, end_dt, filters
-        )
-        
-        status_distribution = AnalyticsService.get_chart_data(
-            'status_distribution', start_dt, end_dt, filters
-        )
-        
-        revenue_trends = AnalyticsService.get_chart_data(
-            'revenue_trends', start_dt, end_dt, filters
-        )
+        # Get KPI summary and chart data from one shared base relation
+        dashboard = AnalyticsService.get_dashboard_data(start_dt, end_dt, filters)
         
         return jsonify({
-            'kpis': kpis,
-            'charts': {
-                'monthly_trends': monthly_trends,
-                'project_distribution': project_distribution,
-                'property_types': property_types,
-                'status_distribution': status_distribution,
-                'revenue_trends': revenue_trends
-            },
+            'kpis': dashboard['kpis'],
+            'charts': dashboard['charts'],
             'date_range': {
                 'start_date': start_dt.isoformat() if start_dt else None,
                 'end_date': end_dt.isoformat() if end_dt else None
@@ -69,6 +45,7 @@ def get_dashboard_data():
 
 @analytics_bp.route('/kpis', methods=['GET'])
 @auth_required(['admin'])
+@conditional_get
 def get_kpis():
     """Get key performance indicators."""
     try:
@@ -100,6 +77,7 @@ def get_kpis():
 
 @analytics_bp.route('/trends', methods=['GET'])
 @auth_required(['admin'])
+@conditional_get
 def get_trends():
     """Get booking trends over time."""
     try:
@@ -137,6 +115,7 @@ def get_trends():
 
 @analytics_bp.route('/projects', methods=['GET'])
 @auth_required(['admin'])
+@conditional_get
 def get_project_analytics():
     """Get project-wise booking analytics."""
     try:
@@ -168,6 +147,7 @@ def get_project_analytics():
 
 @analytics_bp.route('/property-types', methods=['GET'])
 @auth_required(['admin'])
+@conditional_get
 def get_property_type_analytics():
     """Get property type analytics."""
     try:
@@ -199,6 +179,7 @@ def get_property_type_analytics():
 
 @analytics_bp.route('/charts/<chart_type>', methods=['GET'])
 @auth_required(['admin'])
+@conditional_get
 def get_chart_data(chart_type):
     """Get formatted data for specific chart types."""
     try:
@@ -239,23 +220,30 @@ def get_chart_data(chart_type):
 @analytics_bp.route('/export', methods=['GET'])
 @auth_required(['admin'])
 def export_analytics_data():
-    """Export analytics data in various formats."""
+    """
+    Export analytics data or raw bookings.
+    
+    ``format=json`` returns a JSON document for analytics sections; ``csv``
+    and ``ndjson`` stream ``text/csv`` and ``application/x-ndjson`` bodies
+    as rows are produced. ``type=bookings`` streams every matching booking
+    and supports only the streaming formats.
+    """
     try:
         # Parse query parameters
-        data_type = request.args.get('type', 'kpis')  # kpis, trends, projects, types
-        format_type = request.args.get('format', 'json')  # json, csv_data
+        data_type = request.args.get('type', 'kpis')  # kpis, trends, projects, types, bookings
+        format_type = request.args.get('format', 'json')  # json, csv, ndjson
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         filters = _parse_filters(request.args)
         
         # Validate parameters
-        valid_data_types = ['kpis', 'trends', 'projects', 'types']
+        valid_data_types = ['kpis', 'trends', 'projects', 'types', 'bookings']
         if data_type not in valid_data_types:
             return jsonify({
                 'error': f'Invalid data type. Must be one of: {", ".join(valid_data_types)}'
             }), 400
         
-        valid_formats = ['json', 'csv']
+        valid_formats = ['csv', 'ndjson'] if data_type == 'bookings' else ['json', 'csv', 'ndjson']
         if format_type not in valid_formats:
             return jsonify({
                 'error': f'Invalid format. Must be one of: {", ".join(valid_formats)}'
@@ -264,26 +252,47 @@ def export_analytics_data():
         # Parse dates
         start_dt, end_dt = _parse_date_range(start_date, end_date)
         
-        # Export data
-        export_data = AnalyticsService.export_data(
-            data_type, start_dt, end_dt, filters, format_type
+        if format_type == 'json':
+            export_data = AnalyticsService.export_data(data_type, start_dt, end_dt, filters)
+            return jsonify(export_data), 200
+        
+        # Stream the rows; the generator keeps the request context for the session
+        columns, rows = AnalyticsService.export_rows(data_type, start_dt, end_dt, filters)
+        encode, mimetype = EXPORT_FORMATS[format_type]
+        filename = f"{data_type}_export_{datetime.utcnow().strftime('%Y%m%d')}.{format_type}"
+        return Response(
+            stream_with_context(encode(columns, rows)),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
         )
         
-        # Set appropriate content type
-        if format_type == 'csv':
-            response = jsonify(export_data)
-            response.headers['Content-Type'] = 'application/json'
-        else:
-            response = jsonify(export_data)
-        
-        return response, 200
-        
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@analytics_bp.route('/cache/stats', methods=['GET'])
+@auth_required(['admin'])
+def get_cache_stats():
+    """Get analytics result cache and request coalescing counters for capacity planning."""
+    try:
+        from app.analytics.cache import get_cache
+        from app.analytics.coalesce import get_flights
+        
+        cache = get_cache()
+        flights = get_flights()
+        
+        return jsonify({
+            'enabled': cache is not None,
+            'stats': cache.stats() if cache else None,
+            'coalescing': flights.stats() if flights else None
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @analytics_bp.route('/filters/options', methods=['GET'])
 @auth_required(['admin'])
 def get_filter_options():
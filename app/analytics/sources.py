@@ -0,0 +1,163 @@
+"""Aggregation sources for analytics queries over bookings or the daily rollup."""
+from datetime import datetime, timedelta
+from typing import Any, Optional
+from sqlalchemy import func, case, select, literal, type_coerce, union_all, and_, or_, Float, Integer
+from app.models.booking import Booking, created_period_expressions
+from app.models.booking_rollup import BookingDailyRollup
+from app.analytics.filters import BookingFilter
+
+
+# Filters that can be answered from the rollup dimensions
+ROLLUP_FILTER_KEYS = {'status', 'project_name', 'property_type'}
+
+
+class RowSource:
+    """Aggregate expressions over individual booking rows."""
+
+    def __init__(self, columns=Booking):
+        """Initialize source over ``Booking`` or any relation with the same column names."""
+        self.c = columns
+
+    @property
+    def year(self):
+        """Calendar year of each booking's creation."""
+        return self.c.created_year
+
+    @property
+    def month(self):
+        """Calendar month (1-12) of each booking's creation."""
+        return self.c.created_month
+
+    @property
+    def quarter(self):
+        """Calendar quarter (1-4) of each booking's creation."""
+        return self.c.created_quarter
+
+    def count(self, condition: Optional[Any] = None):
+        """Count bookings, optionally only those matching ``condition``."""
+        if condition is None:
+            return func.count(self.c.id)
+        return func.count(case((condition, self.c.id)))
+
+    def total(self, name: str, condition: Optional[Any] = None):
+        """Sum a booking column, optionally only over rows matching ``condition``."""
+        column = getattr(self.c, name)
+        if condition is None:
+            return func.sum(column)
+        return func.sum(case((condition, column)))
+
+    def average(self, name: str):
+        """Average a booking column."""
+        return func.avg(getattr(self.c, name))
+
+
+class RollupSource(RowSource):
+    """Aggregate expressions re-summed from pre-aggregated rollup rows."""
+
+    def __init__(self, relation):
+        """Initialize source over a relation built by ``rollup_relation``."""
+        super().__init__(relation.c)
+
+    def count(self, condition: Optional[Any] = None):
+        """Count bookings, optionally only those matching ``condition``."""
+        counts = self.c.booking_count if condition is None else case((condition, self.c.booking_count))
+        return func.coalesce(func.sum(counts), 0)
+
+    def average(self, name: str):
+        """Average a booking column as total over count."""
+        average = func.sum(getattr(self.c, name)) / func.nullif(func.sum(self.c.booking_count), 0)
+        return type_coerce(average, Float)
+
+
+def rollup_compatible(spec: BookingFilter) -> bool:
+    """Check whether every active filter in ``spec`` is a rollup dimension."""
+    active = {key for key, value in spec.filters.items() if value not in (None, '', [])}
+    return active <= ROLLUP_FILTER_KEYS
+
+
+def rollup_relation(spec: BookingFilter):
+    """
+    Build a rollup-shaped relation covering exactly the bookings matched by ``spec``.
+
+    Whole days inside the date range are read from the daily rollup; the
+    partial days at either edge of the range are read from ``bookings`` and
+    projected to the same shape, one row per booking.
+
+    Args:
+        spec: Rollup-compatible booking filter
+
+    Returns:
+        Subquery with created_at, created_year, created_month, created_quarter,
+        project_name, type, status, booking_count, amount, tax_gst and area
+        columns
+    """
+    rollup = BookingDailyRollup
+    dimensions = BookingFilter(filters=spec.filters)
+    start_date, end_date = spec.start_date, spec.end_date
+
+    # Whole days are [full_start, full_end); anything outside comes from bookings
+    full_start = _ceil_day(start_date) if start_date else None
+    full_end = _floor_day(end_date) if end_date else None
+
+    branches = []
+    edges = []
+    if full_start and full_end and full_start >= full_end:
+        # Range lies within a single day or two adjacent partial days
+        edges.append(BookingFilter(start_date, end_date).clauses())
+    else:
+        day_range = []
+        if full_start:
+            day_range.append(rollup.day >= full_start.date())
+            if start_date < full_start:
+                edges.append([Booking.created_at >= start_date, Booking.created_at < full_start])
+        if full_end:
+            day_range.append(rollup.day < full_end.date())
+            edges.append([Booking.created_at >= full_end, Booking.created_at <= end_date])
+
+        # Rollup rows are few, so their calendar buckets are derived on the fly
+        year, month, quarter = created_period_expressions(rollup.day)
+        branches.append(select(
+            rollup.day.label('created_at'),
+            year.label('created_year'),
+            month.label('created_month'),
+            quarter.label('created_quarter'),
+            rollup.project_name,
+            rollup.type,
+            rollup.status,
+            rollup.booking_count,
+            rollup.amount_total.label('amount'),
+            rollup.tax_gst_total.label('tax_gst'),
+            rollup.area_total.label('area')
+        ).where(*dimensions.clauses(rollup), *day_range))
+
+    if edges:
+        branches.append(select(
+            Booking.created_at,
+            Booking.created_year,
+            Booking.created_month,
+            Booking.created_quarter,
+            Booking.project_name,
+            Booking.type,
+            Booking.status,
+            literal(1, Integer).label('booking_count'),
+            Booking.amount,
+            Booking.tax_gst,
+            Booking.area
+        ).where(*dimensions.clauses(Booking), or_(*[and_(*edge) for edge in edges])))
+
+    if len(branches) == 1:
+        return branches[0].subquery('rollup_rows')
+    return union_all(*branches).subquery('rollup_rows')
+
+
+def _floor_day(value: datetime) -> datetime:
+    """Truncate a timestamp to midnight of its day."""
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ceil_day(value: datetime) -> datetime:
+    """Round a timestamp up to the next midnight unless it already is one."""
+    floor = _floor_day(value)
+    if floor == value:
+        return floor
+    return floor + timedelta(days=1)
@@ -1 +1,2 @@
-# Booking management module
\ No newline at end of file
+# Booking management module
+from . import commands
@@ -0,0 +1,235 @@
+"""Validation and batched writes for bulk booking operations."""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from app import db
+from app.models import Booking, BookingDailyRollup, mark_bookings_changed
+
+# Fields every booking must provide, as for POST /api/bookings/
+REQUIRED_FIELDS = (
+    'customer_name', 'contact_number', 'project_name', 'type',
+    'area', 'agreement_cost', 'amount', 'timeline'
+)
+
+# Optional money fields and the defaults of the remaining optional fields
+MONEY_FIELDS = ('tax_gst', 'refund_buyer', 'refund_referral', 'onc_trust_fund', 'oncct_funded')
+OPTIONAL_DEFAULTS = {'invoice_status': 'pending', 'loan_req': 'no', 'status': 'active'}
+
+BOOKING_STATUSES = ('active', 'complete', 'cancelled')
+LOAN_REQ_VALUES = ('yes', 'no')
+
+# Fields a bulk update may set, with their allowed values (None for any text)
+BULK_UPDATE_FIELDS = {
+    'status': BOOKING_STATUSES,
+    'invoice_status': None,
+    'loan_req': LOAN_REQ_VALUES,
+}
+
+
+def parse_bulk_body(body: bytes, mimetype: str) -> List[Any]:
+    """
+    Split a bulk request body into booking payloads.
+
+    ``application/x-ndjson`` bodies hold one JSON object per line; a line
+    that is not valid JSON is returned as None so it is reported as an
+    invalid row. Any other body must be a JSON array.
+
+    Raises:
+        ValueError: If a non-NDJSON body is not a JSON array
+    """
+    if mimetype == 'application/x-ndjson':
+        payloads = []
+        for line in body.decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            try:
+                payloads.append(json.loads(line))
+            except ValueError:
+                payloads.append(None)
+        return payloads
+
+    try:
+        payloads = json.loads(body)
+    except ValueError:
+        raise ValueError('Request body must be a JSON array of bookings or NDJSON')
+    if not isinstance(payloads, list):
+        raise ValueError('Request body must be a JSON array of bookings or NDJSON')
+    return payloads
+
+
+def prepare_booking(data: Any, user_id: int, now: datetime,
+                    historical: bool = False) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Validate one booking payload and build its insert values.
+
+    Applies the checks of POST /api/bookings/ and ``Booking.validate_data``,
+    plus the table constraints the single-row endpoint leaves to the
+    database, since one violation would abort a whole batched insert.
+
+    Args:
+        data: Booking fields as parsed from JSON or CSV
+        user_id: Id of the user creating the booking
+        now: Timestamp recorded as updated_at, and as created_at by default
+        historical: Accept past timelines and an ISO ``created_at`` field,
+            for bookings migrated from earlier records
+
+    Returns:
+        Tuple of (column values, []) for a valid booking, or (None, errors)
+    """
+    if not isinstance(data, dict):
+        return None, ['Booking must be a JSON object']
+
+    missing_fields = [field for field in REQUIRED_FIELDS if not data.get(field)]
+    if missing_fields:
+        return None, [f'Missing required fields: {", ".join(missing_fields)}']
+
+    try:
+        timeline = datetime.fromisoformat(data['timeline'].replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None, ['Invalid timeline format. Use ISO format.']
+
+    created_at = now
+    if historical and data.get('created_at'):
+        try:
+            created_at = datetime.fromisoformat(data['created_at'].replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            return None, ['Invalid created_at format. Use ISO format.']
+
+    try:
+        values = {
+            'customer_name': data['customer_name'].strip(),
+            'contact_number': data['contact_number'].strip(),
+            'project_name': data['project_name'].strip(),
+            'type': data['type'].strip(),
+            'area': float(data['area']),
+            'agreement_cost': float(data['agreement_cost']),
+            'amount': float(data['amount']),
+            'timeline': timeline
+        }
+        for field in MONEY_FIELDS:
+            values[field] = float(data.get(field) or 0)
+    except (ValueError, TypeError, AttributeError) as e:
+        return None, [f'Invalid data type: {str(e)}']
+
+    for field, default in OPTIONAL_DEFAULTS.items():
+        values[field] = data.get(field) or default
+
+    errors = Booking(**values).validate_data(historical=historical)
+    errors.extend(f'{field} cannot be negative' for field in MONEY_FIELDS if values[field] < 0)
+    if values['status'] not in BOOKING_STATUSES:
+        errors.append(f'Status must be one of: {", ".join(BOOKING_STATUSES)}')
+    if values['loan_req'] not in LOAN_REQ_VALUES:
+        errors.append("Loan requirement must be 'yes' or 'no'")
+    if errors:
+        return None, errors
+
+    values.update(created_at=created_at, updated_at=now, created_by=user_id)
+    return values, []
+
+
+def insert_bookings(rows: List[Dict[str, Any]]) -> Optional[List[int]]:
+    """
+    Insert prepared bookings with one batched statement in the current transaction.
+
+    Bypasses the unit of work, so the rollup deltas and the write generation
+    are maintained here. The caller commits.
+
+    Returns:
+        New booking ids in the order of ``rows``, or None if the database
+        cannot return them from a batched insert
+    """
+    if not rows:
+        return []
+
+    table = Booking.__table__
+    connection = db.session.connection()
+    if connection.dialect.insert_executemany_returning_sort_by_parameter_order:
+        statement = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+        ids = list(connection.execute(statement, rows).scalars())
+    else:
+        connection.execute(table.insert(), rows)
+        ids = None
+
+    BookingDailyRollup.apply_deltas(connection, BookingDailyRollup.collect_deltas(rows, 1))
+    mark_bookings_changed()
+    return ids
+
+
+def prepare_bulk_update(data: Any) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Validate the ``set`` object of a bulk update.
+
+    Returns:
+        Tuple of (column values, []) when valid, or (None, errors)
+    """
+    if not isinstance(data, dict) or not data:
+        return None, [f'"set" must name at least one of: {", ".join(BULK_UPDATE_FIELDS)}']
+
+    errors = []
+    values = {}
+    for field, value in data.items():
+        if field not in BULK_UPDATE_FIELDS:
+            errors.append(f'{field} cannot be bulk updated')
+            continue
+        allowed = BULK_UPDATE_FIELDS[field]
+        if not isinstance(value, str) or not value.strip():
+            errors.append(f'{field} must be a non-empty string')
+        elif allowed is not None and value not in allowed:
+            errors.append(f'{field} must be one of: {", ".join(allowed)}')
+        else:
+            values[field] = value.strip()
+    return (None, errors) if errors else (values, [])
+
+
+def update_bookings(condition, values: Dict[str, Any]) -> int:
+    """
+    Set ``values`` on every booking matching ``condition`` with one UPDATE.
+
+    Bookings already holding all the values are left untouched, so their
+    updated_at keeps recording their last real change. Status moves
+    bookings between rollup rows, so the rollup is adjusted from one
+    grouped query taken before the update. The caller commits.
+
+    Returns:
+        Number of bookings updated
+    """
+    table = Booking.__table__
+    connection = db.session.connection()
+    changing = and_(condition, or_(*[table.c[name] != value for name, value in values.items()]))
+
+    deltas = None
+    if 'status' in values:
+        deltas = BookingDailyRollup.collect_matching_deltas(connection, changing, -1)
+        BookingDailyRollup.collect_matching_deltas(connection, changing, 1, deltas, status=values['status'])
+
+    result = connection.execute(
+        table.update().where(changing).values(updated_at=datetime.utcnow(), **values)
+    )
+
+    if result.rowcount:
+        if deltas:
+            BookingDailyRollup.apply_deltas(connection, deltas)
+        mark_bookings_changed()
+    return result.rowcount
+
+
+def delete_bookings(condition) -> int:
+    """
+    Permanently delete every booking matching ``condition`` with one DELETE.
+
+    The caller commits.
+
+    Returns:
+        Number of bookings deleted
+    """
+    table = Booking.__table__
+    connection = db.session.connection()
+
+    deltas = BookingDailyRollup.collect_matching_deltas(connection, condition, -1)
+    result = connection.execute(table.delete().where(condition))
+
+    if result.rowcount:
+        BookingDailyRollup.apply_deltas(connection, deltas)
+        mark_bookings_changed()
+    return result.rowcount
@@ -0,0 +1,107 @@
+"""Incremental change feed over the booking change journal."""
+import base64
+import binascii
+import json
+from typing import Any, List, NamedTuple, Optional, Tuple
+from sqlalchemy import select, tuple_
+from app import db
+from app.models import Booking, BookingChange
+from app.models.booking_change import ChangePosition, change_journal_head, settled_changes
+
+
+class ChangePage(NamedTuple):
+    """Bookings written and ids deleted after a token, with the token to resume from."""
+
+    bookings: List[Any]
+    deleted: List[int]
+    next_token: str
+    has_more: bool
+
+
+class StaleChangeToken(Exception):
+    """Raised when a change token was issued by another journal."""
+
+
+def encode_change_token(epoch: str, position: ChangePosition) -> str:
+    """Encode a journal position as an opaque URL-safe token."""
+    payload = json.dumps([epoch, *position], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_change_token(token: str) -> Tuple[str, ChangePosition]:
+    """
+    Decode a token produced by ``encode_change_token``.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        epoch, txid, seq = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        for value in (txid, seq):
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError(value)
+        if not isinstance(epoch, str):
+            raise ValueError(epoch)
+    except (ValueError, TypeError, UnicodeError, binascii.Error):
+        raise ValueError('Invalid change token.')
+    return epoch, (txid, seq)
+
+
+def current_change_token(epoch: str) -> str:
+    """Token for the latest journal entry, from which only later changes are returned."""
+    return encode_change_token(epoch, change_journal_head())
+
+
+def changes_since(epoch: str, token: Optional[str], limit: int) -> ChangePage:
+    """
+    Read up to ``limit`` settled journal entries after ``token``, oldest first.
+
+    Without a token the feed starts from the beginning of the journal and
+    leaves out tombstones, returning a snapshot of the current bookings.
+    Each booking appears at most once, in its latest state, so applying the
+    pages in order reproduces the table.
+
+    Args:
+        epoch: Epoch of the current journal
+        token: Token from a previous page, or None for a full snapshot
+        limit: Maximum number of entries
+
+    Returns:
+        ChangePage; ``next_token`` repeats ``token`` when nothing changed
+
+    Raises:
+        ValueError: If the token is malformed
+        StaleChangeToken: If the token belongs to another journal
+    """
+    since = (0, 0)
+    if token:
+        token_epoch, since = decode_change_token(token)
+        if token_epoch != epoch:
+            raise StaleChangeToken('Change token is from another database; resynchronize without since.')
+
+    statement = select(
+        BookingChange.txid, BookingChange.seq, BookingChange.booking_id, BookingChange.deleted, Booking
+    ).outerjoin(
+        Booking, Booking.id == BookingChange.booking_id
+    ).where(
+        tuple_(BookingChange.txid, BookingChange.seq) > tuple_(*since),
+        settled_changes()
+    ).order_by(BookingChange.txid, BookingChange.seq).limit(limit + 1)
+    if not token:
+        statement = statement.where(BookingChange.deleted.is_(False))
+
+    rows = db.session.execute(statement).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    bookings = []
+    deleted = []
+    for txid, seq, booking_id, is_deleted, booking in rows:
+        if is_deleted or booking is None:
+            deleted.append(booking_id)
+        else:
+            bookings.append(booking)
+
+    last = (rows[-1].txid, rows[-1].seq) if rows else since
+    return ChangePage(bookings, deleted, encode_change_token(epoch, last), has_more)
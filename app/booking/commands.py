@@ -0,0 +1,69 @@
+"""Booking maintenance CLI commands."""
+import click
+from app.booking.routes import booking_bp
+
+
+@booking_bp.cli.command('import-csv')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', type=click.IntRange(min=1), default=None,
+              help='Valid rows committed per transaction (default BOOKING_IMPORT_CHUNK_SIZE).')
+@click.option('--start-line', type=click.IntRange(min=0), default=0,
+              help='Resume after this CSV line, as reported by an interrupted import.')
+@click.option('--username', default='admin', show_default=True, help='User recorded as the creator.')
+def import_csv_command(path, chunk_size, start_line, username):
+    """Import historical bookings from the CSV file at PATH."""
+    from flask import current_app
+    from app.booking.importer import import_bookings_csv
+    from app.models import User
+    
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f'Unknown user: {username}')
+    
+    def progress(report):
+        click.echo(f'Committed {report.imported} bookings through line {report.last_committed_line} '
+                   f'({report.rows_read / report.elapsed:.0f} rows/s)')
+    
+    with open(path, 'rb') as stream:
+        report = import_bookings_csv(
+            stream, user.id,
+            chunk_size=chunk_size or current_app.config.get('BOOKING_IMPORT_CHUNK_SIZE', 5000),
+            start_line=start_line,
+            progress=progress
+        )
+    
+    summary = report.to_dict()
+    for rejection in summary['rejections']:
+        click.echo(f"Line {rejection['line']}: {'; '.join(rejection['errors'])}")
+    if summary['rejections_truncated']:
+        click.echo(f"... {report.rejected - len(summary['rejections'])} more rejected rows")
+    click.echo(f"Imported {report.imported} bookings, rejected {report.rejected} "
+               f"in {summary['elapsed_seconds']}s ({summary['rows_per_second']} rows/s)")
+    
+    if report.error:
+        raise click.ClickException(f'{report.error}. Resume with --start-line {report.last_committed_line}')
+
+
+@booking_bp.cli.command('check-counters')
+@click.option('--repair', is_flag=True, help='Rebuild the counters from the bookings table if they disagree.')
+def check_counters_command(repair):
+    """Compare the booking counters behind /stats with the bookings table."""
+    from app.database import rebuild_booking_counters
+    from app.models import BookingCounter
+    
+    mismatches = BookingCounter.check()
+    if not mismatches:
+        click.echo('booking_counters match the bookings table')
+        return
+    
+    for status, totals in mismatches.items():
+        stored_count, stored_amount = totals['stored']
+        actual_count, actual_amount = totals['actual']
+        click.echo(f'{status}: stored {stored_count} bookings / {stored_amount}, '
+                   f'actual {actual_count} bookings / {actual_amount}')
+    
+    if not repair:
+        raise click.ClickException(f'{len(mismatches)} counters disagree with the bookings table; '
+                                   'rerun with --repair to rebuild them')
+    rows = rebuild_booking_counters()
+    click.echo(f'Rebuilt booking_counters with {rows} rows')
@@ -0,0 +1,157 @@
+"""Exact and approximate row counts for booking list pagination and statistics."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from flask import current_app
+from sqlalchemy import text
+from app import db
+from app.models import BookingCounter
+
+# Accepted values of the ``include_total`` list parameter
+TOTAL_MODES = ('none', 'exact', 'estimate')
+
+
+class CountCache:
+    """
+    Small LRU of row counts that expire after a fixed time.
+
+    Booking writes deliberately do not invalidate entries: an estimate may
+    be up to ``ttl`` seconds stale, which is what makes it cheap.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 60):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        """Return the cached count for ``key``, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, count = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return count
+
+    def put(self, key: Hashable, count: int) -> None:
+        """Store a count, evicting the least recently used entries beyond ``max_entries``."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), count)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached count."""
+        with self._lock:
+            self._entries.clear()
+
+
+def estimate_count(query) -> int:
+    """
+    Approximate the number of rows ``query`` returns.
+
+    An unfiltered listing is answered from the planner's table statistics
+    when they exist. Otherwise the exact count is computed once per filter
+    signature and reused for ``BOOKING_COUNT_ESTIMATE_TTL`` seconds.
+
+    Args:
+        query: Filtered ORM query without ordering
+    """
+    statement = query.statement
+    if statement.whereclause is None:
+        estimate = table_row_estimate(statement.get_final_froms()[0].name)
+        if estimate is not None:
+            return estimate
+
+    compiled = statement.compile(dialect=db.session.get_bind().dialect)
+    signature = (str(compiled), tuple(sorted((name, repr(value)) for name, value in compiled.params.items())))
+
+    cache = _get_count_cache()
+    count = cache.get(signature)
+    if count is None:
+        count = query.order_by(None).count()
+        cache.put(signature, count)
+    return count
+
+
+def table_row_estimate(table_name: str) -> Optional[int]:
+    """
+    Read a table's row count from the database's planner statistics.
+
+    Uses ``sqlite_stat1`` on SQLite and ``pg_class.reltuples`` on Postgres;
+    both are refreshed by ANALYZE rather than on every write.
+
+    Returns:
+        Estimated row count, or None if the table has not been analyzed
+    """
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+
+    if dialect == 'sqlite':
+        has_stats = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        )).first() is not None
+        if not has_stats:
+            return None
+        # The first number of each index's stat is the rows it covers; partial
+        # indexes cover fewer, so the largest is the table's row count
+        stats = connection.execute(
+            text('SELECT stat FROM sqlite_stat1 WHERE tbl = :table'), {'table': table_name}
+        ).scalars().all()
+        counts = [int(stat.split()[0]) for stat in stats if stat]
+        return max(counts) if counts else None
+
+    if dialect == 'postgresql':
+        reltuples = connection.execute(
+            text('SELECT reltuples FROM pg_class WHERE relname = :table'), {'table': table_name}
+        ).scalar()
+        # -1 means the table has never been vacuumed or analyzed
+        return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+
+    return None
+
+
+def _get_count_cache() -> CountCache:
+    """Return the current application's estimated count cache, creating it on first use."""
+    cache = current_app.extensions.get('booking_count_cache')
+    if cache is None:
+        cache = CountCache(
+            max_entries=current_app.config.get('BOOKING_COUNT_CACHE_MAX_ENTRIES', 512),
+            ttl=current_app.config.get('BOOKING_COUNT_ESTIMATE_TTL', 60)
+        )
+        current_app.extensions['booking_count_cache'] = cache
+    return cache
+
+
+def booking_stats() -> Dict[str, Any]:
+    """
+    Summarize bookings by status.
+
+    Read from the per-status counters maintained with every booking write,
+    so the cost does not grow with the table.
+    """
+    counters = BookingCounter.totals()
+    counts = {status: count for status, (count, _) in counters.items()}
+
+    total_bookings = sum(counts.values())
+    completed_bookings = counts.get('complete', 0)
+
+    # Revenue counts active and completed bookings
+    total_revenue = float(sum(amount for status, (_, amount) in counters.items() if status != 'cancelled'))
+
+    return {
+        'total_bookings': total_bookings,
+        'active_bookings': counts.get('active', 0),
+        'completed_bookings': completed_bookings,
+        'cancelled_bookings': counts.get('cancelled', 0),
+        'total_revenue': total_revenue,
+        'completion_rate': (completed_bookings / total_bookings * 100) if total_bookings > 0 else 0
+    }
@@ -0,0 +1,96 @@
+"""Sparse fieldsets: serialize selected booking columns straight from result rows."""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from app.models import Booking
+
+# Fields of ``Booking.to_dict`` in output order
+BOOKING_FIELDS = (
+    'id', 'customer_name', 'contact_number', 'project_name', 'type', 'area',
+    'agreement_cost', 'amount', 'tax_gst', 'refund_buyer', 'refund_referral',
+    'onc_trust_fund', 'oncct_funded', 'invoice_status', 'timeline', 'loan_req',
+    'status', 'created_at', 'updated_at', 'created_by', 'total_amount', 'net_refund'
+)
+
+# Columns rendered as floats and as ISO timestamps, as ``to_dict`` does
+FLOAT_FIELDS = frozenset({
+    'area', 'agreement_cost', 'amount', 'tax_gst', 'refund_buyer',
+    'refund_referral', 'onc_trust_fund', 'oncct_funded'
+})
+DATETIME_FIELDS = frozenset({'timeline', 'created_at', 'updated_at'})
+
+# Computed fields and the columns they are summed from
+DERIVED_FIELDS = {
+    'total_amount': ('amount', 'tax_gst'),
+    'net_refund': ('refund_buyer', 'refund_referral'),
+}
+
+
+class FieldSelection:
+    """
+    Projection of the bookings table onto a set of requested fields.
+
+    ``columns`` are the table columns to select: the requested ones, those
+    that derived fields are computed from, and any extra columns the caller
+    needs (such as a sort key for cursors). ``serialize`` turns a result row
+    whose leading values are those columns into the same dictionary
+    ``Booking.to_dict`` would produce, restricted to the requested fields.
+    """
+
+    def __init__(self, fields: Sequence[str], extra_columns: Iterable[str] = ()):
+        """Build the column list and per-field converters."""
+        # The id is always returned so results can be addressed
+        self.fields = ['id'] + [field for field in BOOKING_FIELDS if field in fields and field != 'id']
+
+        names: List[str] = []
+        for field in list(self.fields) + list(extra_columns):
+            for name in DERIVED_FIELDS.get(field, (field,)):
+                if name not in names:
+                    names.append(name)
+        table = Booking.__table__
+        self.columns = [table.c[name] for name in names]
+
+        position = {name: index for index, name in enumerate(names)}
+        self._converters = [(field, _converter(field, position)) for field in self.fields]
+
+    def serialize(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """Convert one result row to a response dictionary."""
+        return {field: convert(row) for field, convert in self._converters}
+
+    def values(self, row: Sequence[Any]) -> List[Any]:
+        """Convert one result row to its field values, in ``fields`` order."""
+        return [convert(row) for _, convert in self._converters]
+
+
+def parse_fields(value: Optional[str], extra_columns: Iterable[str] = ()) -> Optional[FieldSelection]:
+    """
+    Parse a comma-separated ``fields`` parameter.
+
+    Returns:
+        FieldSelection, or None when no fields were requested (full rows)
+
+    Raises:
+        ValueError: If a field name is not a booking field
+    """
+    if not value:
+        return None
+
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in BOOKING_FIELDS]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+    if not fields:
+        return None
+    return FieldSelection(fields, extra_columns)
+
+
+def _converter(field: str, position: Dict[str, int]) -> Callable[[Sequence[Any]], Any]:
+    """Build the function extracting and formatting ``field`` from a row."""
+    if field in DERIVED_FIELDS:
+        first, second = (position[name] for name in DERIVED_FIELDS[field])
+        return lambda row: float(row[first]) + float(row[second])
+
+    index = position[field]
+    if field in FLOAT_FIELDS:
+        return lambda row: float(row[index])
+    if field in DATETIME_FIELDS:
+        return lambda row: row[index].isoformat() if row[index] else None
+    return lambda row: row[index]
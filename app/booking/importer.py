@@ -0,0 +1,141 @@
+"""Streaming CSV import of historical bookings."""
+import codecs
+import csv
+import time
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+from app import db
+from app.booking.bulk import REQUIRED_FIELDS, insert_bookings, prepare_booking
+
+
+class ImportReport:
+    """Progress and outcome of one CSV import."""
+
+    def __init__(self, start_line: int = 0, max_rejections: int = 1000):
+        """Initialize an empty report for an import resuming after ``start_line``."""
+        self.start_line = start_line
+        self.max_rejections = max_rejections
+        self.rows_read = 0
+        self.imported = 0
+        self.rejected = 0
+        self.rejections: List[Dict[str, Any]] = []
+        self.chunks = 0
+        self.last_committed_line = start_line
+        self.error: Optional[str] = None
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the import started, or its total duration once finished."""
+        return (self._finished or time.perf_counter()) - self._started
+
+    def reject(self, line: int, errors: List[str]) -> None:
+        """Record a rejected row, keeping details for the first ``max_rejections``."""
+        self.rejected += 1
+        if len(self.rejections) < self.max_rejections:
+            self.rejections.append({'line': line, 'errors': errors})
+
+    def finish(self) -> None:
+        """Stop the clock."""
+        self._finished = time.perf_counter()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert report to dictionary representation."""
+        elapsed = self.elapsed
+        return {
+            'start_line': self.start_line,
+            'rows_read': self.rows_read,
+            'imported': self.imported,
+            'rejected': self.rejected,
+            'rejections': self.rejections,
+            'rejections_truncated': self.rejected > len(self.rejections),
+            'chunks': self.chunks,
+            'last_committed_line': self.last_committed_line,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(self.rows_read / elapsed, 1) if elapsed > 0 else None,
+            'error': self.error
+        }
+
+
+def import_bookings_csv(stream: BinaryIO, user_id: int, chunk_size: int = 5000, start_line: int = 0,
+                        progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+    """
+    Import bookings from a CSV byte stream, committing every ``chunk_size`` valid rows.
+
+    The stream is decoded and parsed row by row, so the file is never held
+    in memory. The header names booking fields; besides the fields of
+    POST /api/bookings/ a ``created_at`` column is honoured, and past
+    timelines are accepted since the bookings are historical.
+
+    Rows are identified by the CSV line they end on (the header is line 1).
+    ``last_committed_line`` in the report is the last line whose chunk was
+    committed: passing it as ``start_line`` resumes an interrupted import
+    without duplicating rows.
+
+    Args:
+        stream: Binary file object with UTF-8 CSV
+        user_id: Id of the user recorded as creator
+        chunk_size: Valid rows inserted per transaction
+        start_line: Skip rows ending on or before this line
+        progress: Called with the report after every committed chunk
+
+    Returns:
+        ImportReport; ``error`` is set if the import stopped early
+    """
+    report = ImportReport(start_line)
+    reader = csv.DictReader(codecs.iterdecode(stream, 'utf-8-sig'))
+    rows = []
+    chunk_end = start_line
+    try:
+        missing = [field for field in REQUIRED_FIELDS if field not in (reader.fieldnames or [])]
+        if missing:
+            report.error = f'CSV header is missing columns: {", ".join(missing)}'
+            report.finish()
+            return report
+
+        for data in reader:
+            line = reader.line_num
+            if line <= start_line:
+                continue
+
+            report.rows_read += 1
+            chunk_end = line
+            if None in data:
+                report.reject(line, ['Row has more values than the header'])
+                continue
+
+            values, errors = prepare_booking(data, user_id, datetime.utcnow(), historical=True)
+            if errors:
+                report.reject(line, errors)
+                continue
+
+            rows.append(values)
+            if len(rows) >= chunk_size:
+                _commit_chunk(rows, chunk_end, report, progress)
+                rows = []
+
+        if chunk_end > report.last_committed_line:
+            _commit_chunk(rows, chunk_end, report, progress)
+    except (csv.Error, UnicodeDecodeError) as e:
+        db.session.rollback()
+        report.error = f'Unreadable CSV after line {report.last_committed_line}: {e}'
+    except Exception as e:
+        db.session.rollback()
+        report.error = f'Import stopped after line {report.last_committed_line}: {e}'
+
+    report.finish()
+    return report
+
+
+def _commit_chunk(rows: List[Dict[str, Any]], line: int, report: ImportReport,
+                  progress: Optional[Callable[[ImportReport], None]]) -> None:
+    """Insert and commit one chunk of prepared rows ending on ``line``."""
+    if rows:
+        insert_bookings(rows)
+        db.session.commit()
+        report.imported += len(rows)
+        report.chunks += 1
+    report.last_committed_line = line
+    if progress:
+        progress(report)
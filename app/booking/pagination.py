@@ -0,0 +1,118 @@
+"""Keyset (cursor) pagination for booking listings."""
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, List, NamedTuple, Optional
+from sqlalchemy import literal, tuple_
+
+
+class KeysetPage(NamedTuple):
+    """One page of keyset results with cursors to its neighbours."""
+
+    items: List[Any]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+def paginate_keyset(query, sort_column, id_column, descending: bool,
+                    cursor: Optional[str], per_page: int) -> KeysetPage:
+    """
+    Fetch one page of ``query`` ordered by (sort_column, id_column).
+
+    Each page is a range scan starting just past the cursor's (sort value,
+    id) pair, so its cost does not depend on how deep the page is. The id
+    breaks ties, making the order total.
+
+    Args:
+        query: Filtered ORM query without ordering
+        sort_column: Column to sort on
+        id_column: Unique column used as the tie-breaker
+        descending: Sort direction
+        cursor: Token from a previous page, or None for the first page
+        per_page: Maximum number of items per page
+
+    Returns:
+        KeysetPage with the items and the next/previous cursors
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    sort_key = sort_column.key
+    position = decode_cursor(cursor) if cursor else None
+    if position and (position['sort'] != sort_key or position['desc'] != descending):
+        raise ValueError('Cursor does not match the requested sort order.')
+
+    # Previous pages are fetched by scanning backwards from the cursor
+    backwards = position is not None and position['dir'] == 'prev'
+    scan_descending = descending != backwards
+
+    if position:
+        # Rows strictly past the cursor in the direction being scanned
+        boundary = tuple_(sort_column, id_column)
+        key = tuple_(literal(position['value'], sort_column.type), literal(position['id'], id_column.type))
+        query = query.filter(boundary < key if scan_descending else boundary > key)
+
+    if scan_descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    items = query.limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+
+    if backwards:
+        items.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, position is not None
+
+    def cursor_for(item, direction):
+        return encode_cursor(sort_key, descending, getattr(item, sort_key), getattr(item, id_column.key), direction)
+
+    return KeysetPage(
+        items=items,
+        next_cursor=cursor_for(items[-1], 'next') if items and has_next else None,
+        prev_cursor=cursor_for(items[0], 'prev') if items and has_prev else None
+    )
+
+
+def encode_cursor(sort_key: str, descending: bool, value: Any, item_id: int, direction: str) -> str:
+    """Encode a page boundary as an opaque URL-safe token."""
+    if isinstance(value, datetime):
+        encoded = ['dt', value.isoformat()]
+    elif isinstance(value, Decimal):
+        encoded = ['dec', str(value)]
+    else:
+        encoded = ['raw', value]
+
+    payload = json.dumps([sort_key, descending, encoded, item_id, direction], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a token produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_key, descending, (kind, value), item_id, direction = json.loads(
+            base64.urlsafe_b64decode(padded.encode('ascii'))
+        )
+        if kind == 'dt':
+            value = datetime.fromisoformat(value)
+        elif kind == 'dec':
+            value = Decimal(value)
+        elif kind != 'raw':
+            raise ValueError(kind)
+        if direction not in ('next', 'prev') or not isinstance(item_id, int):
+            raise ValueError(direction)
+    except (ValueError, TypeError, UnicodeError, binascii.Error, InvalidOperation):
+        raise ValueError('Invalid cursor.')
+
+    return {'sort': sort_key, 'desc': descending, 'value': value, 'id': item_id, 'dir': direction}
@@ -1,18 +1,46 @@
 """Booking management API routes."""
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from datetime import datetime
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, select
 from app import db
 from app.models import Booking, User
+from app.models.booking_change import change_journal_epoch
+from app.models.booking_search import matching_ids, ranked_search
 from app.auth.auth_service import token_required, auth_required
+from app.booking.bulk import (
+    BOOKING_STATUSES, delete_bookings, insert_bookings, parse_bulk_body,
+    prepare_booking, prepare_bulk_update, update_bookings
+)
+from app.booking.importer import import_bookings_csv
+from app.booking.changes import StaleChangeToken, changes_since, current_change_token
+from app.booking.counts import TOTAL_MODES, booking_stats, estimate_count
+from app.booking.fields import BOOKING_FIELDS, FieldSelection, parse_fields
+from app.booking.pagination import paginate_keyset
+from app.analytics.export import EXPORT_BATCH_SIZE, EXPORT_FORMATS
+from app.etag import conditional_get
+from app.idempotency import idempotent
 
 booking_bp = Blueprint('booking', __name__)
 
+# List filter parameters accepted by bulk updates and deletes
+BULK_FILTER_KEYS = ('search', 'project_name', 'customer_name', 'status', 'type', 'start_date', 'end_date')
+
 
 @booking_bp.route('/', methods=['GET'])
 @auth_required(['admin', 'sales_person'])
+@conditional_get
 def get_bookings():
-    """Get all bookings with optional search and filtering."""
+    """
+    Get all bookings with optional search and filtering.
+    
+    Pages by ``page``/``per_page`` by default. Passing ``cursor`` (empty for
+    the first page) switches to keyset pagination, returning opaque
+    ``next_cursor``/``prev_cursor`` tokens instead of page numbers and totals.
+    
+    ``include_total`` controls the matching-row count: ``exact`` (the default
+    for page numbers) runs COUNT(*), ``estimate`` uses table statistics or a
+    briefly cached count, and ``none`` (the default for cursors) skips it.
+    """
     try:
         # Get query parameters
         page = request.args.get('page', 1, type=int)
@@ -33,79 +61,122 @@ def get_bookings():
         sort_by = request.args.get('sort_by', 'created_at')
         sort_order = request.args.get('sort_order', 'desc')
         
-        # Build query
-        query = Booking.query
-        
-        # Apply search filters
-        if search:
-            search_filter = or_(
-                Booking.customer_name.ilike(f'%{search}%'),
-                Booking.project_name.ilike(f'%{search}%'),
-                Booking.contact_number.ilike(f'%{search}%'),
-                Booking.type.ilike(f'%{search}%'),
-                Booking.invoice_status.ilike(f'%{search}%')
-            )
-            query = query.filter(search_filter)
-        
-        # Apply specific filters
-        if project_name:
-            query = query.filter(Booking.project_name.ilike(f'%{project_name}%'))
-        
-        if customer_name:
-            query = query.filter(Booking.customer_name.ilike(f'%{customer_name}%'))
-        
-        if status and status in ['active', 'complete', 'cancelled']:
-            query = query.filter(Booking.status == status)
+        # Total count
+        keyset = 'cursor' in request.args
+        include_total = request.args.get('include_total', 'none' if keyset else 'exact').lower()
+        if include_total not in TOTAL_MODES:
+            return jsonify({'error': f'include_total must be one of: {", ".join(TOTAL_MODES)}'}), 400
         
-        if property_type:
-            query = query.filter(Booking.type.ilike(f'%{property_type}%'))
-        
-        # Date range filtering
-        if start_date:
-            try:
-                start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                query = query.filter(Booking.created_at >= start_dt)
-            except ValueError:
-                return jsonify({'error': 'Invalid start_date format. Use ISO format.'}), 400
-        
-        if end_date:
-            try:
-                end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                query = query.filter(Booking.created_at <= end_dt)
-            except ValueError:
-                return jsonify({'error': 'Invalid end_date format. Use ISO format.'}), 400
+        # Build query
+        try:
+            query = _filter_bookings(Booking.query, {
+                'search': search,
+                'project_name': project_name,
+                'customer_name': customer_name,
+                'status': status,
+                'type': property_type,
+                'start_date': start_date,
+                'end_date': end_date
+            })
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Apply sorting
-        valid_sort_fields = ['created_at', 'updated_at', 'customer_name', 'project_name', 
-                           'amount', 'timeline', 'status']
-        if sort_by in valid_sort_fields:
-            sort_column = getattr(Booking, sort_by)
-            if sort_order.lower() == 'desc':
-                query = query.order_by(sort_column.desc())
-            else:
-                query = query.order_by(sort_column.asc())
-        else:
-            query = query.order_by(Booking.created_at.desc())
+        sort_column, descending = _sort_order(sort_by, sort_order)
         
-        # Execute paginated query
-        pagination = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
-        
-        bookings = [booking.to_dict() for booking in pagination.items]
+        # Sparse fieldsets select only the requested columns, as plain rows
+        try:
+            selection = parse_fields(request.args.get('fields'), extra_columns=[sort_column.key])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        listing = query.with_entities(*selection.columns) if selection else query
         
-        return jsonify({
-            'bookings': bookings,
-            'pagination': {
+        if keyset:
+            # Keyset pagination: constant cost per page at any depth
+            try:
+                page_result = paginate_keyset(
+                    listing, sort_column, Booking.id, descending,
+                    request.args.get('cursor'), per_page
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            items = page_result.items
+            pagination_info = {
+                'per_page': per_page,
+                'next_cursor': page_result.next_cursor,
+                'prev_cursor': page_result.prev_cursor,
+                'has_next': page_result.next_cursor is not None,
+                'has_prev': page_result.prev_cursor is not None
+            }
+            if include_total == 'exact':
+                pagination_info['total'] = query.count()
+            elif include_total == 'estimate':
+                pagination_info['total'] = estimate_count(query)
+                pagination_info['total_estimated'] = True
+        elif include_total == 'exact':
+            listing = listing.order_by(sort_column.desc() if descending else sort_column.asc())
+            
+            # Execute paginated query
+            pagination = listing.paginate(
+                page=page, 
+                per_page=per_page, 
+                error_out=False
+            )
+            
+            items = pagination.items
+            pagination_info = {
                 'page': page,
                 'per_page': per_page,
                 'total': pagination.total,
                 'pages': pagination.pages,
                 'has_next': pagination.has_next,
                 'has_prev': pagination.has_prev
-            },
+            }
+        else:
+            # Fetch one extra row to learn whether a next page exists without counting
+            page = max(page, 1)
+            rows = listing.order_by(
+                sort_column.desc() if descending else sort_column.asc()
+            ).offset((page - 1) * per_page).limit(per_page + 1).all()
+            items = rows[:per_page]
+            has_next = len(rows) > per_page
+            
+            total = None
+            estimated = False
+            if include_total == 'estimate':
+                total = estimate_count(query)
+                estimated = True
+                seen = (page - 1) * per_page + len(items)
+                if has_next:
+                    total = max(total, seen + 1)
+                elif items or page == 1:
+                    # The last page pins the total down exactly
+                    total = seen
+                    estimated = False
+                else:
+                    # A page past the end only bounds the total from above
+                    total = min(total, seen)
+            
+            pagination_info = {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'pages': (total + per_page - 1) // per_page if total is not None else None,
+                'has_next': has_next,
+                'has_prev': page > 1
+            }
+            if estimated:
+                pagination_info['total_estimated'] = True
+        
+        if selection:
+            bookings = [selection.serialize(row) for row in items]
+        else:
+            bookings = [booking.to_dict() for booking in items]
+        
+        return jsonify({
+            'bookings': bookings,
+            'pagination': pagination_info,
             'filters_applied': {
                 'search': search,
                 'project_name': project_name,
@@ -115,7 +186,8 @@ def get_bookings():
                 'start_date': start_date,
                 'end_date': end_date,
                 'sort_by': sort_by,
-                'sort_order': sort_order
+                'sort_order': sort_order,
+                'fields': selection.fields if selection else None
             }
         }), 200
         
@@ -123,11 +195,122 @@ def get_bookings():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@booking_bp.route('/export', methods=['GET'])
+@auth_required(['admin', 'sales_person'])
+def export_bookings():
+    """
+    Stream every booking matching the list filters as CSV or NDJSON.
+    
+    Accepts the list endpoint's filter, ``sort_by``/``sort_order`` and
+    ``fields`` parameters. Rows are read through one server-side cursor in
+    batches and encoded as they arrive, so memory use does not grow with
+    the number of bookings exported.
+    """
+    try:
+        format_type = request.args.get('format', 'csv')
+        if format_type not in EXPORT_FORMATS:
+            return jsonify({
+                'error': f'Invalid format. Must be one of: {", ".join(EXPORT_FORMATS)}'
+            }), 400
+        
+        try:
+            query = _filter_bookings(Booking.query, request.args)
+            selection = parse_fields(request.args.get('fields')) or FieldSelection(BOOKING_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        sort_column, descending = _sort_order(
+            request.args.get('sort_by', 'created_at'), request.args.get('sort_order', 'desc')
+        )
+        if descending:
+            order = (sort_column.desc(), Booking.id.desc())
+        else:
+            order = (sort_column.asc(), Booking.id.asc())
+        listing = query.with_entities(*selection.columns).order_by(*order).yield_per(EXPORT_BATCH_SIZE)
+        
+        # The generator keeps the request context so the cursor's session stays open
+        rows = (selection.values(row) for row in listing)
+        encode, mimetype = EXPORT_FORMATS[format_type]
+        filename = f"bookings_export_{datetime.utcnow().strftime('%Y%m%d')}.{format_type}"
+        return Response(
+            stream_with_context(encode(selection.fields, rows)),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@booking_bp.route('/changes', methods=['GET'])
+@auth_required(['admin', 'sales_person'])
+def get_booking_changes():
+    """
+    Get bookings created, updated or hard-deleted since a change token.
+    
+    Without ``since`` the feed returns every current booking. Each response
+    carries ``next_token``; passing it as ``since`` returns only what changed
+    afterwards, with deleted bookings listed by id in ``deleted``. While
+    ``has_more`` is true the client should request again immediately.
+    ``since=now`` returns no bookings, only the token of the latest change,
+    for clients that load a page of bookings and follow changes from there.
+    A token from another database (for example after a restart of the
+    in-memory store) is answered with 410 so the client resynchronizes.
+    """
+    try:
+        epoch = change_journal_epoch()
+        if epoch is None:
+            return jsonify({'error': 'Change feed is not available for this database'}), 501
+        
+        max_rows = current_app.config.get('BOOKING_CHANGES_MAX_ROWS', 1000)
+        limit = max(1, min(request.args.get('limit', max_rows, type=int), max_rows))
+        
+        since = request.args.get('since') or None
+        if since == 'now':
+            return jsonify({
+                'bookings': [],
+                'deleted': [],
+                'next_token': current_change_token(epoch),
+                'has_more': False
+            }), 200
+        
+        try:
+            page = changes_since(epoch, since, limit)
+        except StaleChangeToken as e:
+            return jsonify({'error': str(e)}), 410
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'bookings': [booking.to_dict() for booking in page.bookings],
+            'deleted': page.deleted,
+            'next_token': page.next_token,
+            'has_more': page.has_more
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @booking_bp.route('/<int:booking_id>', methods=['GET'])
 @auth_required(['admin', 'sales_person'])
+@conditional_get
 def get_booking(booking_id):
-    """Get a specific booking by ID."""
+    """Get a specific booking by ID, optionally restricted to ``fields``."""
     try:
+        try:
+            selection = parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if selection:
+            row = db.session.execute(
+                select(*selection.columns).where(Booking.__table__.c.id == booking_id)
+            ).first()
+            if row is None:
+                return jsonify({'error': 'Booking not found'}), 404
+            return jsonify({'booking': selection.serialize(row)}), 200
+        
         booking = Booking.query.get(booking_id)
         
         if not booking:
@@ -143,6 +326,7 @@ def get_booking(booking_id):
 
 @booking_bp.route('/', methods=['POST'])
 @auth_required(['admin', 'sales_person'])
+@idempotent
 def create_booking():
     """Create a new booking."""
     try:
@@ -222,8 +406,202 @@ def create_booking():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@booking_bp.route('/bulk', methods=['POST'])
+@auth_required(['admin', 'sales_person'])
+@idempotent
+def create_bookings_bulk():
+    """
+    Create many bookings in one request.
+    
+    The body is a JSON array of booking objects, or NDJSON with
+    ``Content-Type: application/x-ndjson``. Every booking is validated like
+    a single POST, then the valid ones are written with one batched INSERT
+    in a single transaction. With ``atomic=true`` nothing is written unless
+    every booking is valid.
+    
+    Returns per-row results in body order: 201 when all were created, 207
+    when only some were, and 400 when none were.
+    """
+    try:
+        max_rows = current_app.config.get('BOOKING_BULK_MAX_ROWS', 1000)
+        atomic = request.args.get('atomic', 'false').lower() == 'true'
+        
+        try:
+            payloads = parse_bulk_body(request.get_data(), request.mimetype)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if not payloads:
+            return jsonify({'error': 'No bookings provided'}), 400
+        if len(payloads) > max_rows:
+            return jsonify({'error': f'At most {max_rows} bookings can be created per request'}), 413
+        
+        created_at = datetime.utcnow()
+        user_id = request.current_user['user_id']
+        results = []
+        rows = []
+        for index, data in enumerate(payloads):
+            values, errors = prepare_booking(data, user_id, created_at)
+            if errors:
+                results.append({'index': index, 'status': 'invalid', 'errors': errors})
+            else:
+                results.append({'index': index, 'status': 'created'})
+                rows.append(values)
+        
+        invalid = len(payloads) - len(rows)
+        if atomic and invalid:
+            for result in results:
+                if result['status'] == 'created':
+                    result['status'] = 'valid'
+            return jsonify({
+                'error': 'Validation failed; no bookings were created',
+                'created': 0,
+                'failed': invalid,
+                'results': results
+            }), 400
+        
+        ids = insert_bookings(rows)
+        db.session.commit()
+        
+        if ids is not None:
+            created = iter(ids)
+            for result in results:
+                if result['status'] == 'created':
+                    result['id'] = next(created)
+        
+        if not rows:
+            status_code = 400
+        elif invalid:
+            status_code = 207
+        else:
+            status_code = 201
+        
+        return jsonify({
+            'message': f'Created {len(rows)} of {len(payloads)} bookings',
+            'created': len(rows),
+            'failed': invalid,
+            'results': results
+        }), status_code
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@booking_bp.route('/import', methods=['POST'])
+@auth_required(['admin'])
+def import_bookings():
+    """
+    Import historical bookings from a CSV upload (admin only).
+    
+    The CSV is sent as the raw body (``Content-Type: text/csv``) or as the
+    ``file`` part of a multipart form and is parsed as it is read. Valid
+    rows are committed every ``chunk_size`` rows; ``start_line`` resumes
+    an interrupted import from the report's ``last_committed_line``.
+    """
+    try:
+        chunk_size = request.args.get('chunk_size', current_app.config.get('BOOKING_IMPORT_CHUNK_SIZE', 5000), type=int)
+        start_line = request.args.get('start_line', 0, type=int)
+        if chunk_size < 1 or start_line < 0:
+            return jsonify({'error': 'chunk_size must be positive and start_line non-negative'}), 400
+        
+        if request.mimetype == 'multipart/form-data':
+            upload = request.files.get('file')
+            if upload is None:
+                return jsonify({'error': 'Multipart uploads must include a "file" part'}), 400
+            stream = upload.stream
+        else:
+            stream = request.stream
+        
+        report = import_bookings_csv(
+            stream, request.current_user['user_id'], chunk_size=chunk_size, start_line=start_line
+        )
+        
+        if report.error:
+            status_code = 400 if report.imported == 0 and report.rows_read == 0 else 500
+            return jsonify({'error': report.error, 'report': report.to_dict()}), status_code
+        
+        return jsonify({
+            'message': f'Imported {report.imported} bookings, rejected {report.rejected}',
+            'report': report.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@booking_bp.route('/bulk', methods=['PATCH'])
+@auth_required(['admin', 'sales_person'])
+@idempotent
+def update_bookings_bulk():
+    """
+    Set status, invoice_status or loan_req on many bookings at once.
+    
+    The body holds ``set`` with the new values and selects bookings by
+    ``ids``, by ``filter`` (the list endpoint's filter parameters), or by
+    both. The change is one set-based UPDATE; bookings that already hold
+    the values are not touched.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be JSON'}), 400
+        
+        values, errors = prepare_bulk_update(data.get('set'))
+        if errors:
+            return jsonify({'error': 'Validation failed', 'details': errors}), 400
+        
+        try:
+            condition = _bulk_condition(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        updated = update_bookings(condition, values)
+        db.session.commit()
+        
+        return jsonify({
+            'message': f'Updated {updated} bookings',
+            'updated': updated,
+            'set': values
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@booking_bp.route('/bulk/hard-delete', methods=['DELETE'])
+@auth_required(['admin'])  # Only admin can hard delete
+@idempotent
+def hard_delete_bookings_bulk():
+    """Permanently delete the bookings selected by ``ids`` and/or ``filter`` (admin only)."""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be JSON'}), 400
+        
+        try:
+            condition = _bulk_condition(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        deleted = delete_bookings(condition)
+        db.session.commit()
+        
+        return jsonify({
+            'message': f'Permanently deleted {deleted} bookings',
+            'deleted': deleted
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @booking_bp.route('/<int:booking_id>', methods=['PUT'])
 @auth_required(['admin', 'sales_person'])
+@idempotent
 def update_booking(booking_id):
     """Update an existing booking."""
     try:
@@ -329,32 +707,54 @@ def hard_delete_booking(booking_id):
 
 @booking_bp.route('/search', methods=['GET'])
 @auth_required(['admin', 'sales_person'])
+@conditional_get
 def search_bookings():
-    """Advanced search endpoint for bookings."""
+    """
+    Advanced search endpoint for bookings.
+    
+    Uses the full-text index: every word of ``q`` must match the start of a
+    word in customer name, project, contact number, type or invoice status,
+    and results are ranked by relevance. With ``highlight=true`` each result
+    carries a ``highlights`` object of HTML-escaped column text with matched
+    words wrapped in <mark>.
+    ``fields`` restricts results to the listed booking fields.
+    """
     try:
         # Get search parameters
         query_text = request.args.get('q', '').strip()
+        highlight = request.args.get('highlight', 'false').lower() == 'true'
         
         if not query_text:
             return jsonify({'error': 'Search query parameter "q" is required'}), 400
         
-        # Perform search across multiple fields
-        search_filter = or_(
-            Booking.customer_name.ilike(f'%{query_text}%'),
-            Booking.project_name.ilike(f'%{query_text}%'),
-            Booking.contact_number.ilike(f'%{query_text}%'),
-            Booking.type.ilike(f'%{query_text}%'),
-            Booking.invoice_status.ilike(f'%{query_text}%')
-        )
-        
-        bookings = Booking.query.filter(search_filter).order_by(
-            Booking.created_at.desc()
-        ).limit(50).all()  # Limit to 50 results for performance
+        try:
+            selection = parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        columns = selection.columns if selection else None
+        
+        matches = ranked_search(query_text, limit=50, highlight=highlight, columns=columns)
+        if matches is None:
+            # No index for this database or no searchable words: substring scan
+            search_query = Booking.query.filter(_substring_filter(query_text))
+            if selection:
+                search_query = search_query.with_entities(*columns)
+            bookings = search_query.order_by(
+                Booking.created_at.desc()
+            ).limit(50).all()  # Limit to 50 results for performance
+            matches = [(booking, None) for booking in bookings]
+        
+        results = []
+        for booking, highlights in matches:
+            result = selection.serialize(booking) if selection else booking.to_dict()
+            if highlight:
+                result['highlights'] = highlights
+            results.append(result)
         
         return jsonify({
             'query': query_text,
-            'results': [booking.to_dict() for booking in bookings],
-            'count': len(bookings)
+            'results': results,
+            'count': len(results)
         }), 200
         
     except Exception as e:
@@ -363,33 +763,144 @@ def search_bookings():
 
 @booking_bp.route('/stats', methods=['GET'])
 @auth_required(['admin', 'sales_person'])
+@conditional_get
 def get_booking_stats():
     """Get basic booking statistics."""
     try:
-        # Get total counts by status
-        total_bookings = Booking.query.count()
-        active_bookings = Booking.query.filter_by(status='active').count()
-        completed_bookings = Booking.query.filter_by(status='complete').count()
-        cancelled_bookings = Booking.query.filter_by(status='cancelled').count()
-        
-        # Get total revenue (sum of amounts for active and completed bookings)
-        from sqlalchemy import func
-        revenue_result = db.session.query(
-            func.sum(Booking.amount)
-        ).filter(
-            Booking.status.in_(['active', 'complete'])
-        ).scalar()
-        
-        total_revenue = float(revenue_result) if revenue_result else 0.0
-        
-        return jsonify({
-            'total_bookings': total_bookings,
-            'active_bookings': active_bookings,
-            'completed_bookings': completed_bookings,
-            'cancelled_bookings': cancelled_bookings,
-            'total_revenue': total_revenue,
-            'completion_rate': (completed_bookings / total_bookings * 100) if total_bookings > 0 else 0
-        }), 200
+        return jsonify(booking_stats()), 200
         
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
\ No newline at end of file
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+def _sort_order(sort_by, sort_order):
+    """
+    Resolve the list endpoint's ``sort_by``/``sort_order`` parameters.
+    
+    Unknown sort fields fall back to newest first.
+    
+    Returns:
+        Tuple of (sort column, descending)
+    """
+    valid_sort_fields = ['created_at', 'updated_at', 'customer_name', 'project_name', 
+                       'amount', 'timeline', 'status']
+    if sort_by in valid_sort_fields:
+        return getattr(Booking, sort_by), sort_order.lower() == 'desc'
+    return Booking.created_at, True
+
+
+def _filter_bookings(query, filters):
+    """
+    Apply the booking list filter grammar to ``query``.
+    
+    Accepts the list endpoint's ``search``, ``project_name``,
+    ``customer_name``, ``status``, ``type``, ``start_date`` and ``end_date``
+    parameters; empty values are ignored.
+    
+    Raises:
+        ValueError: If a date is not in ISO format
+    """
+    search = (filters.get('search') or '').strip()
+    project_name = (filters.get('project_name') or '').strip()
+    customer_name = (filters.get('customer_name') or '').strip()
+    status = (filters.get('status') or '').strip()
+    property_type = (filters.get('type') or '').strip()
+    start_date = filters.get('start_date')
+    end_date = filters.get('end_date')
+    
+    # Apply search filters
+    if search:
+        query = query.filter(_search_filter(search))
+    
+    # Apply specific filters
+    if project_name:
+        query = query.filter(Booking.project_name.ilike(f'%{project_name}%'))
+    
+    if customer_name:
+        query = query.filter(Booking.customer_name.ilike(f'%{customer_name}%'))
+    
+    if status and status in ['active', 'complete', 'cancelled']:
+        query = query.filter(Booking.status == status)
+    
+    if property_type:
+        query = query.filter(Booking.type.ilike(f'%{property_type}%'))
+    
+    # Date range filtering
+    if start_date:
+        try:
+            start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            raise ValueError('Invalid start_date format. Use ISO format.')
+        query = query.filter(Booking.created_at >= start_dt)
+    
+    if end_date:
+        try:
+            end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            raise ValueError('Invalid end_date format. Use ISO format.')
+        query = query.filter(Booking.created_at <= end_dt)
+    
+    return query
+
+
+def _bulk_condition(data):
+    """
+    Build the WHERE clause for the bookings a bulk write targets.
+    
+    ``ids`` and ``filter`` are combined with AND. Filters are checked more
+    strictly than on the list endpoint, where unknown or invalid values are
+    ignored: here that would widen the write.
+    
+    Raises:
+        ValueError: If the selection is missing, malformed or matches every booking
+    """
+    ids = data.get('ids')
+    filters = data.get('filter')
+    if ids is None and not filters:
+        raise ValueError('Select bookings with "ids" and/or a non-empty "filter"')
+    
+    conditions = []
+    if ids is not None:
+        max_rows = current_app.config.get('BOOKING_BULK_MAX_ROWS', 1000)
+        if (not isinstance(ids, list) or not ids
+                or not all(isinstance(item, int) and not isinstance(item, bool) for item in ids)):
+            raise ValueError('"ids" must be a non-empty list of booking ids')
+        if len(ids) > max_rows:
+            raise ValueError(f'At most {max_rows} ids can be given per request')
+        conditions.append(Booking.id.in_(ids))
+    
+    if filters is not None:
+        if not isinstance(filters, dict) or not all(isinstance(value, str) for value in filters.values()):
+            raise ValueError('"filter" must be an object of string filter parameters')
+        unknown = sorted(set(filters) - set(BULK_FILTER_KEYS))
+        if unknown:
+            raise ValueError(f'Unknown filter parameters: {", ".join(unknown)}')
+        status = filters.get('status', '').strip()
+        if status and status not in BOOKING_STATUSES:
+            raise ValueError(f'Status filter must be one of: {", ".join(BOOKING_STATUSES)}')
+        
+        whereclause = _filter_bookings(Booking.query, filters).whereclause
+        if whereclause is None:
+            raise ValueError('"filter" must restrict the bookings selected')
+        conditions.append(whereclause)
+    
+    return and_(*conditions)
+
+
+def _search_filter(search):
+    """Filter bookings matching every word of ``search`` through the full-text index."""
+    ids = matching_ids(search)
+    if ids is None:
+        return _substring_filter(search)
+    return Booking.id.in_(ids)
+
+
+def _substring_filter(search):
+    """Filter bookings containing ``search`` in any searchable column (full scan)."""
+    return or_(
+        Booking.customer_name.ilike(f'%{search}%'),
+        Booking.project_name.ilike(f'%{search}%'),
+        Booking.contact_number.ilike(f'%{search}%'),
+        Booking.type.ilike(f'%{search}%'),
+        Booking.invoice_status.ilike(f'%{search}%')
+    )
@@ -0,0 +1,128 @@
+"""Negotiated gzip and brotli compression of responses."""
+import zlib
+from typing import Iterable, Iterator, Optional
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Response types worth compressing; images, fonts and archives already are
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/json', 'application/x-ndjson', 'application/javascript',
+    'text/html', 'text/css', 'text/csv', 'text/plain', 'text/javascript',
+    'image/svg+xml'
+})
+
+
+def negotiate_encoding(accept_encodings) -> Optional[str]:
+    """Pick the best encoding the client accepts, preferring brotli when it is installed."""
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return accept_encodings.best_match(offered)
+
+
+class _Compressor:
+    """Incremental encoder with the same interface for gzip and brotli."""
+
+    def __init__(self, encoding: str, level: int, brotli_quality: int):
+        """Start an empty compressed stream."""
+        if encoding == 'br':
+            self._stream = brotli.Compressor(quality=brotli_quality)
+            self._compress = self._stream.process
+            self._flush = self._stream.flush
+            self._finish = self._stream.finish
+        else:
+            # wbits 31 writes the gzip header and trailer
+            self._stream = zlib.compressobj(level, zlib.DEFLATED, 31)
+            self._compress = self._stream.compress
+            self._flush = lambda: self._stream.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._stream.flush
+
+    def compress(self, data: bytes) -> bytes:
+        """Encode ``data``, returning whatever output is ready."""
+        return self._compress(data)
+
+    def flush(self) -> bytes:
+        """Return all output for the data given so far, keeping the stream open."""
+        return self._flush()
+
+    def finish(self) -> bytes:
+        """Return the end of the stream."""
+        return self._finish()
+
+
+def _compress_stream(chunks: Iterable, compressor: _Compressor) -> Iterator[bytes]:
+    """Compress a response iterable chunk by chunk, closing it when done."""
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                # Flushed per chunk so clients receive data as it is produced
+                yield compressor.compress(chunk) + compressor.flush()
+        yield compressor.finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def compress_response(response):
+    """
+    Compress a response for the client when it is worth it.
+
+    Only responses of a compressible type with a body of their own are
+    touched: not 204, 206 or 304 responses, nor ones that already carry a
+    ``Content-Encoding`` or ``Content-Range``. Buffered bodies
+    shorter than ``COMPRESSION_MIN_SIZE`` bytes are sent as they are, since
+    the encoding overhead outweighs the saving. Streamed bodies such as
+    exports are compressed chunk by chunk, each chunk flushed so clients
+    still receive data as it is produced; static files are streamed the
+    same way when their size is above the threshold. Server-sent event
+    streams are not a compressible type and pass through untouched.
+
+    A strong ETag is weakened because the encoded bytes differ from the
+    identity representation it was computed for.
+    """
+    config = current_app.config
+    if not config.get('COMPRESSION_ENABLED', True) or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers
+            or 'Content-Range' in response.headers
+            or request.method == 'HEAD'):
+        return response
+
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    min_size = config.get('COMPRESSION_MIN_SIZE', 500)
+    compressor = _Compressor(encoding, config.get('COMPRESSION_LEVEL', 6),
+                             config.get('COMPRESSION_BROTLI_QUALITY', 4))
+
+    if response.is_streamed or response.direct_passthrough:
+        length = response.content_length
+        if length is not None and length < min_size:
+            return response
+        response.response = _compress_stream(response.response, compressor)
+        response.direct_passthrough = False
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        response.set_data(compressor.compress(data) + compressor.finish())
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    """Compress the application's responses after each request."""
+    app.after_request(compress_response)
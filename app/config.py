@@ -28,6 +28,40 @@ class Config:
     
     # JSON settings
     JSON_SORT_KEYS = False
+    
+    # Analytics settings
+    ANALYTICS_USE_ROLLUP = True
+    ANALYTICS_CACHE_ENABLED = True
+    ANALYTICS_CACHE_MAX_ENTRIES = 256
+    ANALYTICS_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    ANALYTICS_CACHE_TTL = 300  # seconds; bounds staleness of open-ended date windows
+    ANALYTICS_COALESCE_ENABLED = True  # share one computation among identical concurrent queries
+    ANALYTICS_COALESCE_TIMEOUT = 30.0  # seconds a coalesced request waits before computing itself
+    ANALYTICS_COALESCE_MAX_KEYS = 256  # query keys with coalescing metrics kept
+    ANALYTICS_ENGINE = 'sql'  # 'columnar' aggregates an in-memory NumPy snapshot when NumPy is installed
+    ANALYTICS_COLUMNAR_OVERLAP = 60  # seconds of updated_at re-read on each incremental refresh
+    
+    # Booking list settings
+    BOOKING_COUNT_ESTIMATE_TTL = 60  # seconds an include_total=estimate count is reused
+    BOOKING_COUNT_CACHE_MAX_ENTRIES = 512
+    BOOKING_BULK_MAX_ROWS = 1000  # bookings accepted per bulk request
+    BOOKING_IMPORT_CHUNK_SIZE = 5000  # CSV import rows committed per transaction
+    BOOKING_CHANGES_MAX_ROWS = 1000  # change feed entries returned per request
+    IDEMPOTENCY_KEY_TTL = 24 * 3600  # seconds a write's Idempotency-Key response is replayed
+    
+    # Event stream settings
+    EVENTS_POLL_INTERVAL = 5.0  # seconds between checks for writes from other processes
+    EVENTS_HEARTBEAT_INTERVAL = 15  # seconds of silence before a keep-alive comment
+    EVENTS_QUEUE_SIZE = 32  # events buffered per client before it is told to resync
+    EVENTS_MAX_SUBSCRIBERS = 100
+    EVENTS_TICKET_TTL = 30  # seconds a stream ticket can be redeemed after it is issued
+    EVENTS_BACKGROUND_PRODUCER = True
+    
+    # Response compression settings
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 500  # bytes below which buffered responses are sent uncompressed
+    COMPRESSION_LEVEL = 6  # gzip level
+    COMPRESSION_BROTLI_QUALITY = 4  # brotli quality, used when the brotli package is installed
 
 
 class DevelopmentConfig(Config):
@@ -48,6 +82,8 @@ class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # Tests drive the event producer directly
+    EVENTS_BACKGROUND_PRODUCER = False
 
 
 config = {
@@ -1,13 +1,24 @@
 """Database initialization and management utilities."""
 from datetime import datetime, timedelta
+from sqlalchemy import inspect, text
 from app import db
-from app.models import User, Booking
+from app.models import (
+    User, Booking, BookingCounter, BookingDailyRollup, create_change_journal, create_search_index
+)
+from app.models.booking import created_period_expressions
+
+# Indexes earlier versions created that another index now covers or no query uses
+OBSOLETE_BOOKING_INDEXES = (
+    'ix_bookings_project_name', 'ix_bookings_status_period', 'ix_bookings_project_period',
+    'ix_bookings_creator_created', 'ix_bookings_live_created'
+)
 
 
 def init_database():
     """Initialize database tables and create demo users and bookings."""
     # Create all tables
     db.create_all()
+    upgrade_booking_schema()
     
     # Always recreate demo data for production (since we use in-memory SQLite)
     # Check if demo users already exist
@@ -44,6 +55,14 @@ def init_database():
     if Booking.query.count() == 0:
         create_dummy_bookings()
     
+    # Populate the rollup for databases created before it existed
+    if BookingDailyRollup.query.count() == 0 and Booking.query.count() > 0:
+        rebuild_daily_rollup()
+    
+    # Likewise for the per-status counters behind /api/bookings/stats
+    if BookingCounter.query.count() == 0 and Booking.query.count() > 0:
+        rebuild_booking_counters()
+    
     print("Database initialized successfully with demo users:")
     print("- Admin: username='admin', password='admin123'")
     print("- Sales: username='sales', password='sales123'")
@@ -269,6 +288,90 @@ def create_dummy_bookings():
         raise
 
 
+def rebuild_daily_rollup():
+    """Regenerate the daily booking rollup from the bookings table."""
+    try:
+        rows = BookingDailyRollup.rebuild()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error rebuilding daily rollup: {e}")
+        raise
+    
+    return rows
+
+
+def rebuild_booking_counters():
+    """Regenerate the per-status booking counters from the bookings table."""
+    try:
+        rows = BookingCounter.rebuild()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error rebuilding booking counters: {e}")
+        raise
+    
+    return rows
+
+
+def upgrade_booking_schema():
+    """
+    Bring an existing bookings table up to the current model.
+    
+    ``create_all`` only creates missing tables, so columns and indexes added
+    to ``Booking`` since a database was created are added here, along with
+    the full-text search index and the change journal triggers, and the
+    created_at calendar buckets are backfilled. Obsolete indexes are dropped.
+    """
+    table = Booking.__table__
+    try:
+        connection = db.session.connection()
+        existing = {column['name'] for column in inspect(connection).get_columns(table.name)}
+        
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+        
+        for name in OBSOLETE_BOOKING_INDEXES:
+            connection.execute(text(f'DROP INDEX IF EXISTS {name}'))
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+        
+        create_search_index(connection)
+        create_change_journal(connection)
+        backfilled = backfill_booking_periods()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error upgrading bookings table: {e}")
+        raise
+    
+    return backfilled
+
+
+def backfill_booking_periods():
+    """
+    Populate created_year, created_month and created_quarter where missing.
+    
+    Returns:
+        Number of bookings updated
+    """
+    table = Booking.__table__
+    year, month, quarter = created_period_expressions(table.c.created_at)
+    result = db.session.execute(
+        table.update().where(
+            table.c.created_year.is_(None) | table.c.created_month.is_(None) | table.c.created_quarter.is_(None)
+        ).values(
+            created_year=year,
+            created_month=month,
+            created_quarter=quarter,
+            updated_at=table.c.updated_at  # derived columns are not a booking change
+        )
+    )
+    return result.rowcount
+
+
 def reset_database():
     """Drop and recreate all database tables."""
     db.drop_all()
@@ -0,0 +1,77 @@
+"""Conditional GET support with ETags derived from the booking data version."""
+import hashlib
+import json
+from datetime import datetime
+from functools import wraps
+from flask import request, make_response
+from app.models import current_generation
+
+
+def booking_data_version() -> str:
+    """
+    Return a marker that changes whenever committed booking data does.
+
+    This is the write generation the analytics cache is keyed on: the change
+    journal head, which every booking write moves whichever process commits
+    it, paired with this process's own write counter so a client sees its
+    writes at once even while the PostgreSQL head waits for an older
+    transaction. Row counts and the latest ``updated_at`` can both stay put
+    across a change, the journal position cannot. Without a journal only
+    this process's writes are seen.
+    """
+    generation, head = current_generation()
+    return f"{generation}:{':'.join(map(str, head)) if head else ''}"
+
+
+def compute_etag(version: str) -> str:
+    """
+    Build a strong ETag for the current request at the given data version.
+
+    The request path and arguments are part of the tag, as is the UTC date
+    so responses whose default date window slides with time still refresh
+    at least daily. So are the authenticated user and role: a tag issued to
+    one user never validates a cached copy of a response built for another.
+    """
+    user = getattr(request, 'current_user', None) or {}
+    fingerprint = json.dumps([
+        user.get('user_id'),
+        user.get('role'),
+        request.path,
+        sorted(request.args.items(multi=True)),
+        version,
+        datetime.utcnow().date().isoformat()
+    ])
+    return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:32]
+
+
+def _mark_private(response):
+    """Keep a per-user response out of shared caches and make clients revalidate it."""
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Authorization')
+    return response
+
+
+def conditional_get(f):
+    """
+    Decorator answering If-None-Match with 304 before running the view.
+
+    Must be applied inside ``auth_required`` so the tag covers the user.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        etag = compute_etag(booking_data_version())
+
+        # Weak comparison, as compressed responses carry the tag weakened
+        if request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+            response.set_etag(etag)
+            return _mark_private(response)
+
+        response = make_response(f(*args, **kwargs))
+        if response.status_code == 200:
+            response.set_etag(etag)
+            _mark_private(response)
+
+        return response
+
+    return decorated
@@ -0,0 +1,5 @@
+"""Server-sent events module pushing booking changes to connected clients."""
+from .broker import EventBroker
+from .routes import events_bp
+
+__all__ = ['EventBroker', 'events_bp']
@@ -0,0 +1,173 @@
+"""Single-producer fan-out of booking change events to server-sent event streams."""
+import json
+import logging
+import queue
+import threading
+from typing import Any, Dict, Optional, Set
+from flask import current_app
+from app import db
+from app.booking.changes import encode_change_token
+from app.booking.counts import booking_stats
+from app.models.booking_change import ChangePosition, change_journal_epoch, change_journal_head
+from app.models.write_generation import booking_generation
+
+logger = logging.getLogger(__name__)
+
+
+class TooManySubscribers(Exception):
+    """Raised when the subscriber limit is reached."""
+
+
+class EventBroker:
+    """
+    Publish booking changes to every connected event stream from one producer.
+
+    The producer thread runs while at least one stream is subscribed. It
+    wakes when this process commits a booking write, and every
+    ``poll_interval`` seconds to notice writes committed by other processes
+    sharing the database. When the change journal has moved it reads the
+    status counters once and publishes a single ``bookings`` event, which is
+    serialized once and queued for every subscriber; however many clients
+    are connected, each change costs the same two small queries.
+
+    A subscriber that falls ``queue_size`` events behind is sent a
+    ``resync`` event instead of the backlog, telling it to reload.
+    """
+
+    def __init__(self, app, poll_interval: float = 5.0, queue_size: int = 32,
+                 max_subscribers: int = 100, background: bool = True):
+        """Initialize a broker with no subscribers; the producer starts on first subscription."""
+        self.app = app
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.background = background
+        self._subscribers: Set[queue.Queue] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._last_position: Optional[ChangePosition] = None
+        self._latest: Optional[str] = None
+        self.published = 0
+
+    def subscribe(self) -> queue.Queue:
+        """
+        Register a new stream and return the queue its events arrive on.
+
+        The most recent event, if any, is queued straight away so a client
+        reconnecting after a gap learns the current state.
+
+        Raises:
+            TooManySubscribers: If ``max_subscribers`` streams are open
+        """
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise TooManySubscribers(f'At most {self.max_subscribers} event streams can be open')
+            if self._latest is not None:
+                subscriber.put_nowait(self._latest)
+            self._subscribers.add(subscriber)
+            if self.background and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name='booking-events', daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        """Remove a stream; the producer stops once none remain."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of open streams."""
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict[str, Any], event_id: Optional[str] = None) -> str:
+        """Serialize one event and queue it for every subscriber."""
+        message = format_event(event, data, event_id)
+        with self._lock:
+            if event == 'bookings':
+                self._latest = message
+            for subscriber in self._subscribers:
+                try:
+                    subscriber.put_nowait(message)
+                except queue.Full:
+                    # Replace the backlog of a stalled client with one resync
+                    _drain(subscriber)
+                    subscriber.put_nowait(format_event('resync', {}))
+        self.published += 1
+        return message
+
+    def poll_once(self) -> bool:
+        """
+        Publish a ``bookings`` event if the change journal moved since the last one.
+
+        Must run inside an application context.
+
+        Returns:
+            True if an event was published
+        """
+        epoch = change_journal_epoch()
+        if epoch is None:
+            return False
+        head = change_journal_head()
+        if head == self._last_position:
+            return False
+
+        self._last_position = head
+        token = encode_change_token(epoch, head)
+        self.publish('bookings', {
+            'token': token,
+            'stats': booking_stats()
+        }, event_id=token)
+        return True
+
+    def _run(self) -> None:
+        """Producer loop: wait for a local commit or the poll interval, then check the journal."""
+        generation = booking_generation.value
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                with self.app.app_context():
+                    try:
+                        self.poll_once()
+                    finally:
+                        db.session.remove()
+            except Exception:
+                logger.exception('Booking event producer failed to poll for changes')
+            generation = booking_generation.wait(generation, self.poll_interval)
+
+
+def format_event(event: str, data: Dict[str, Any], event_id: Optional[str] = None) -> str:
+    """Encode one server-sent event."""
+    lines = [f'id: {event_id}'] if event_id is not None else []
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, separators=(",", ":"))}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def init_app(app):
+    """Attach an event broker configured from ``app.config`` to the application."""
+    app.extensions['event_broker'] = EventBroker(
+        app,
+        poll_interval=app.config.get('EVENTS_POLL_INTERVAL', 5.0),
+        queue_size=app.config.get('EVENTS_QUEUE_SIZE', 32),
+        max_subscribers=app.config.get('EVENTS_MAX_SUBSCRIBERS', 100),
+        background=app.config.get('EVENTS_BACKGROUND_PRODUCER', True)
+    )
+
+
+def get_broker() -> EventBroker:
+    """Return the current application's event broker."""
+    return current_app.extensions['event_broker']
+
+
+def _drain(subscriber: queue.Queue) -> None:
+    """Discard every queued message."""
+    try:
+        while True:
+            subscriber.get_nowait()
+    except queue.Empty:
+        pass
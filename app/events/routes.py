@@ -0,0 +1,81 @@
+"""Server-sent event stream of booking changes."""
+import queue
+from datetime import datetime
+from flask import Blueprint, Response, current_app, request, jsonify
+from app.auth.auth_service import auth_required
+from app.events.broker import TooManySubscribers, format_event, get_broker
+from app.events.tickets import issue_ticket, redeem_ticket
+
+events_bp = Blueprint('events', __name__)
+
+
+@events_bp.route('/ticket', methods=['POST'])
+@auth_required(['admin', 'sales_person'])
+def create_stream_ticket():
+    """
+    Issue a single-use ticket for opening an event stream.
+
+    ``EventSource`` cannot send headers, so instead of putting the JWT in
+    the stream URL, where it would be written to access logs, clients
+    exchange it here for a ticket that can be redeemed once within
+    ``EVENTS_TICKET_TTL`` seconds.
+    """
+    try:
+        ticket, expires_in = issue_ticket(request.current_user)
+        return jsonify({'ticket': ticket, 'expires_in': expires_in}), 201
+
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@events_bp.route('', methods=['GET'])
+def stream_events():
+    """
+    Stream booking change notifications as server-sent events.
+
+    Each ``bookings`` event carries the change feed token at the latest
+    change and the booking statistics of GET /api/bookings/stats, so clients
+    can fetch just the delta from GET /api/bookings/changes and update
+    counters without querying. A ``resync`` event asks the client to reload.
+
+    The stream is opened with a ``ticket`` from POST /api/events/ticket and
+    lasts as long as the access token the ticket was issued against: when
+    that expires an ``expired`` event is sent and the stream ends. A client
+    reconnects with a new ticket, since a spent one is refused. Each open
+    stream holds a server worker; the number of streams is capped by
+    ``EVENTS_MAX_SUBSCRIBERS``.
+    """
+    claims, error = redeem_ticket(request.args.get('ticket'))
+    if error:
+        return jsonify({'error': error}), 401
+
+    broker = get_broker()
+    try:
+        subscriber = broker.subscribe()
+    except TooManySubscribers as e:
+        return jsonify({'error': str(e)}), 503
+
+    heartbeat = current_app.config.get('EVENTS_HEARTBEAT_INTERVAL', 15)
+    expires_at = claims['expires_at']
+
+    def generate():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                # Rechecked at least every heartbeat, so a stream never outlives its token
+                remaining = (expires_at - datetime.utcnow()).total_seconds()
+                if remaining <= 0:
+                    yield format_event('expired', {})
+                    return
+                try:
+                    yield subscriber.get(timeout=min(heartbeat, remaining))
+                except queue.Empty:
+                    # Comment line keeping proxies from closing an idle stream
+                    yield ': keep-alive\n\n'
+        finally:
+            broker.unsubscribe(subscriber)
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
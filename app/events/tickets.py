@@ -0,0 +1,74 @@
+"""Short-lived single-use tickets for opening event streams without a JWT in the URL."""
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from flask import current_app
+from app import db
+from app.models import StreamTicket, User
+
+
+def _digest(ticket: str) -> str:
+    """Hash a ticket for storage and lookup."""
+    return hashlib.sha256(ticket.encode('utf-8')).hexdigest()
+
+
+def issue_ticket(claims: Dict[str, Any]) -> Tuple[str, int]:
+    """
+    Issue a ticket for the user of a verified access token.
+
+    Args:
+        claims: Decoded access token, as set on ``request.current_user``
+
+    Returns:
+        Tuple of (ticket, seconds it can be redeemed for)
+    """
+    ttl = current_app.config.get('EVENTS_TICKET_TTL', 30)
+    now = datetime.utcnow()
+    ticket = secrets.token_urlsafe(32)
+
+    # Unredeemed tickets are purged as new ones are issued
+    StreamTicket.query.filter(StreamTicket.expires_at <= now).delete(synchronize_session=False)
+    db.session.add(StreamTicket(
+        ticket_hash=_digest(ticket),
+        user_id=claims['user_id'],
+        role=claims['role'],
+        expires_at=now + timedelta(seconds=ttl),
+        access_expires_at=datetime.utcfromtimestamp(claims['exp']),
+        created_at=now
+    ))
+    db.session.commit()
+    return ticket, ttl
+
+
+def redeem_ticket(ticket: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Spend a ticket, returning the claims it was issued with.
+
+    The ticket row is deleted in the same statement that claims it, so of
+    concurrent attempts with one ticket only one succeeds, whichever process
+    serves it.
+
+    Returns:
+        Tuple of (claims with ``user_id``, ``role`` and ``expires_at``, error)
+    """
+    if not ticket:
+        return None, 'Stream ticket is missing'
+
+    digest = _digest(ticket)
+    now = datetime.utcnow()
+    stored = db.session.get(StreamTicket, digest)
+    claims = None
+    if stored is not None:
+        claims = {'user_id': stored.user_id, 'role': stored.role, 'expires_at': stored.access_expires_at}
+        valid = stored.expires_at > now
+    spent = StreamTicket.query.filter_by(ticket_hash=digest).delete(synchronize_session=False)
+    db.session.commit()
+
+    if claims is None or spent != 1 or not valid:
+        return None, 'Invalid or expired stream ticket'
+    if claims['expires_at'] <= now:
+        return None, 'Token has expired'
+    if User.query.filter_by(id=claims['user_id'], is_active=True).first() is None:
+        return None, 'User not found or inactive'
+    return claims, None
@@ -0,0 +1,113 @@
+"""Idempotency-Key support making retried write requests safe."""
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import Response, current_app, jsonify, make_response, request
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import IdempotencyKey
+
+# Longest key accepted, matching the key column
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint() -> str:
+    """Hash the method, path, query string and body of the current request."""
+    digest = hashlib.sha256()
+    for part in (request.method, request.path, request.query_string.decode('latin-1')):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def idempotent(f):
+    """
+    Decorator replaying the stored response of a request repeated with the same Idempotency-Key.
+
+    Keys are scoped to the authenticated user and kept for
+    ``IDEMPOTENCY_KEY_TTL`` seconds. A first request claims its key in the
+    transaction the view commits, so the write and the key are stored
+    together; the response is recorded once the view returns. A repeat
+    returns the recorded response, marked ``Idempotent-Replayed: true``,
+    without running the view. Reusing a key for a different request is
+    rejected with 422, and a repeat arriving while the first request is
+    still running with 409. Server errors that left nothing committed are
+    not recorded, so the request can be retried.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if key is None:
+            return f(*args, **kwargs)
+
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters'}), 400
+
+        user_id = request.current_user['user_id']
+        fingerprint = request_fingerprint()
+        ttl = timedelta(seconds=current_app.config.get('IDEMPOTENCY_KEY_TTL', 86400))
+        now = datetime.utcnow()
+
+        try:
+            # Expired keys are purged as new ones are claimed
+            IdempotencyKey.query.filter(IdempotencyKey.created_at < now - ttl).delete(synchronize_session=False)
+            stored = db.session.get(IdempotencyKey, (user_id, key))
+            if stored is not None:
+                db.session.commit()
+                return _replay(stored, fingerprint)
+
+            db.session.add(IdempotencyKey(user_id=user_id, key=key, request_hash=fingerprint, created_at=now))
+            db.session.flush()
+        except IntegrityError:
+            # Claimed by a concurrent request between the lookup and the flush
+            db.session.rollback()
+            return jsonify({'error': 'A request with this Idempotency-Key is still being processed'}), 409
+
+        response = make_response(f(*args, **kwargs))
+        _record(user_id, key, fingerprint, now, response)
+        return response
+
+    return decorated
+
+
+def _replay(stored: IdempotencyKey, fingerprint: str):
+    """Answer a repeated key from its stored outcome."""
+    if stored.request_hash != fingerprint:
+        return jsonify({'error': 'Idempotency-Key was already used for a different request'}), 422
+    if not stored.completed:
+        return jsonify({'error': 'A request with this Idempotency-Key is still being processed'}), 409
+
+    response = Response(stored.response_body, status=stored.status_code, mimetype=stored.mimetype)
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _record(user_id: int, key: str, fingerprint: str, claimed_at: datetime, response) -> None:
+    """
+    Store the view's response against its key.
+
+    Unless the response is a success, anything the view left uncommitted is
+    discarded first, so a rejected request never saves the changes it had
+    begun. After a server error the response is then only recorded if the
+    view had committed its claim, and otherwise the key is released for a
+    retry. Other responses are recorded on the pending or committed claim,
+    or on a new one if the claim was rolled back.
+    """
+    try:
+        if not 200 <= response.status_code < 300:
+            db.session.rollback()
+        stored = db.session.get(IdempotencyKey, (user_id, key))
+        if stored is None:
+            if response.status_code >= 500:
+                return
+            stored = IdempotencyKey(user_id=user_id, key=key, request_hash=fingerprint, created_at=claimed_at)
+            db.session.add(stored)
+        stored.status_code = response.status_code
+        stored.response_body = response.get_data(as_text=True)
+        stored.mimetype = response.mimetype
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.warning(f'Could not record Idempotency-Key response: {e}')
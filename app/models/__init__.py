@@ -1,5 +1,14 @@
 # Database models
 from .user import User
 from .booking import Booking
+from .booking_search import create_search_index
+from .booking_counter import BookingCounter
+from .booking_change import BookingChange, create_change_journal
+from .booking_rollup import BookingDailyRollup
+from .idempotency_key import IdempotencyKey
+from .stream_ticket import StreamTicket
+from .write_generation import booking_generation, current_generation, mark_bookings_changed
 
-__all__ = ['User', 'Booking']
\ No newline at end of file
+__all__ = ['User', 'Booking', 'BookingDailyRollup', 'BookingCounter', 'BookingChange', 'IdempotencyKey',
+           'StreamTicket', 'create_change_journal', 'create_search_index', 'booking_generation',
+           'current_generation', 'mark_bookings_changed']
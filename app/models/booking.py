@@ -1,9 +1,35 @@
 """Booking model for real estate transaction management."""
 from datetime import datetime
-from sqlalchemy import CheckConstraint, Numeric
+from sqlalchemy import CheckConstraint, Index, Integer, Numeric, cast, extract
+from sqlalchemy.orm import validates
 from app import db
 
 
+def created_period(created_at):
+    """Return the (year, month, quarter) calendar buckets of a creation timestamp."""
+    return created_at.year, created_at.month, (created_at.month + 2) // 3
+
+
+def created_period_expressions(column):
+    """
+    Return SQL expressions for the (year, month, quarter) buckets of a timestamp column.
+
+    EXTRACT yields a numeric on PostgreSQL, where dividing it would not
+    truncate, so the parts are cast to integers before the quarter is taken.
+    """
+    year = cast(extract('year', column), Integer)
+    month = cast(extract('month', column), Integer)
+    return year, month, cast((month + 2) // 3, Integer)
+
+
+def _created_period_default(position):
+    """Build a column default deriving one calendar bucket from the row's created_at."""
+    def default(context):
+        created_at = context.get_current_parameters().get('created_at')
+        return created_period(created_at)[position] if created_at else None
+    return default
+
+
 class Booking(db.Model):
     """Booking model for real estate transactions."""
     
@@ -17,13 +43,13 @@ class Booking(db.Model):
     contact_number = db.Column(db.String(20), nullable=False)
     
     # Project information
-    project_name = db.Column(db.String(255), nullable=False, index=True)
+    project_name = db.Column(db.String(255), nullable=False)
     type = db.Column(db.String(50), nullable=False)  # 2BHK, 3BHK, etc.
     area = db.Column(db.Float, nullable=False)  # in sq ft
     
     # Financial information
     agreement_cost = db.Column(Numeric(15, 2), nullable=False)
-    amount = db.Column(Numeric(15, 2), nullable=False)
+    amount = db.Column(Numeric(15, 2), nullable=False, index=True)
     tax_gst = db.Column(Numeric(15, 2), nullable=False, default=0)
     refund_buyer = db.Column(Numeric(15, 2), nullable=False, default=0)
     refund_referral = db.Column(Numeric(15, 2), nullable=False, default=0)
@@ -32,7 +58,7 @@ class Booking(db.Model):
     
     # Status and timeline
     invoice_status = db.Column(db.String(50), nullable=False, default='pending')
-    timeline = db.Column(db.DateTime, nullable=False)
+    timeline = db.Column(db.DateTime, nullable=False, index=True)
     loan_req = db.Column(db.String(10), nullable=False, default='no')  # yes/no
     status = db.Column(
         db.Enum('active', 'complete', 'cancelled', name='booking_status'), 
@@ -41,8 +67,13 @@ class Booking(db.Model):
     )
     
     # Audit fields
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
+    
+    # Calendar buckets of created_at, persisted so trends group on plain columns
+    created_year = db.Column(db.Integer, default=_created_period_default(0), nullable=False)
+    created_month = db.Column(db.Integer, default=_created_period_default(1), nullable=False)
+    created_quarter = db.Column(db.Integer, default=_created_period_default(2), nullable=False)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
     # Relationships
@@ -59,6 +90,12 @@ class Booking(db.Model):
         CheckConstraint('onc_trust_fund >= 0', name='check_onc_trust_fund_non_negative'),
         CheckConstraint('oncct_funded >= 0', name='check_oncct_funded_non_negative'),
         CheckConstraint("loan_req IN ('yes', 'no')", name='check_loan_req_valid'),
+        # Equality filters ordered by creation time, as the list pages and
+        # date-ranged reports read them; the project and type indexes also
+        # serve the project_name sort and the per-project and per-type grouping
+        Index('ix_bookings_status_created', 'status', 'created_at'),
+        Index('ix_bookings_project_created', 'project_name', 'created_at'),
+        Index('ix_bookings_type_created', 'type', 'created_at'),
     )
     
     def __init__(self, **kwargs):
@@ -86,8 +123,14 @@ class Booking(db.Model):
         """Calculate net refund amount."""
         return float(self.refund_buyer) + float(self.refund_referral)
     
-    def validate_data(self):
-        """Validate booking data constraints."""
+    def validate_data(self, historical=False):
+        """
+        Validate booking data constraints.
+        
+        Args:
+            historical: Allow a timeline in the past, for bookings imported
+                from earlier records
+        """
         errors = []
         
         # Required field validation
@@ -114,7 +157,7 @@ class Booking(db.Model):
             errors.append("Amount cannot be negative")
         
         # Timeline validation
-        if self.timeline and self.timeline < datetime.utcnow():
+        if not historical and self.timeline and self.timeline < datetime.utcnow():
             errors.append("Timeline cannot be in the past")
         
         # Contact number format validation (basic)
@@ -150,6 +193,13 @@ class Booking(db.Model):
             'net_refund': self.net_refund
         }
     
+    @validates('created_at')
+    def _sync_created_period(self, key, created_at):
+        """Keep the persisted calendar buckets in step with created_at."""
+        if created_at is not None:
+            self.created_year, self.created_month, self.created_quarter = created_period(created_at)
+        return created_at
+    
     def update_from_dict(self, data):
         """Update booking from dictionary data."""
         updatable_fields = [
@@ -0,0 +1,179 @@
+"""Change journal recording the latest write to every booking, for incremental sync."""
+import uuid
+from typing import List, Optional, Tuple
+from sqlalchemy import event, func, inspect, literal, select, text, true
+from app import db
+from app.models.booking import Booking
+
+
+# Position of a change in the journal: (writing transaction id, sequence number)
+ChangePosition = Tuple[int, int]
+
+
+class BookingChange(db.Model):
+    """
+    Latest change to one booking, at its position in the journal.
+
+    Database triggers on bookings maintain the journal, so ORM writes, bulk
+    statements and imports are all recorded. Each insert, update or delete
+    moves the booking's row to a new ``(txid, seq)`` position; deleted
+    bookings keep their row as a tombstone.
+
+    On SQLite writers are serialized by the database lock, ``txid`` is 0 and
+    ``seq`` alone is in commit order. On PostgreSQL concurrent writers draw
+    sequence numbers without waiting for each other, so ``txid`` records
+    the writing transaction and readers only take rows of transactions that
+    have all finished; see ``settled_changes``.
+    """
+
+    __tablename__ = 'booking_changes'
+    __table_args__ = (
+        db.Index('ix_booking_changes_position', 'txid', 'seq'),
+    )
+
+    booking_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    txid = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    seq = db.Column(db.BigInteger, nullable=False, unique=True)
+    deleted = db.Column(db.Boolean, nullable=False, default=False)
+
+    def __repr__(self):
+        """String representation of journal row."""
+        return f'<BookingChange {self.booking_id} @{self.seq}{" deleted" if self.deleted else ""}>'
+
+
+# Identifies one journal, so tokens issued against another database are refused
+booking_change_epoch = db.Table(
+    'booking_change_epoch',
+    db.Column('epoch', db.String(32), primary_key=True)
+)
+
+
+def _sqlite_ddl() -> List[str]:
+    """Triggers recording each booking write under the next sequence number."""
+    def record(row, deleted):
+        return (f"INSERT OR REPLACE INTO booking_changes (booking_id, seq, deleted) "
+                f"VALUES ({row}.id, (SELECT coalesce(max(seq), 0) + 1 FROM booking_changes), {deleted}); ")
+
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS bookings_changes_insert AFTER INSERT ON bookings BEGIN {record('new', 0)}END",
+        f"CREATE TRIGGER IF NOT EXISTS bookings_changes_update AFTER UPDATE ON bookings BEGIN {record('new', 0)}END",
+        f"CREATE TRIGGER IF NOT EXISTS bookings_changes_delete AFTER DELETE ON bookings BEGIN {record('old', 1)}END",
+    ]
+
+
+def _postgresql_ddl() -> List[str]:
+    """
+    Sequence, trigger function and trigger recording each booking write.
+
+    Each change records the writing transaction's id with its sequence
+    number. Writers never wait on each other; ordering against commits is
+    left to readers, which only take changes of finished transactions.
+    """
+    return [
+        "CREATE SEQUENCE IF NOT EXISTS booking_change_seq",
+        "CREATE OR REPLACE FUNCTION record_booking_change() RETURNS trigger AS $$ "
+        "BEGIN "
+        "IF TG_OP = 'DELETE' THEN "
+        "INSERT INTO booking_changes (booking_id, txid, seq, deleted) "
+        "VALUES (OLD.id, txid_current(), nextval('booking_change_seq'), true) "
+        "ON CONFLICT (booking_id) DO UPDATE SET txid = excluded.txid, seq = excluded.seq, deleted = true; "
+        "RETURN OLD; "
+        "END IF; "
+        "INSERT INTO booking_changes (booking_id, txid, seq, deleted) "
+        "VALUES (NEW.id, txid_current(), nextval('booking_change_seq'), false) "
+        "ON CONFLICT (booking_id) DO UPDATE SET txid = excluded.txid, seq = excluded.seq, deleted = false; "
+        "RETURN NEW; "
+        "END $$ LANGUAGE plpgsql",
+        "DROP TRIGGER IF EXISTS bookings_changes ON bookings",
+        "CREATE TRIGGER bookings_changes AFTER INSERT OR UPDATE OR DELETE ON bookings "
+        "FOR EACH ROW EXECUTE FUNCTION record_booking_change()",
+    ]
+
+
+def create_change_journal(connection) -> bool:
+    """
+    Install the journal triggers for the connection's dialect if they are missing.
+
+    Bookings that predate the journal are recorded as changes, and the
+    journal is given an epoch.
+
+    Returns:
+        True if the dialect has a change journal
+    """
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        statements = _sqlite_ddl()
+    elif dialect == 'postgresql':
+        statements = _postgresql_ddl()
+    else:
+        return False
+
+    # Journals created before changes recorded their transaction
+    table = BookingChange.__table__
+    if 'txid' not in {column['name'] for column in inspect(connection).get_columns(table.name)}:
+        connection.execute(text('ALTER TABLE booking_changes ADD COLUMN txid BIGINT NOT NULL DEFAULT 0'))
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+
+    for statement in statements:
+        connection.execute(text(statement))
+
+    start = connection.execute(select(func.coalesce(func.max(table.c.seq), 0))).scalar()
+    connection.execute(table.insert().from_select(
+        ['booking_id', 'seq', 'deleted'],
+        select(Booking.id, Booking.id + start, literal(False)).where(Booking.id.not_in(select(table.c.booking_id)))
+    ))
+    if dialect == 'postgresql':
+        connection.execute(text(
+            "SELECT setval('booking_change_seq', greatest((SELECT coalesce(max(seq), 0) FROM booking_changes), 1))"
+        ))
+
+    if connection.execute(select(booking_change_epoch.c.epoch)).first() is None:
+        connection.execute(booking_change_epoch.insert().values(epoch=uuid.uuid4().hex))
+    return True
+
+
+def has_change_journal() -> bool:
+    """Return whether the current database's dialect keeps a change journal."""
+    return db.session.get_bind().dialect.name in ('sqlite', 'postgresql')
+
+
+def change_journal_epoch() -> Optional[str]:
+    """Return the epoch of the current database's journal, or None if it has none."""
+    if not has_change_journal():
+        return None
+    return db.session.execute(select(booking_change_epoch.c.epoch)).scalar()
+
+
+def settled_changes():
+    """
+    Condition selecting the journal rows no later change can be ordered before.
+
+    On PostgreSQL a transaction still running may hold a lower sequence
+    number than changes already committed, so only rows of transactions
+    older than the oldest one running (the snapshot's xmin) are settled:
+    every transaction below it has committed or rolled back, and every
+    future one gets a higher id. Ordering by ``(txid, seq)`` then never
+    places a later commit before a position a reader has passed. A long
+    transaction holds back the feed until it ends but never hides a change.
+    On SQLite, whose writers are serialized, every committed row is settled.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return BookingChange.txid < func.txid_snapshot_xmin(func.txid_current_snapshot())
+    return true()
+
+
+def change_journal_head() -> ChangePosition:
+    """Return the position of the latest settled change, or (0, 0) if there is none."""
+    row = db.session.execute(
+        select(BookingChange.txid, BookingChange.seq).where(
+            settled_changes()
+        ).order_by(BookingChange.txid.desc(), BookingChange.seq.desc()).limit(1)
+    ).first()
+    return (row.txid, row.seq) if row else (0, 0)
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_change_journal(target, connection, **kwargs):
+    """Install the journal once bookings and the journal tables exist."""
+    create_change_journal(connection)
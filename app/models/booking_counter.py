@@ -0,0 +1,146 @@
+"""Running booking counts and amount totals per status."""
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models.booking import Booking
+
+
+class BookingCounter(db.Model):
+    """Number of bookings and their summed amount for one status."""
+
+    __tablename__ = 'booking_counters'
+
+    status = db.Column(db.String(20), primary_key=True)
+    booking_count = db.Column(db.Integer, nullable=False, default=0)
+    amount_total = db.Column(db.Numeric(18, 2), nullable=False, default=0)
+
+    @staticmethod
+    def apply_deltas(connection, deltas):
+        """
+        Add per-status deltas to the counters using the given connection.
+
+        Called with every batch of daily rollup deltas, so each write path
+        that maintains the rollup keeps the counters in the same transaction.
+
+        Args:
+            connection: Connection to write with
+            deltas: Dictionary mapping status to [count, amount]
+        """
+        table = BookingCounter.__table__
+
+        for status, (count, amount) in deltas.items():
+            if not count and not amount:
+                continue
+
+            values = {'status': status, 'booking_count': count, 'amount_total': amount}
+            dialect = connection.dialect.name
+            if dialect in ('sqlite', 'postgresql'):
+                dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+                statement = dialect_insert(table).values(**values)
+                statement = statement.on_conflict_do_update(
+                    index_elements=['status'],
+                    set_={
+                        'booking_count': table.c.booking_count + statement.excluded.booking_count,
+                        'amount_total': table.c.amount_total + statement.excluded.amount_total
+                    }
+                )
+                connection.execute(statement)
+            else:
+                result = connection.execute(
+                    table.update().where(table.c.status == status).values(
+                        booking_count=table.c.booking_count + count,
+                        amount_total=table.c.amount_total + amount
+                    )
+                )
+                if result.rowcount == 0:
+                    connection.execute(table.insert().values(**values))
+
+    @staticmethod
+    def aggregate(connection=None):
+        """
+        Compute the counters from the bookings table.
+
+        Returns:
+            Dictionary mapping status to (count, amount)
+        """
+        connection = connection or db.session.connection()
+        statement = select(
+            Booking.status, func.count(Booking.id), func.coalesce(func.sum(Booking.amount), 0)
+        ).group_by(Booking.status)
+        return {status: (count, Decimal(str(amount))) for status, count, amount in connection.execute(statement)}
+
+    @staticmethod
+    def totals(connection=None):
+        """
+        Read the stored counters.
+
+        Returns:
+            Dictionary mapping status to (count, amount), omitting zero rows
+        """
+        connection = connection or db.session.connection()
+        table = BookingCounter.__table__
+        rows = connection.execute(select(table.c.status, table.c.booking_count, table.c.amount_total))
+        return {status: (count, Decimal(str(amount))) for status, count, amount in rows if count or amount}
+
+    @staticmethod
+    def rebuild(connection=None):
+        """
+        Regenerate the counters from the bookings table.
+
+        Returns:
+            Number of counter rows written
+        """
+        connection = connection or db.session.connection()
+        table = BookingCounter.__table__
+        aggregates = select(
+            Booking.status, func.count(Booking.id), func.coalesce(func.sum(Booking.amount), 0)
+        ).group_by(Booking.status)
+
+        connection.execute(table.delete())
+        connection.execute(insert(table).from_select(['status', 'booking_count', 'amount_total'], aggregates))
+        return connection.execute(select(func.count()).select_from(table)).scalar()
+
+    @staticmethod
+    def check(connection=None):
+        """
+        Compare the stored counters with the bookings table.
+
+        Returns:
+            Dictionary mapping each disagreeing status to
+            {'stored': (count, amount), 'actual': (count, amount)}
+        """
+        connection = connection or db.session.connection()
+        stored = BookingCounter.totals(connection)
+        actual = BookingCounter.aggregate(connection)
+        empty = (0, Decimal(0))
+        return {
+            status: {'stored': stored.get(status, empty), 'actual': actual.get(status, empty)}
+            for status in sorted(set(stored) | set(actual))
+            if stored.get(status, empty) != actual.get(status, empty)
+        }
+
+    def __repr__(self):
+        """String representation of counter row."""
+        return f'<BookingCounter {self.status}: {self.booking_count}>'
+
+
+def counter_deltas(rollup_deltas, status_position, amount_position):
+    """
+    Fold daily rollup deltas into per-status counter deltas.
+
+    Args:
+        rollup_deltas: Dictionary mapping rollup keys to [count, measure totals...]
+        status_position: Index of the status within a rollup key
+        amount_position: Index of the amount total within a delta
+
+    Returns:
+        Dictionary mapping status to [count, amount]
+    """
+    deltas = defaultdict(lambda: [0, Decimal(0)])
+    for key, totals in rollup_deltas.items():
+        counter = deltas[key[status_position]]
+        counter[0] += totals[0]
+        counter[1] += totals[amount_position]
+    return deltas
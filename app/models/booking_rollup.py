@@ -0,0 +1,250 @@
+"""Daily booking rollup model for pre-aggregated analytics."""
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import event, func, inspect, select, insert, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models.booking import Booking
+from app.models.booking_counter import BookingCounter, counter_deltas
+
+
+# Booking columns that identify a rollup row
+ROLLUP_DIMENSIONS = ('project_name', 'type', 'status')
+
+# Booking columns summed into the rollup, mapped to their rollup column
+ROLLUP_MEASURES = {
+    'amount': 'amount_total',
+    'tax_gst': 'tax_gst_total',
+    'area': 'area_total',
+    'refund_buyer': 'refund_buyer_total',
+    'refund_referral': 'refund_referral_total',
+    'onc_trust_fund': 'onc_trust_fund_total',
+    'oncct_funded': 'oncct_funded_total',
+}
+
+# Booking attributes whose change moves a booking between or within rollup rows
+ROLLUP_SOURCE_FIELDS = ('created_at',) + ROLLUP_DIMENSIONS + tuple(ROLLUP_MEASURES)
+
+
+class BookingDailyRollup(db.Model):
+    """Booking counts and sums per day, project, property type and status."""
+
+    __tablename__ = 'booking_daily_rollup'
+
+    # Dimensions
+    day = db.Column(db.Date, primary_key=True)
+    project_name = db.Column(db.String(255), primary_key=True)
+    type = db.Column(db.String(50), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+
+    # Measures
+    booking_count = db.Column(db.Integer, nullable=False, default=0)
+    amount_total = db.Column(db.Numeric(18, 2), nullable=False, default=0)
+    tax_gst_total = db.Column(db.Numeric(18, 2), nullable=False, default=0)
+    area_total = db.Column(db.Float, nullable=False, default=0)
+    refund_buyer_total = db.Column(db.Numeric(18, 2), nullable=False, default=0)
+    refund_referral_total = db.Column(db.Numeric(18, 2), nullable=False, default=0)
+    onc_trust_fund_total = db.Column(db.Numeric(18, 2), nullable=False, default=0)
+    oncct_funded_total = db.Column(db.Numeric(18, 2), nullable=False, default=0)
+
+    @staticmethod
+    def collect_deltas(rows, sign, deltas=None):
+        """
+        Accumulate rollup deltas for booking rows.
+
+        Args:
+            rows: Mappings with the booking columns in ROLLUP_SOURCE_FIELDS
+            sign: 1 to add the rows, -1 to remove them
+            deltas: Existing delta dictionary to accumulate into
+
+        Returns:
+            Dictionary mapping rollup keys to [count, measure totals...]
+        """
+        if deltas is None:
+            deltas = _empty_deltas()
+
+        for row in rows:
+            created_at = row['created_at']
+            key = (created_at.date(),) + tuple(row[name] for name in ROLLUP_DIMENSIONS)
+            totals = deltas[key]
+            totals[0] += sign
+            for index, name in enumerate(ROLLUP_MEASURES, start=1):
+                totals[index] += sign * Decimal(str(row[name] or 0))
+
+        return deltas
+
+    @staticmethod
+    def collect_matching_deltas(connection, condition, sign, deltas=None, **overrides):
+        """
+        Accumulate rollup deltas for every booking matching ``condition``.
+
+        The bookings are aggregated in SQL, so set-based writes cost one
+        grouped query rather than a read of each affected row.
+
+        Args:
+            connection: Connection to query
+            condition: WHERE clause over the bookings table
+            sign: 1 to add the bookings, -1 to remove them
+            deltas: Existing delta dictionary to accumulate into
+            overrides: Dimension values replacing the stored ones, describing
+                the bookings as a pending UPDATE will leave them
+
+        Returns:
+            Dictionary mapping rollup keys to [count, measure totals...]
+        """
+        if deltas is None:
+            deltas = _empty_deltas()
+
+        day = type_coerce(func.date(Booking.created_at), db.Date)
+        dimensions = [getattr(Booking, name) for name in ROLLUP_DIMENSIONS]
+        statement = select(
+            day,
+            *dimensions,
+            func.count(Booking.id),
+            *[func.coalesce(func.sum(getattr(Booking, name)), 0) for name in ROLLUP_MEASURES]
+        ).where(condition).group_by(day, *dimensions)
+
+        for row in connection.execute(statement):
+            stored = dict(zip(ROLLUP_DIMENSIONS, row[1:len(ROLLUP_DIMENSIONS) + 1]))
+            key = (row[0],) + tuple(overrides.get(name, stored[name]) for name in ROLLUP_DIMENSIONS)
+            totals = deltas[key]
+            totals[0] += sign * row[len(ROLLUP_DIMENSIONS) + 1]
+            for index, total in enumerate(row[len(ROLLUP_DIMENSIONS) + 2:], start=1):
+                totals[index] += sign * Decimal(str(total))
+
+        return deltas
+
+    @staticmethod
+    def apply_deltas(connection, deltas):
+        """Add accumulated deltas to the rollup, and to the status counters, using the given connection."""
+        table = BookingDailyRollup.__table__
+        key_columns = ['day'] + list(ROLLUP_DIMENSIONS)
+        measure_columns = ['booking_count'] + list(ROLLUP_MEASURES.values())
+
+        for key, totals in deltas.items():
+            if not any(totals):
+                continue
+
+            values = dict(zip(key_columns, key))
+            for column, total in zip(measure_columns, totals):
+                values[column] = float(total) if column == 'area_total' else total
+
+            dialect = connection.dialect.name
+            if dialect in ('sqlite', 'postgresql'):
+                dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+                statement = dialect_insert(table).values(**values)
+                statement = statement.on_conflict_do_update(
+                    index_elements=key_columns,
+                    set_={column: table.c[column] + statement.excluded[column] for column in measure_columns}
+                )
+                connection.execute(statement)
+            else:
+                where = [table.c[column] == values[column] for column in key_columns]
+                result = connection.execute(
+                    table.update().where(*where).values(
+                        {column: table.c[column] + values[column] for column in measure_columns}
+                    )
+                )
+                if result.rowcount == 0:
+                    connection.execute(table.insert().values(**values))
+
+        BookingCounter.apply_deltas(connection, counter_deltas(
+            deltas, 1 + ROLLUP_DIMENSIONS.index('status'), 1 + list(ROLLUP_MEASURES).index('amount')
+        ))
+
+    @staticmethod
+    def rebuild(connection=None):
+        """
+        Regenerate the whole rollup from the bookings table.
+
+        Returns:
+            Number of rollup rows written
+        """
+        connection = connection or db.session.connection()
+        table = BookingDailyRollup.__table__
+        day = func.date(Booking.created_at)
+
+        aggregates = select(
+            day,
+            *[getattr(Booking, name) for name in ROLLUP_DIMENSIONS],
+            func.count(Booking.id),
+            *[func.coalesce(func.sum(getattr(Booking, name)), 0) for name in ROLLUP_MEASURES]
+        ).group_by(day, *[getattr(Booking, name) for name in ROLLUP_DIMENSIONS])
+
+        connection.execute(table.delete())
+        connection.execute(insert(table).from_select(
+            ['day'] + list(ROLLUP_DIMENSIONS) + ['booking_count'] + list(ROLLUP_MEASURES.values()),
+            aggregates
+        ))
+        return connection.execute(select(func.count()).select_from(table)).scalar()
+
+    def to_dict(self):
+        """Convert rollup row to dictionary representation."""
+        return {
+            'day': self.day.isoformat() if self.day else None,
+            'project_name': self.project_name,
+            'type': self.type,
+            'status': self.status,
+            'booking_count': self.booking_count,
+            'amount_total': float(self.amount_total),
+            'tax_gst_total': float(self.tax_gst_total),
+            'area_total': float(self.area_total),
+            'refund_buyer_total': float(self.refund_buyer_total),
+            'refund_referral_total': float(self.refund_referral_total),
+            'onc_trust_fund_total': float(self.onc_trust_fund_total),
+            'oncct_funded_total': float(self.oncct_funded_total)
+        }
+
+    def __repr__(self):
+        """String representation of rollup row."""
+        return f'<BookingDailyRollup {self.day} {self.project_name} {self.type} {self.status}: {self.booking_count}>'
+
+
+def _empty_deltas():
+    """Create a delta dictionary defaulting to a zero count and zero totals."""
+    return defaultdict(lambda: [0] + [Decimal(0)] * len(ROLLUP_MEASURES))
+
+
+def _fetch_rollup_rows(connection, booking_ids):
+    """Read the rollup-relevant columns of the given bookings from the database."""
+    if not booking_ids:
+        return []
+    columns = [getattr(Booking, name) for name in ROLLUP_SOURCE_FIELDS]
+    statement = select(*columns).where(Booking.id.in_(booking_ids))
+    return connection.execute(statement).mappings().all()
+
+
+def _touches_rollup(booking):
+    """Check whether a dirty booking changed any rollup-relevant attribute."""
+    attrs = inspect(booking).attrs
+    return any(attrs[name].history.has_changes() for name in ROLLUP_SOURCE_FIELDS)
+
+
+@event.listens_for(db.session, 'before_flush')
+def _capture_rollup_removals(session, flush_context, instances):
+    """Subtract the pre-flush state of updated and deleted bookings."""
+    updated = [obj for obj in session.dirty
+               if isinstance(obj, Booking) and obj.id is not None and _touches_rollup(obj)]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Booking) and obj.id is not None]
+    if not updated and not deleted:
+        return
+
+    connection = session.connection()
+    rows = _fetch_rollup_rows(connection, [obj.id for obj in updated + deleted])
+    session.info['rollup_deltas'] = BookingDailyRollup.collect_deltas(rows, -1)
+    session.info['rollup_updated'] = updated
+
+
+@event.listens_for(db.session, 'after_flush')
+def _apply_rollup_changes(session, flush_context):
+    """Add the post-flush state of inserted and updated bookings and write the deltas."""
+    deltas = session.info.pop('rollup_deltas', None)
+    updated = session.info.pop('rollup_updated', [])
+    inserted = [obj for obj in session.new if isinstance(obj, Booking)]
+    if deltas is None and not inserted:
+        return
+
+    connection = session.connection()
+    rows = _fetch_rollup_rows(connection, [obj.id for obj in inserted + updated])
+    deltas = BookingDailyRollup.collect_deltas(rows, 1, deltas)
+    BookingDailyRollup.apply_deltas(connection, deltas)
@@ -0,0 +1,197 @@
+"""Full-text search index over booking text columns."""
+import html
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event, func, literal_column, select, text
+from sqlalchemy.sql import column, table
+from app import db
+from app.models.booking import Booking
+
+
+# Booking columns covered by the search index, in index column order
+SEARCH_COLUMNS = ('customer_name', 'project_name', 'contact_number', 'type', 'invoice_status')
+
+# SQLite FTS5 external-content table indexing the search columns of bookings
+booking_search = table('booking_search', column('rowid'), *[column(name) for name in SEARCH_COLUMNS])
+
+# Markers wrapped around matched terms by highlighted search
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+
+# Control characters the database wraps matches in; the text around them is
+# HTML-escaped before they are swapped for the markers
+_MATCH_START = '\x02'
+_MATCH_END = '\x03'
+
+
+def _sqlite_ddl() -> List[str]:
+    """Statements creating the FTS5 table and the triggers that keep it in step with bookings."""
+    columns = ', '.join(SEARCH_COLUMNS)
+    new_values = ', '.join(f'new.{name}' for name in SEARCH_COLUMNS)
+    old_values = ', '.join(f'old.{name}' for name in SEARCH_COLUMNS)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS booking_search USING fts5("
+        f"{columns}, content='bookings', content_rowid='id', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS bookings_search_insert AFTER INSERT ON bookings BEGIN "
+        f"INSERT INTO booking_search(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS bookings_search_delete AFTER DELETE ON bookings BEGIN "
+        f"INSERT INTO booking_search(booking_search, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS bookings_search_update AFTER UPDATE OF {columns} ON bookings BEGIN "
+        f"INSERT INTO booking_search(booking_search, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO booking_search(rowid, {columns}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def _postgresql_ddl() -> List[str]:
+    """Statements adding a generated tsvector column and its GIN index to bookings."""
+    document = " || ' ' || ".join(f"coalesce({name}, '')" for name in SEARCH_COLUMNS)
+    return [
+        f"ALTER TABLE bookings ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple', {document})) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_bookings_search_vector ON bookings USING GIN (search_vector)",
+    ]
+
+
+def create_search_index(connection) -> bool:
+    """
+    Create the search index for the connection's dialect if it is missing.
+
+    An FTS5 table created over existing bookings is populated from them.
+
+    Returns:
+        True if the dialect has a search index
+    """
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        existed = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'booking_search'"
+        )).first() is not None
+        for statement in _sqlite_ddl():
+            connection.execute(text(statement))
+        if not existed:
+            connection.execute(text("INSERT INTO booking_search(booking_search) VALUES ('rebuild')"))
+        return True
+    if dialect == 'postgresql':
+        for statement in _postgresql_ddl():
+            connection.execute(text(statement))
+        return True
+    return False
+
+
+def search_supported() -> bool:
+    """Check whether the current database has a search index."""
+    return db.session.get_bind().dialect.name in ('sqlite', 'postgresql')
+
+
+def search_terms(query_text: str) -> List[str]:
+    """Split free text into the word tokens the index stores."""
+    return re.findall(r'[^\W_]+', query_text.lower())
+
+
+def matching_ids(query_text: str):
+    """
+    Select the ids of bookings matching every term of ``query_text`` as a prefix.
+
+    Returns:
+        Select of booking ids, or None when the database has no search index
+        or the text contains no searchable terms
+    """
+    terms = search_terms(query_text)
+    if not terms or not search_supported():
+        return None
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return select(Booking.id).where(literal_column('search_vector').op('@@')(_tsquery(terms)))
+    return select(booking_search.c.rowid).where(_fts_match(terms))
+
+
+def ranked_search(query_text: str, limit: int = 50, highlight: bool = False,
+                  columns: Optional[Sequence] = None) -> Optional[List[Tuple[Any, Optional[Dict[str, str]]]]]:
+    """
+    Find bookings matching ``query_text``, best matches first.
+
+    Args:
+        query_text: Free search text; every term must match as a word prefix
+        limit: Maximum number of results
+        highlight: Also return the search columns as HTML-escaped text with
+            matched terms wrapped in ``<mark>`` tags
+        columns: Select only these bookings columns, returning rows instead
+            of Booking instances
+
+    Returns:
+        List of (booking or row, highlights) pairs, or None when the database
+        has no search index or the text contains no searchable terms
+    """
+    terms = search_terms(query_text)
+    if not terms or not search_supported():
+        return None
+
+    entities = list(columns) if columns else [Booking]
+    if db.session.get_bind().dialect.name == 'postgresql':
+        tsquery = _tsquery(terms)
+        vector = literal_column('search_vector')
+        marks = [
+            func.ts_headline('simple', getattr(Booking, name), tsquery,
+                             f'StartSel={_MATCH_START}, StopSel={_MATCH_END}, HighlightAll=true')
+            for name in SEARCH_COLUMNS
+        ] if highlight else []
+        statement = select(*entities, *marks).where(
+            vector.op('@@')(tsquery)
+        ).order_by(func.ts_rank(vector, tsquery).desc(), Booking.id.desc())
+    else:
+        # Rank on the index alone so only the top rows are read from bookings
+        fts = literal_column('booking_search')
+        score = func.bm25(fts)
+        top = select(
+            booking_search.c.rowid.label('id'), score.label('score')
+        ).where(
+            _fts_match(terms)
+        ).order_by(score, booking_search.c.rowid.desc()).limit(limit).subquery()
+        marks = [
+            func.highlight(fts, index, _MATCH_START, _MATCH_END)
+            for index in range(len(SEARCH_COLUMNS))
+        ] if highlight else []
+        statement = select(*entities, *marks).join(top, top.c.id == Booking.id)
+        if highlight:
+            # highlight() needs a cursor on the matching FTS row
+            statement = statement.join(booking_search, booking_search.c.rowid == top.c.id).where(_fts_match(terms))
+        statement = statement.order_by(top.c.score, Booking.id.desc())
+
+    results = []
+    for row in db.session.execute(statement.limit(limit)):
+        highlights = {
+            name: _mark_up(value) for name, value in zip(SEARCH_COLUMNS, row[len(entities):])
+        } if highlight else None
+        results.append((row if columns else row[0], highlights))
+    return results
+
+
+def _mark_up(value: Optional[str]) -> Optional[str]:
+    """Escape highlighted column text for HTML and turn the match delimiters into markers."""
+    if value is None:
+        return None
+    return html.escape(value).replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_END, HIGHLIGHT_END)
+
+
+def _fts_match(terms: List[str]):
+    """FTS5 MATCH condition requiring every term as a prefix."""
+    expression = ' '.join(f'"{term}"*' for term in terms)
+    return literal_column('booking_search').op('MATCH')(expression)
+
+
+def _tsquery(terms: List[str]):
+    """Postgres tsquery requiring every term as a prefix."""
+    return func.to_tsquery('simple', ' & '.join(f'{term}:*' for term in terms))
+
+
+@event.listens_for(Booking.__table__, 'after_create')
+def _create_search_index(target, connection, **kwargs):
+    """Create the search index alongside a new bookings table."""
+    create_search_index(connection)
+
+
+@event.listens_for(Booking.__table__, 'before_drop')
+def _drop_search_index(target, connection, **kwargs):
+    """Drop the FTS5 table with bookings; its triggers go with the table."""
+    if connection.dialect.name == 'sqlite':
+        connection.execute(text('DROP TABLE IF EXISTS booking_search'))
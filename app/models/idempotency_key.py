@@ -0,0 +1,32 @@
+"""Stored outcomes of write requests made with an Idempotency-Key header."""
+from datetime import datetime
+from app import db
+
+
+class IdempotencyKey(db.Model):
+    """
+    One client-chosen key and the response its request produced.
+
+    The row is written in the same transaction as the request's own changes,
+    so a committed write always has its key. ``status_code`` stays empty
+    until the response is recorded.
+    """
+
+    __tablename__ = 'idempotency_keys'
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    key = db.Column(db.String(255), primary_key=True)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer)
+    response_body = db.Column(db.Text)
+    mimetype = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    @property
+    def completed(self):
+        """Whether the response has been recorded."""
+        return self.status_code is not None
+
+    def __repr__(self):
+        """String representation of idempotency key."""
+        return f'<IdempotencyKey {self.user_id}:{self.key} {self.status_code or "pending"}>'
@@ -0,0 +1,26 @@
+"""Single-use tickets authorizing one server-sent event stream."""
+from datetime import datetime
+from app import db
+
+
+class StreamTicket(db.Model):
+    """
+    One short-lived ticket exchanged for an event stream.
+
+    Only a hash of the ticket is stored. The ticket is deleted when a stream
+    redeems it, and remembers when the access token it was issued against
+    expires, so the stream can end at the same time.
+    """
+
+    __tablename__ = 'stream_tickets'
+
+    ticket_hash = db.Column(db.String(64), primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    role = db.Column(db.String(20), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    access_expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        """String representation of stream ticket."""
+        return f'<StreamTicket user {self.user_id} until {self.expires_at}>'
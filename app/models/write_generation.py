@@ -0,0 +1,89 @@
+"""Write generation for booking data, local to the process and shared through the change journal."""
+import threading
+from typing import Optional, Tuple
+from sqlalchemy import event
+from app import db
+from app.models.booking import Booking
+from app.models.booking_change import ChangePosition, change_journal_head, has_change_journal
+
+
+class WriteGeneration:
+    """Monotonic counter bumped whenever a transaction that changed bookings commits."""
+
+    def __init__(self):
+        """Initialize counter at generation zero."""
+        self._value = 0
+        self._changed = threading.Condition()
+
+    @property
+    def value(self) -> int:
+        """Current write generation."""
+        return self._value
+
+    def bump(self) -> int:
+        """Advance the generation, wake waiters and return the new value."""
+        with self._changed:
+            self._value += 1
+            self._changed.notify_all()
+            return self._value
+
+    def wait(self, seen: int, timeout: float) -> int:
+        """Block until the generation moves past ``seen`` or ``timeout`` seconds pass; return the current value."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._value != seen, timeout)
+            return self._value
+
+
+booking_generation = WriteGeneration()
+
+
+def current_generation() -> Tuple[int, Optional[ChangePosition]]:
+    """
+    Return the generation results derived from bookings are cached at.
+
+    Pairs the process-local generation, which moves as soon as this process
+    commits a booking change, with the change journal head, which moves for
+    every process sharing the database whenever any of them commits one. A
+    write in one worker therefore invalidates results cached by all of them.
+    On PostgreSQL the head only passes a transaction once all older ones
+    have ended (see ``settled_changes``), so another worker's write can go
+    unnoticed while a long transaction is open, at most until the cache TTL.
+    Databases without a journal only see local writes.
+
+    Must run inside an application context.
+    """
+    head = change_journal_head() if has_change_journal() else None
+    return booking_generation.value, head
+
+
+def mark_bookings_changed(session=None):
+    """
+    Flag the current transaction as having changed bookings.
+
+    ORM writes are detected automatically; Core statements that bypass the
+    unit of work (bulk inserts and updates) must call this explicitly.
+    """
+    session = session or db.session
+    session.info['bookings_changed'] = True
+
+
+@event.listens_for(db.session, 'after_flush')
+def _detect_booking_changes(session, flush_context):
+    """Remember whether this flush wrote any booking rows."""
+    for collection in (session.new, session.dirty, session.deleted):
+        if any(isinstance(obj, Booking) for obj in collection):
+            session.info['bookings_changed'] = True
+            return
+
+
+@event.listens_for(db.session, 'after_commit')
+def _bump_generation(session):
+    """Advance the write generation once the booking changes are durable."""
+    if session.info.pop('bookings_changed', False):
+        booking_generation.bump()
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_booking_changes(session):
+    """Forget booking changes from a rolled back transaction."""
+    session.info.pop('bookings_changed', None)
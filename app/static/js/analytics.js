@@ -8,6 +8,7 @@ class AnalyticsManager {
             start_date: null,
             end_date: null
         };
+        this.refreshPending = false;
         
         this.init();
     }
@@ -127,6 +128,18 @@ class AnalyticsManager {
         }
     }
 
+    handleBookingsEvent(data) {
+        // Refresh the dashboard when bookings change while it is on screen;
+        // the server answers repeated requests after one change from its cache
+        const tab = document.getElementById('analytics-tab');
+        if (!tab || !tab.classList.contains('active') || this.refreshPending) return;
+
+        this.refreshPending = true;
+        this.loadDashboardData()
+            .catch(error => console.error('Error refreshing analytics:', error))
+            .finally(() => { this.refreshPending = false; });
+    }
+
     updateKPIs(kpis) {
         // Update KPI values
         const totalBookingsEl = document.getElementById('total-bookings');
@@ -385,15 +398,12 @@ class AnalyticsManager {
                 }
             }
 
-            const data = await response.json();
-            
             // Export based on format
-            if (exportFormat === 'csv' && data.csv_data && data.csv_headers) {
-                // Create and download CSV file
-                this.downloadCSV(data.csv_data, data.csv_headers, 'analytics_kpis');
+            if (exportFormat === 'csv') {
+                // The server streams a ready-made CSV file
+                this.downloadBlob(await response.blob(), 'analytics_kpis', 'csv');
             } else {
-                // Fallback to JSON export
-                this.downloadJSON(data, 'analytics_export');
+                this.downloadJSON(await response.json(), 'analytics_export');
             }
             
             UIUtils.showSuccess(`Data exported successfully as ${exportFormat.toUpperCase()}`);
@@ -406,17 +416,12 @@ class AnalyticsManager {
         }
     }
 
-    downloadCSV(data, headers, filename) {
-        // Convert data to CSV format
-        const csvContent = this.convertToCSV(data, headers);
-        
-        // Create blob and download
-        const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
+    downloadBlob(blob, filename, extension) {
         const url = URL.createObjectURL(blob);
         
         const a = document.createElement('a');
         a.href = url;
-        a.download = `${filename}_${new Date().toISOString().split('T')[0]}.csv`;
+        a.download = `${filename}_${new Date().toISOString().split('T')[0]}.${extension}`;
         document.body.appendChild(a);
         a.click();
         document.body.removeChild(a);
@@ -424,30 +429,6 @@ class AnalyticsManager {
         URL.revokeObjectURL(url);
     }
 
-    convertToCSV(data, headers) {
-        if (!data || data.length === 0) {
-            return '';
-        }
-
-        // Create CSV header
-        let csv = headers.join(',') + '\n';
-        
-        // Add data rows
-        data.forEach(row => {
-            const values = headers.map(header => {
-                const value = row[header] || '';
-                // Escape commas and quotes in values
-                if (typeof value === 'string' && (value.includes(',') || value.includes('"') || value.includes('\n'))) {
-                    return `"${value.replace(/"/g, '""')}"`;
-                }
-                return value;
-            });
-            csv += values.join(',') + '\n';
-        });
-        
-        return csv;
-    }
-
     downloadJSON(data, filename) {
         const blob = new Blob([JSON.stringify(data, null, 2)], { type: 'application/json' });
         const url = URL.createObjectURL(blob);
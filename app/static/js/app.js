@@ -90,6 +90,53 @@ class BookingApp {
         this.updateUserInfo();
         this.setupDashboardTabs();
         this.loadBookings();
+        this.connectEvents();
+    }
+
+    async connectEvents() {
+        // One push stream per page; the booking list and dashboard refresh when it reports a change
+        if (this.eventSource || this.eventsConnecting || typeof EventSource === 'undefined') return;
+
+        // EventSource cannot send an Authorization header, so the stream is opened with a single-use ticket
+        this.eventsConnecting = true;
+        try {
+            const response = await authService.apiRequest('/events/ticket', { method: 'POST' });
+            if (!response || !response.ok) return;
+            const { ticket } = await response.json();
+
+            const source = new EventSource(`${authService.baseURL}/events?ticket=${encodeURIComponent(ticket)}`);
+            source.addEventListener('bookings', (e) => this.handleBookingsEvent(JSON.parse(e.data)));
+            source.addEventListener('resync', () => this.handleBookingsEvent(null));
+            // A spent ticket cannot reconnect, so drop the stream and open a new one with a fresh ticket
+            source.addEventListener('expired', () => this.reconnectEvents());
+            source.addEventListener('error', () => this.reconnectEvents());
+            this.eventSource = source;
+        } catch (error) {
+            console.error('Event stream error:', error);
+        } finally {
+            this.eventsConnecting = false;
+        }
+    }
+
+    reconnectEvents() {
+        if (!this.eventSource) return;
+        this.eventSource.close();
+        this.eventSource = null;
+        // An expired login makes the ticket request fail, which signs the user out
+        setTimeout(() => this.connectEvents(), 5000);
+    }
+
+    eventsConnected() {
+        return !!this.eventSource && this.eventSource.readyState === EventSource.OPEN;
+    }
+
+    handleBookingsEvent(data) {
+        if (window.bookingManager) {
+            window.bookingManager.handleBookingsEvent(data);
+        }
+        if (window.analyticsManager) {
+            window.analyticsManager.handleBookingsEvent(data);
+        }
     }
 
     updateUserInfo() {
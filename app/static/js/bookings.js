@@ -4,6 +4,12 @@ class BookingManager {
     constructor() {
         this.bookings = [];
         this.filteredBookings = [];
+        this.pageSize = 50;
+        this.changeToken = null; // Position in the server's change feed
+        this.pollTimer = null;
+        this.pollInterval = 30000;
+        this.searchTerm = '';
+        this.statusFilter = '';
         this.sortColumn = null;
         this.sortDirection = 'asc';
         this.editingBooking = null;
@@ -184,23 +190,22 @@ class BookingManager {
     }
 
     async loadBookings() {
+        // Load the newest page of bookings; the change feed then keeps those rows current
         try {
             UIUtils.setLoading('bookings-tab', true);
-            const response = await authService.apiRequest('/bookings');
             
-            if (!response || !response.ok) {
-                if (response) {
-                    const errorData = await response.json();
-                    throw new Error(errorData.error || `HTTP error! status: ${response.status}`);
-                } else {
-                    throw new Error('Network error or authentication failed');
-                }
-            }
+            // Take the feed position first so changes made while the page loads are not missed
+            const head = await authService.apiRequest('/bookings/changes?since=now');
+            this.changeToken = head && head.ok ? (await head.json()).next_token : null;
             
-            const data = await response.json();
+            const data = await this.readJson(await authService.apiRequest('/bookings'));
             this.bookings = data.bookings || [];
-            this.filteredBookings = [...this.bookings];
-            this.renderBookingsTable();
+            this.pageSize = (data.pagination && data.pagination.per_page) || this.pageSize;
+            this.applyFilters();
+            
+            if (this.changeToken) {
+                this.startPolling();
+            }
             
         } catch (error) {
             console.error('Error loading bookings:', error);
@@ -215,6 +220,94 @@ class BookingManager {
         }
     }
 
+    async readJson(response) {
+        if (!response || !response.ok) {
+            if (response) {
+                const errorData = await response.json();
+                throw new Error(errorData.error || `HTTP error! status: ${response.status}`);
+            } else {
+                throw new Error('Network error or authentication failed');
+            }
+        }
+        return response.json();
+    }
+
+    async refreshBookings() {
+        // After this client's own writes: follow the feed, or reload without one
+        if (this.changeToken) {
+            await this.syncChanges();
+        } else {
+            await this.loadBookings();
+        }
+    }
+
+    async syncChanges() {
+        // Apply changes since the last sync to the loaded page only. Rows not on
+        // the page are skipped, except bookings newer than the page's newest row,
+        // which are added at the top as the list endpoint would return them.
+        const loaded = new Map(this.bookings.map(booking => [booking.id, booking]));
+        const newest = this.bookings.length ? this.bookings[0].created_at : '';
+        const created = new Map();
+        let changed = false;
+        let hasMore = true;
+        while (hasMore && this.changeToken) {
+            const response = await authService.apiRequest(
+                `/bookings/changes?since=${encodeURIComponent(this.changeToken)}`
+            );
+            if (response && response.status === 410) {
+                // Token from an earlier database: reload the page
+                this.changeToken = null;
+                return this.loadBookings();
+            }
+            
+            const data = await this.readJson(response);
+            data.bookings.forEach(booking => {
+                if (loaded.has(booking.id)) {
+                    loaded.set(booking.id, booking);
+                    changed = true;
+                } else if (booking.created_at >= newest) {
+                    created.set(booking.id, booking);
+                }
+            });
+            data.deleted.forEach(id => {
+                changed = loaded.delete(id) || changed;
+                created.delete(id);
+            });
+            this.changeToken = data.next_token;
+            hasMore = data.has_more;
+        }
+        
+        if (changed || created.size > 0) {
+            // Newest first, as the list endpoint returns them
+            const added = [...created.values()].sort((a, b) =>
+                b.created_at.localeCompare(a.created_at) || b.id - a.id
+            );
+            this.bookings = [...added, ...loaded.values()].slice(0, this.pageSize);
+            this.applyFilters();
+        }
+    }
+
+    handleBookingsEvent(data) {
+        // Pushed by the event stream; a null event means pushes were missed
+        if (this.changeToken === null || (data && data.token === this.changeToken)) return;
+        this.syncChanges().catch(error => console.error('Error syncing bookings:', error));
+    }
+
+    startPolling() {
+        // Fallback for when the event stream is unavailable
+        if (this.pollTimer) return;
+        this.pollTimer = setInterval(() => {
+            const tab = document.getElementById('bookings-tab');
+            if (document.hidden || !authService.isAuthenticated() || !tab || !tab.classList.contains('active')) {
+                return;
+            }
+            if (window.app && window.app.eventsConnected()) {
+                return;
+            }
+            this.syncChanges().catch(error => console.error('Error syncing bookings:', error));
+        }, this.pollInterval);
+    }
+
     renderBookingsTable() {
         const tbody = document.getElementById('bookings-tbody');
         if (!tbody) return;
@@ -348,7 +441,7 @@ class BookingManager {
                 const result = await response.json();
                 UIUtils.showSuccess(result.message || 'Booking saved successfully');
                 this.closeModal();
-                await this.loadBookings(); // Reload bookings
+                await this.refreshBookings();
             } else {
                 const error = await response.json();
                 UIUtils.showError(error.error || 'Failed to save booking', 'modal-error');
@@ -432,7 +525,7 @@ class BookingManager {
             if (response && response.ok) {
                 const result = await response.json();
                 UIUtils.showSuccess(result.message || 'Booking deleted successfully');
-                await this.loadBookings(); // Reload bookings
+                await this.refreshBookings();
             } else {
                 const error = await response.json();
                 UIUtils.showError(error.error || 'Failed to delete booking');
@@ -444,30 +537,30 @@ class BookingManager {
     }
 
     handleSearch(searchTerm) {
-        const term = searchTerm.toLowerCase().trim();
-        
-        if (!term) {
-            this.filteredBookings = [...this.bookings];
-        } else {
-            this.filteredBookings = this.bookings.filter(booking => 
+        this.searchTerm = searchTerm.toLowerCase().trim();
+        this.applyFilters();
+    }
+
+    handleStatusFilter(status) {
+        this.statusFilter = status;
+        this.applyFilters();
+    }
+
+    applyFilters() {
+        const term = this.searchTerm;
+        this.filteredBookings = this.bookings.filter(booking =>
+            (!this.statusFilter || booking.status === this.statusFilter) &&
+            (!term ||
                 booking.customer_name.toLowerCase().includes(term) ||
                 booking.project_name.toLowerCase().includes(term) ||
                 booking.contact_number.includes(term) ||
                 booking.type.toLowerCase().includes(term) ||
-                booking.invoice_status.toLowerCase().includes(term)
-            );
-        }
+                booking.invoice_status.toLowerCase().includes(term))
+        );
         
-        this.renderBookingsTable();
-    }
-
-    handleStatusFilter(status) {
-        if (!status) {
-            this.filteredBookings = [...this.bookings];
-        } else {
-            this.filteredBookings = this.bookings.filter(booking => booking.status === status);
+        if (this.sortColumn) {
+            this.sortFilteredBookings();
         }
-        
         this.renderBookingsTable();
     }
 
@@ -479,6 +572,13 @@ class BookingManager {
             this.sortDirection = 'asc';
         }
 
+        this.sortFilteredBookings();
+        this.renderBookingsTable();
+        this.updateSortIndicators(column);
+    }
+
+    sortFilteredBookings() {
+        const column = this.sortColumn;
         this.filteredBookings.sort((a, b) => {
             let aVal = a[column];
             let bVal = b[column];
@@ -493,9 +593,6 @@ class BookingManager {
             if (aVal > bVal) return this.sortDirection === 'asc' ? 1 : -1;
             return 0;
         });
-
-        this.renderBookingsTable();
-        this.updateSortIndicators(column);
     }
 
     updateSortIndicators(column) {
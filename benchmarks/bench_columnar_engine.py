@@ -0,0 +1,57 @@
+"""
+Benchmark dashboard analytics: SQL rows, SQL rollup and the NumPy columnar engine.
+
+Usage:
+    python benchmarks/bench_columnar_engine.py --rows 10000 100000 1000000
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from common import make_app, seed_bookings, timed
+from app import db
+from app.analytics.analytics_service import AnalyticsService
+from app.analytics.columnar import get_snapshot
+
+ENGINES = {
+    'sql rows': {'ANALYTICS_ENGINE': 'sql', 'ANALYTICS_USE_ROLLUP': False},
+    'sql rollup': {'ANALYTICS_ENGINE': 'sql', 'ANALYTICS_USE_ROLLUP': True},
+    'columnar': {'ANALYTICS_ENGINE': 'columnar', 'ANALYTICS_USE_ROLLUP': False},
+}
+
+
+def run(rows, repeat):
+    """Seed ``rows`` bookings and time the dashboard on every engine."""
+    app = make_app()
+    app.config['ANALYTICS_CACHE_ENABLED'] = False
+    with app.app_context():
+        seed_bookings(rows)
+        
+        load = timed(get_snapshot, 1)
+        cases = {
+            'all': (None, None, None),
+            'status, 90d': (datetime.utcnow() - timedelta(days=90), None, {'status': ['active', 'complete']}),
+            'amount range': (None, None, {'min_amount': 5000000, 'max_amount': 10000000}),
+        }
+        
+        print(f'\n{rows:,} rows (snapshot load {load * 1000:.1f} ms)')
+        print(f'{"filters":<14}' + ''.join(f'{name + " (ms)":>18}' for name in ENGINES))
+        for label, arguments in cases.items():
+            timings = []
+            for settings in ENGINES.values():
+                app.config.update(settings)
+                timings.append(timed(lambda: AnalyticsService.get_dashboard_data(*arguments), repeat))
+            print(f'{label:<14}' + ''.join(f'{elapsed * 1000:>18.1f}' for elapsed in timings))
+        db.session.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark response compression: encoded size and added server time per endpoint.
+
+Usage:
+    python benchmarks/bench_compression.py --rows 100000
+"""
+import argparse
+import time
+
+from common import make_app, seed_bookings
+from app import compression
+from app.auth.auth_service import AuthService
+from app.models import User
+
+ENDPOINTS = ['/api/bookings/?per_page=100', '/api/analytics/dashboard',
+             '/api/analytics/trends?period=daily', '/api/bookings/export?format=csv']
+
+
+def fetch(client, url, headers, repeat):
+    """Return the best time and the body size of ``repeat`` requests."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url, headers=headers)
+        size = len(response.get_data())
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, size
+
+
+def run(rows, repeat):
+    """Seed ``rows`` bookings and fetch each endpoint with every available encoding."""
+    app = make_app()
+    with app.app_context():
+        seed_bookings(rows)
+        admin = User.query.filter_by(username='admin').first()
+        auth = {'Authorization': f'Bearer {AuthService.generate_token(admin)}'}
+        client = app.test_client()
+        encodings = ['identity', 'gzip'] + (['br'] if compression.brotli else [])
+
+        print(f'\n{rows:,} rows')
+        print(f'{"endpoint":>48}{"encoding":>10}{"bytes":>14}{"ratio":>8}{"time (ms)":>11}')
+        for url in ENDPOINTS:
+            baseline = None
+            for encoding in encodings:
+                elapsed, size = fetch(client, url, dict(auth, **{'Accept-Encoding': encoding}), repeat)
+                baseline = baseline or size
+                print(f'{url:>48}{encoding:>10}{size:>14,}{baseline / size:>7.1f}x{elapsed * 1000:>11.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
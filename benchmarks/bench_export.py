@@ -0,0 +1,66 @@
+"""
+Benchmark streamed booking exports: first-byte latency, throughput and peak memory.
+
+Usage:
+    python benchmarks/bench_export.py --rows 100000 1000000 --endpoint analytics bookings
+"""
+import argparse
+import time
+import tracemalloc
+
+from common import make_app, seed_bookings
+from app import db
+from app.auth.auth_service import AuthService
+from app.models import User
+
+# Export URLs by endpoint, formatted with the export format
+ENDPOINTS = {
+    'analytics': '/api/analytics/export?type=bookings&format={}',
+    'bookings': '/api/bookings/export?format={}',
+}
+
+
+def run(rows, export_format, endpoint):
+    """Seed ``rows`` bookings and stream them once through an export endpoint."""
+    app = make_app()
+    with app.app_context():
+        seed_bookings(rows)
+        admin = User.query.filter_by(username='admin').first()
+        token = AuthService.generate_token(admin)
+        client = app.test_client()
+        
+        tracemalloc.start()
+        started = time.perf_counter()
+        response = client.get(ENDPOINTS[endpoint].format(export_format),
+                              headers={'Authorization': f'Bearer {token}'}, buffered=False)
+        chunks = iter(response.response)
+        first = next(chunks)
+        first_byte = time.perf_counter() - started
+        size = len(first)
+        for chunk in chunks:
+            size += len(chunk)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        response.close()
+        
+        print(f'{rows:>10,}  {endpoint:<10}{export_format:<7}{first_byte * 1000:>12.1f}{elapsed:>10.2f}'
+              f'{size / 1024 / 1024:>10.1f}{peak / 1024 / 1024:>12.1f}')
+        db.session.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--format', choices=['csv', 'ndjson'], nargs='+', default=['csv', 'ndjson'])
+    parser.add_argument('--endpoint', choices=list(ENDPOINTS), nargs='+', default=list(ENDPOINTS))
+    args = parser.parse_args()
+    print(f'{"rows":>10}  {"endpoint":<10}{"format":<7}{"first (ms)":>12}{"total (s)":>10}{"MB out":>10}{"peak MB":>12}')
+    for rows in args.rows:
+        for endpoint in args.endpoint:
+            for export_format in args.format:
+                run(rows, export_format, endpoint)
+
+
+if __name__ == '__main__':
+    main()
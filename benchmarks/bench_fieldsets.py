@@ -0,0 +1,62 @@
+"""
+Benchmark booking list serialization: ORM instances with to_dict versus projected rows.
+
+Usage:
+    python benchmarks/bench_fieldsets.py --rows 100000 --per-page 100
+"""
+import argparse
+
+from common import make_app, seed_bookings, timed
+from app import db
+from app.models import Booking
+from app.booking.fields import BOOKING_FIELDS, FieldSelection
+
+
+FIELDSETS = {
+    'list view': ['customer_name', 'project_name', 'type', 'amount', 'status', 'created_at'],
+    'all fields': list(BOOKING_FIELDS),
+}
+
+
+def run(rows, per_page, repeat):
+    """Seed ``rows`` bookings and time fetching and serializing one page both ways."""
+    app = make_app()
+    with app.app_context():
+        seed_bookings(rows)
+        query = Booking.query.filter(Booking.status != 'cancelled')
+        
+        def orm_page():
+            items = query.order_by(Booking.created_at.desc()).limit(per_page).all()
+            result = [booking.to_dict() for booking in items]
+            db.session.expunge_all()
+            return result
+        
+        print(f'\n{rows:,} rows, {per_page} per page')
+        print(f'{"fields":>12}{"ORM to_dict (ms)":>18}{"projection (ms)":>18}{"speedup":>9}')
+        for name, fields in FIELDSETS.items():
+            selection = FieldSelection(fields, extra_columns=['created_at'])
+            
+            def projected_page():
+                items = query.with_entities(*selection.columns).order_by(
+                    Booking.created_at.desc()
+                ).limit(per_page).all()
+                return [selection.serialize(row) for row in items]
+            
+            orm = timed(orm_page, repeat)
+            projected = timed(projected_page, repeat)
+            print(f'{name:>12}{orm * 1000:>18.2f}{projected * 1000:>18.2f}{orm / projected:>8.1f}x')
+        db.session.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000])
+    parser.add_argument('--per-page', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.per_page, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark response serialization per endpoint: Flask's json provider versus FastJSONProvider.
+
+Usage:
+    python benchmarks/bench_json.py --rows 100000 --per-page 100 1000
+"""
+import argparse
+
+from flask.json.provider import DefaultJSONProvider
+
+from common import make_app, seed_bookings, timed
+from app import db, serialization
+from app.auth.auth_service import AuthService
+from app.models import Booking, User
+from app.serialization import FastJSONProvider
+
+# Analytics endpoints whose payloads are serialized as captured
+ANALYTICS_ENDPOINTS = ['/api/analytics/dashboard', '/api/analytics/trends?period=daily',
+                       '/api/analytics/projects', '/api/analytics/filters/options']
+
+
+def capture_payloads(app, client, headers):
+    """Run each analytics endpoint once and keep the object it handed to jsonify."""
+    captured = {}
+    original = app.json.response
+
+    def record(*args, **kwargs):
+        response = original(*args, **kwargs)
+        captured['payload'] = app.json._prepare_response_obj(args, kwargs)
+        return response
+
+    app.json.response = record
+    payloads = {}
+    for url in ANALYTICS_ENDPOINTS:
+        captured.clear()
+        assert client.get(url, headers=headers).status_code == 200, url
+        payloads[url] = captured['payload']
+    app.json.response = original
+    return payloads
+
+
+def run(rows, per_pages, repeat):
+    """Seed ``rows`` bookings and time serializing each endpoint's payload with both providers."""
+    app = make_app()
+    with app.app_context():
+        seed_bookings(rows)
+        admin = User.query.filter_by(username='admin').first()
+        headers = {'Authorization': f'Bearer {AuthService.generate_token(admin)}'}
+        client = app.test_client()
+
+        stdlib = DefaultJSONProvider(app)
+        stdlib.ensure_ascii = False
+        stdlib.sort_keys = False
+        fast = FastJSONProvider(app)
+        fast.ensure_ascii = False
+        fast.sort_keys = False
+
+        print(f'\n{rows:,} rows, orjson {"installed" if serialization.orjson else "missing"}')
+        print(f'{"payload":>40}{"json (us)":>12}{"fast (us)":>12}{"speedup":>9}')
+
+        def report(name, baseline, candidate):
+            before = timed(baseline, repeat)
+            after = timed(candidate, repeat)
+            print(f'{name:>40}{before * 1e6:>12.1f}{after * 1e6:>12.1f}{before / after:>8.1f}x')
+
+        # Booking pages include building the rows with to_dict
+        for per_page in per_pages:
+            items = Booking.query.order_by(Booking.created_at.desc()).limit(per_page).all()
+            with app.test_request_context():
+                report(f'/api/bookings/ ({per_page} per page)',
+                       lambda: stdlib.response({'bookings': [b.to_dict() for b in items]}),
+                       lambda: fast.response({'bookings': [b.to_dict() for b in items]}))
+            db.session.expunge_all()
+
+        for url, payload in capture_payloads(app, client, headers).items():
+            with app.test_request_context():
+                report(url, lambda: stdlib.response(payload), lambda: fast.response(payload))
+        db.session.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000])
+    parser.add_argument('--per-page', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.per_page, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
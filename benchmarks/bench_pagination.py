@@ -0,0 +1,58 @@
+"""
+Benchmark booking list pagination: OFFSET pages versus keyset cursors at increasing depth.
+
+Usage:
+    python benchmarks/bench_pagination.py --rows 200000 --per-page 50
+"""
+import argparse
+
+from common import make_app, seed_bookings, timed
+from app import db
+from app.models import Booking
+from app.booking.pagination import paginate_keyset
+
+
+def run(rows, per_page, repeat):
+    """Seed ``rows`` bookings and time one page at several depths both ways."""
+    app = make_app()
+    with app.app_context():
+        seed_bookings(rows)
+        
+        # Collect the keyset cursor for each page boundary once
+        depths = [1, 10, 100, 1000, rows // per_page - 1]
+        cursors = {}
+        result = paginate_keyset(Booking.query, Booking.created_at, Booking.id, True, None, per_page)
+        page = 1
+        while result.next_cursor and page < max(depths):
+            page += 1
+            if page in depths:
+                cursors[page] = result.next_cursor
+            result = paginate_keyset(Booking.query, Booking.created_at, Booking.id, True, result.next_cursor, per_page)
+        
+        print(f'\n{rows:,} rows, {per_page} per page')
+        print(f'{"page":>8}{"offset+count (ms)":>20}{"keyset (ms)":>14}')
+        for depth in depths:
+            def offset_page():
+                Booking.query.order_by(Booking.created_at.desc(), Booking.id.desc()).paginate(
+                    page=depth, per_page=per_page, error_out=False
+                )
+            
+            def keyset_page():
+                paginate_keyset(Booking.query, Booking.created_at, Booking.id, True, cursors.get(depth), per_page)
+            
+            print(f'{depth:>8}{timed(offset_page, repeat) * 1000:>20.1f}{timed(keyset_page, repeat) * 1000:>14.1f}')
+        db.session.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[200000])
+    parser.add_argument('--per-page', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.per_page, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Report EXPLAIN QUERY PLAN for every bookings query behind the hot API endpoints.
+
+Each endpoint is called through the test client while the SQL it issues is
+recorded; every recorded SELECT on bookings is then explained and
+classified as an index seek, an index-ordered scan or a full table scan,
+with a note when it needs a temporary B-tree to sort or group.
+
+Usage:
+    python benchmarks/bench_query_plans.py --rows 200000
+    python benchmarks/bench_query_plans.py --rows 200000 --drop-index ix_bookings_status_created
+"""
+import argparse
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, text
+
+from common import make_app, seed_bookings, timed
+from app import db
+from app.auth.auth_service import AuthService
+from app.models import User
+
+
+def hot_endpoints():
+    """Endpoint URLs exercising the list, stats and analytics query shapes."""
+    month_ago = (datetime.utcnow() - timedelta(days=30)).isoformat()
+    return [
+        '/api/bookings/?per_page=50',
+        '/api/bookings/?per_page=50&include_total=none&status=active',
+        '/api/bookings/?per_page=50&include_total=none&sort_by=updated_at',
+        '/api/bookings/?per_page=50&include_total=none&sort_by=amount&sort_order=asc',
+        '/api/bookings/?per_page=50&include_total=none&sort_by=timeline',
+        '/api/bookings/?per_page=50&include_total=none&sort_by=customer_name&sort_order=asc',
+        '/api/bookings/?per_page=50&include_total=none&sort_by=project_name&sort_order=asc',
+        '/api/bookings/?per_page=50&include_total=none&sort_by=status',
+        f'/api/bookings/?per_page=50&include_total=none&start_date={month_ago}',
+        f'/api/bookings/?per_page=50&include_total=none&status=complete&start_date={month_ago}',
+        '/api/bookings/?cursor=&per_page=50&status=active',
+        '/api/bookings/search?q=sunrise',
+        '/api/bookings/stats',
+        f'/api/analytics/kpis?start_date={month_ago}&min_amount=1',
+        '/api/analytics/trends?min_amount=1',
+        '/api/analytics/trends?status=complete&min_amount=1',
+        '/api/analytics/projects?min_amount=1',
+        '/api/analytics/projects?status=active&min_amount=1',
+        '/api/analytics/property-types?min_amount=1',
+    ]
+
+
+def classify(plan_rows):
+    """Summarize EXPLAIN QUERY PLAN detail rows for the bookings table."""
+    kinds = []
+    for detail in plan_rows:
+        if not re.search(r'\bbookings\b', detail):
+            continue
+        if detail.startswith('SEARCH'):
+            index = re.search(r'USING (?:COVERING )?INDEX (\w+)|USING INTEGER PRIMARY KEY', detail)
+            kinds.append(f'seek {index.group(1) or "rowid"}' if index else 'seek')
+        elif 'USING' in detail:
+            kinds.append('index scan ' + re.search(r'INDEX (\w+)', detail).group(1))
+        else:
+            kinds.append('FULL SCAN')
+    if any('TEMP B-TREE' in detail for detail in plan_rows):
+        kinds.append('+ sort')
+    return ', '.join(kinds)
+
+
+def run(rows, dropped, analyze, repeat):
+    """Seed ``rows`` bookings, then explain and time each hot endpoint's queries."""
+    app = make_app()
+    app.config['ANALYTICS_CACHE_ENABLED'] = False
+    with app.app_context():
+        seed_bookings(rows)
+        for name in dropped:
+            db.session.execute(text(f'DROP INDEX IF EXISTS {name}'))
+        if analyze:
+            db.session.execute(text('ANALYZE'))
+        db.session.commit()
+
+        token = AuthService.generate_token(User.query.filter_by(username='admin').first())
+        headers = {'Authorization': f'Bearer {token}'}
+        client = app.test_client()
+
+        recorded = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT') and 'bookings' in statement:
+                recorded.append((statement, parameters))
+
+        engine = db.engine
+        print(f'\n{rows:,} rows; dropped: {", ".join(dropped) or "none"}; analyzed: {analyze}')
+        for url in hot_endpoints():
+            recorded.clear()
+            event.listen(engine, 'before_cursor_execute', record)
+            try:
+                client.get(url, headers=headers)
+            finally:
+                event.remove(engine, 'before_cursor_execute', record)
+            statements = list(recorded)
+
+            elapsed = timed(lambda: client.get(url, headers=headers), repeat)
+            print(f'\n{elapsed * 1000:8.1f} ms  {url}')
+            for statement, parameters in statements:
+                plan = db.session.connection().exec_driver_sql(
+                    'EXPLAIN QUERY PLAN ' + statement, parameters
+                ).all()
+                summary = classify([row[3] for row in plan])
+                if summary:
+                    first_line = ' '.join(statement.split())[:90]
+                    print(f'            {summary:<55} {first_line}')
+        db.session.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[200000])
+    parser.add_argument('--drop-index', action='append', default=[],
+                        help='Drop this index before explaining, to compare plans without it.')
+    parser.add_argument('--analyze', action='store_true', help='Run ANALYZE so the planner has statistics.')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.drop_index, args.analyze, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
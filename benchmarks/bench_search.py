@@ -0,0 +1,54 @@
+"""
+Benchmark booking search: ILIKE substring scans versus the full-text index.
+
+Usage:
+    python benchmarks/bench_search.py --rows 100000 1000000
+"""
+import argparse
+
+from common import make_app, seed_bookings, timed
+from app import db
+from app.models import Booking
+from app.models.booking_search import ranked_search
+from app.booking.routes import _search_filter, _substring_filter
+
+
+def run(rows, repeat):
+    """Seed ``rows`` bookings and time selective and broad searches both ways."""
+    app = make_app()
+    with app.app_context():
+        seed_bookings(rows)
+        
+        queries = ['Customer 4242', f'Customer {rows - 7}', 'Sunrise', 'paid']
+        print(f'\n{rows:,} rows')
+        print(f'{"query":>20}{"ILIKE page (ms)":>18}{"index page (ms)":>18}{"ranked (ms)":>14}')
+        for text in queries:
+            def ilike_page():
+                Booking.query.filter(_substring_filter(text)).order_by(
+                    Booking.created_at.desc()
+                ).limit(50).all()
+            
+            def index_page():
+                Booking.query.filter(_search_filter(text)).order_by(
+                    Booking.created_at.desc()
+                ).limit(50).all()
+            
+            def ranked():
+                ranked_search(text, limit=50)
+            
+            print(f'{text:>20}{timed(ilike_page, repeat) * 1000:>18.1f}'
+                  f'{timed(index_page, repeat) * 1000:>18.1f}{timed(ranked, repeat) * 1000:>14.1f}')
+        db.session.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -178,4 +178,330 @@ def test_analytics_export(client, auth_headers, sample_bookings):
     # Check that we get some export data
     if response.content_type == 'application/json':
         data = json.loads(response.data)
-        assert 'bookings' in data or 'data' in data
\ No newline at end of file
+        assert 'bookings' in data or 'data' in data
+
+def test_kpi_summary_single_statement(app, sample_bookings):
+    """Test that the KPI summary is computed with exactly one SQL statement."""
+    from sqlalchemy import event
+    from app.analytics.analytics_service import AnalyticsService
+    
+    # The cache reads the change journal head; only the computation is counted here
+    app.config['ANALYTICS_CACHE_ENABLED'] = False
+    app.config['ANALYTICS_COALESCE_ENABLED'] = False
+    statements = []
+    
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        kpis = AnalyticsService.get_kpi_summary(filters={'status': ['active', 'complete']})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+    
+    assert len(statements) == 1
+    assert kpis['total_bookings'] == kpis['active_bookings'] + kpis['completed_bookings']
+    assert kpis['cancelled_bookings'] == 0
+    assert kpis['total_revenue_with_tax'] == kpis['total_revenue'] + kpis['total_tax']
+
+
+def test_dashboard_matches_individual_sections(app, sample_bookings, monkeypatch):
+    """Test that the shared-base dashboard matches the per-section queries."""
+    from app.analytics.analytics_service import AnalyticsService
+    
+    filters = {'status': ['active'], 'property_type': 'BHK'}
+    dashboard = AnalyticsService.get_dashboard_data(filters=filters)
+    
+    assert dashboard['kpis'] == AnalyticsService.get_kpi_summary(filters=filters)
+    for chart_type in ['monthly_trends', 'project_distribution', 'property_types',
+                       'status_distribution', 'revenue_trends']:
+        assert dashboard['charts'][chart_type] == AnalyticsService.get_chart_data(chart_type, filters=filters)
+    
+    # The per-request base table must not outlive the call
+    temp_tables = db.session.execute(db.text("SELECT name FROM sqlite_temp_master")).all()
+    assert temp_tables == []
+
+    # A failed query is reported as itself, even when the cleanup fails too
+    from sqlalchemy import Table
+    from sqlalchemy.exc import OperationalError
+    from app.analytics import BookingFilter
+
+    with pytest.raises(ZeroDivisionError):
+        with AnalyticsService._materialize(BookingFilter(filters=filters)):
+            1 / 0
+    assert db.session.execute(db.text("SELECT name FROM sqlite_temp_master")).all() == []
+
+    def failing_drop(self, bind, checkfirst=False):
+        raise OperationalError('DROP TABLE', {}, Exception('current transaction is aborted'))
+
+    monkeypatch.setattr(Table, 'drop', failing_drop)
+    with pytest.raises(ZeroDivisionError):
+        with AnalyticsService._materialize(BookingFilter(filters=filters)):
+            1 / 0
+    monkeypatch.undo()
+    db.session.rollback()
+
+
+def test_booking_filter_compiles_to_plain_where(app, sample_bookings):
+    """Test that filter specs apply directly as WHERE clauses without an id semi-join."""
+    from sqlalchemy import select, func
+    from app.analytics import BookingFilter
+    
+    spec = BookingFilter(filters={'status': ['active'], 'project_name': 'sunrise'})
+    statement = select(Booking.project_name, func.count(Booking.id)).where(
+        *spec.clauses()
+    ).group_by(Booking.project_name)
+    
+    compiled = str(statement.compile())
+    assert 'IN (SELECT' not in compiled.upper()
+    expected = Booking.query.filter(
+        Booking.status == 'active',
+        Booking.project_name.ilike('%sunrise%')
+    ).count()
+    assert db.session.execute(statement).all() == [('Sunrise Apartments', expected)]
+    
+    # Derived specs leave the original untouched
+    assert spec.without('status').filters == {'project_name': 'sunrise'}
+    assert spec.with_default_window().start_date is not None
+    assert spec.start_date is None
+
+
+def test_analytics_cache_hits_and_invalidation(app, client, auth_headers, sample_bookings):
+    """Test that analytics results are cached until a booking write commits."""
+    from app.analytics.cache import get_cache
+    
+    cache = get_cache()
+    cache.clear()
+    
+    first = client.get('/api/analytics/kpis?status=active', headers=auth_headers)
+    second = client.get('/api/analytics/kpis?status=active', headers=auth_headers)
+    assert first.status_code == second.status_code == 200
+    assert json.loads(first.data) == json.loads(second.data)
+    
+    stats = json.loads(client.get('/api/analytics/cache/stats', headers=auth_headers).data)['stats']
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    
+    # A committed booking write must invalidate the cached KPIs
+    booking_data = {
+        'customer_name': 'Cache Buster',
+        'contact_number': '9876543299',
+        'project_name': 'Sunrise Apartments',
+        'type': '2BHK',
+        'area': 1000.0,
+        'agreement_cost': 4000000.0,
+        'amount': 3900000.0,
+        'status': 'active',
+        'timeline': (datetime.utcnow() + timedelta(days=30)).isoformat()
+    }
+    response = client.post('/api/bookings/', json=booking_data, headers=auth_headers)
+    assert response.status_code == 201
+    
+    third = client.get('/api/analytics/kpis?status=active', headers=auth_headers)
+    before = json.loads(first.data)['kpis']
+    after = json.loads(third.data)['kpis']
+    assert after['total_bookings'] == before['total_bookings'] + 1
+    
+    stats = json.loads(client.get('/api/analytics/cache/stats', headers=auth_headers).data)['stats']
+    assert stats['invalidations'] == 1
+
+
+def test_analytics_cache_sees_other_process_writes(app, client, auth_headers, sample_bookings):
+    """Test that a write this process never saw commit still invalidates cached results."""
+    from app.models import BookingCounter, BookingDailyRollup, booking_generation
+
+    before = json.loads(client.get('/api/analytics/kpis', headers=auth_headers).data)['kpis']
+    local = booking_generation.value
+
+    # Another worker's insert, with the summaries it maintains, reaches this process only through the database
+    booking = Booking.query.first()
+    row = {column.name: getattr(booking, column.name) for column in Booking.__table__.columns if column.name != 'id'}
+    db.session.execute(Booking.__table__.insert(), [dict(row, customer_name='Other Worker')])
+    BookingDailyRollup.rebuild()
+    BookingCounter.rebuild()
+    db.session.commit()
+    db.session.remove()
+    assert booking_generation.value == local
+
+    after = json.loads(client.get('/api/analytics/kpis', headers=auth_headers).data)['kpis']
+    assert after['total_bookings'] == before['total_bookings'] + 1
+
+
+def test_analytics_cache_lru_eviction():
+    """Test that the cache evicts least recently used entries beyond its bounds."""
+    from app.analytics.cache import AnalyticsCache
+    
+    cache = AnalyticsCache(max_entries=2)
+    cache.put('a', 0, {'value': 1})
+    cache.put('b', 0, {'value': 2})
+    assert cache.get('a', 0) == (True, {'value': 1})
+    
+    cache.put('c', 0, {'value': 3})
+    assert cache.get('b', 0) == (False, None)
+    assert cache.get('a', 0)[0] and cache.get('c', 0)[0]
+    assert cache.stats()['evictions'] == 1
+    
+    # Entries from an older write generation are never served
+    assert cache.get('a', 1) == (False, None)
+    
+    tiny = AnalyticsCache(max_bytes=1)
+    tiny.put('a', 0, {'value': 1})
+    assert tiny.stats()['entries'] == 0
+
+
+def test_analytics_not_modified_skips_queries(app, client, auth_headers, sample_bookings):
+    """Test that a matching If-None-Match is answered without running analytics queries."""
+    from sqlalchemy import event
+    
+    app.config['ANALYTICS_CACHE_ENABLED'] = False
+    response = client.get('/api/analytics/dashboard?status=active', headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    
+    statements = []
+    
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', record_statement)
+    try:
+        response = client.get('/api/analytics/dashboard?status=active',
+                              headers={**auth_headers, 'If-None-Match': etag})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record_statement)
+    
+    assert response.status_code == 304
+    assert not [s for s in statements if 'bookings' in s]
+    assert len([s for s in statements if 'booking_changes' in s]) == 1
+
+
+def test_analytics_export_streams_csv(client, auth_headers, sample_bookings):
+    """Test that CSV export streams a real CSV document."""
+    import csv
+    import io
+    
+    response = client.get('/api/analytics/export?type=projects&format=csv', headers=auth_headers)
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert response.is_streamed
+    assert 'attachment' in response.headers['Content-Disposition']
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0][:3] == ['project_name', 'booking_count', 'total_revenue']
+    assert sum(int(row[1]) for row in rows[1:]) == Booking.query.count()
+
+
+def test_analytics_export_streams_bookings_ndjson(client, auth_headers, sample_bookings):
+    """Test that raw bookings stream as newline-delimited JSON."""
+    response = client.get('/api/analytics/export?type=bookings&format=ndjson&status=active',
+                          headers=auth_headers)
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(records) == Booking.query.filter_by(status='active').count()
+    assert [record['id'] for record in records] == sorted(record['id'] for record in records)
+    assert isinstance(records[0]['amount'], float)
+    
+    response = client.get('/api/analytics/export?type=bookings&format=json', headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_created_period_columns(app, sample_bookings):
+    """Test that persisted calendar buckets follow created_at and are backfilled on upgrade."""
+    from app.analytics.analytics_service import AnalyticsService
+    from app.database import upgrade_booking_schema
+    
+    booking = Booking.query.first()
+    booking.created_at = datetime(2024, 11, 30, 23, 59)
+    db.session.commit()
+    assert (booking.created_year, booking.created_month, booking.created_quarter) == (2024, 11, 4)
+    
+    # Recreate a database from before the columns existed
+    for name in ('created_year', 'created_month', 'created_quarter'):
+        db.session.execute(db.text(f'ALTER TABLE bookings DROP COLUMN {name}'))
+    db.session.commit()
+    
+    assert upgrade_booking_schema() == Booking.query.count()
+    db.session.expire_all()
+    
+    for row in Booking.query.all():
+        assert row.created_year == row.created_at.year
+        assert row.created_month == row.created_at.month
+        assert row.created_quarter == (row.created_at.month - 1) // 3 + 1
+    
+    trends = AnalyticsService.get_revenue_trends(datetime(2024, 1, 1), datetime(2024, 12, 31), group_by='quarter')
+    assert [trend['period'] for trend in trends] == ['2024-Q4']
+
+
+def test_created_period_expressions_are_integers(app):
+    """Test that SQL calendar buckets match created_period and divide integers on PostgreSQL."""
+    from sqlalchemy import literal, select
+    from sqlalchemy.dialects import postgresql
+    from app.analytics import BookingFilter
+    from app.analytics.sources import rollup_relation
+    from app.models.booking import created_period, created_period_expressions
+
+    for month in range(1, 13):
+        created_at = datetime(2024, month, 15, 12, 0)
+        row = db.session.execute(select(*created_period_expressions(literal(created_at)))).one()
+        assert tuple(row) == created_period(created_at)
+
+    # EXTRACT is numeric on PostgreSQL, so the month must be an integer before it is divided
+    compiled = str(rollup_relation(BookingFilter()).compile(dialect=postgresql.dialect()))
+    assert 'CAST((CAST(EXTRACT(month FROM booking_daily_rollup.day) AS INTEGER) + ' in compiled
+    assert 'booking_daily_rollup.day) + ' not in compiled
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent calls for one key share a single execution, its result and its error."""
+    import threading
+    from app.analytics.coalesce import SingleFlight
+    
+    flights = SingleFlight(timeout=5)
+    release = threading.Event()
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {'total': 42}
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do('kpis', compute)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while flights.stats()['coalesced'] < 4:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    
+    assert len(calls) == 1
+    assert results == [{'total': 42}] * 5
+    stats = flights.stats()
+    assert stats['in_flight'] == 0
+    assert stats['keys'] == [{'key': 'kpis', 'executions': 1, 'coalesced': 4, 'timeouts': 0}]
+    
+    # The key is free once the flight lands, and failures propagate
+    with pytest.raises(ValueError):
+        flights.do('kpis', lambda: (_ for _ in ()).throw(ValueError('boom')))
+    assert flights.do('kpis', lambda: 'again') == 'again'
+    assert flights.stats()['executions'] == 3
+
+
+def test_analytics_coalescing_stats(app, client, auth_headers, sample_bookings):
+    """Test that analytics queries run through the single-flight group and report per-key counters."""
+    app.config['ANALYTICS_CACHE_ENABLED'] = False
+    
+    for _ in range(2):
+        response = client.get('/api/analytics/kpis?start_date=2024-01-01T00:00:00&status=active',
+                              headers=auth_headers)
+        assert response.status_code == 200
+    
+    data = json.loads(client.get('/api/analytics/cache/stats', headers=auth_headers).data)
+    assert data['stats'] is None
+    keys = {entry['key']: entry for entry in data['coalescing']['keys']}
+    assert keys['get_kpi_summary 2024-01-01 00:00:00.. status=active']['executions'] == 2
+    assert data['coalescing']['in_flight'] == 0
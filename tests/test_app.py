@@ -42,4 +42,28 @@ def test_cors_configuration(app):
 def test_json_configuration(app):
     """Test JSON handling configuration."""
     assert app.config['JSON_SORT_KEYS'] is False
-    assert app.json.ensure_ascii is False
\ No newline at end of file
+    assert app.json.ensure_ascii is False
+
+@pytest.mark.parametrize('fast', [True, False])
+def test_json_provider_encodes_model_values(app, monkeypatch, fast):
+    """Test that Decimals and datetimes serialize the same with and without orjson."""
+    from datetime import datetime
+    from decimal import Decimal
+    from app import serialization
+    if fast and serialization.orjson is None:
+        pytest.skip('orjson is not installed')
+    if not fast:
+        monkeypatch.setattr(serialization, 'orjson', None)
+    
+    payload = {'amount': Decimal('3900000.00'), 'created_at': datetime(2024, 5, 1, 9, 30, 15, 250000),
+               'name': 'Ramé', 'b': 1, 'a': None}
+    with app.test_request_context():
+        response = app.json.response(payload)
+    
+    assert response.mimetype == 'application/json'
+    assert response.get_data(as_text=True).endswith('\n')
+    assert 'Ramé' in response.get_data(as_text=True)
+    assert list(app.json.loads(response.get_data())) == ['amount', 'created_at', 'name', 'b', 'a']
+    assert app.json.loads(app.json.dumps(payload)) == {
+        'amount': 3900000.0, 'created_at': '2024-05-01T09:30:15.250000', 'name': 'Ramé', 'b': 1, 'a': None
+    }
@@ -131,4 +131,574 @@ def test_create_booking_validation(client, auth_headers):
     
     assert response.status_code == 400
     data = json.loads(response.data)
-    assert 'Invalid timeline format' in data['error']
\ No newline at end of file
+    assert 'Invalid timeline format' in data['error']
+
+def test_bookings_etag_revalidation(client, auth_headers):
+    """Test conditional GET on the bookings list."""
+    response = client.get('/api/bookings/?per_page=5', headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    
+    # Unchanged data answers with 304 and no body
+    response = client.get('/api/bookings/?per_page=5',
+                          headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    
+    # Different arguments produce a different tag
+    response = client.get('/api/bookings/?per_page=10', headers=auth_headers)
+    assert response.headers['ETag'] != etag
+    
+    # Tags are per user and kept out of shared caches
+    assert 'private' in response.headers['Cache-Control']
+    assert 'Authorization' in response.headers['Vary']
+    login = client.post('/api/auth/demo-login', json={'role': 'sales'})
+    sales_headers = {'Authorization': f"Bearer {json.loads(login.data)['data']['token']}"}
+    response = client.get('/api/bookings/?per_page=5',
+                          headers={**sales_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    
+    # A write changes the tag
+    client.delete('/api/bookings/1', headers=auth_headers)
+    response = client.get('/api/bookings/?per_page=5',
+                          headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    
+    # So does a write from elsewhere that keeps the row count and latest updated_at
+    etag = response.headers['ETag']
+    table = Booking.__table__
+    db.session.execute(table.update().where(table.c.id == 2).values(
+        invoice_status='Paid', updated_at=table.c.updated_at
+    ))
+    db.session.commit()
+    response = client.get('/api/bookings/?per_page=5',
+                          headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+
+
+def test_bookings_keyset_pagination(app, client, auth_headers):
+    """Test walking bookings forwards and backwards with cursors."""
+    # Shared timestamps force ties on the sort key
+    admin = User.query.filter_by(username='admin').first()
+    stamp = datetime(2025, 6, 1, 12, 0)
+    for index in range(12):
+        db.session.add(Booking(
+            customer_name=f'Keyset {index}', contact_number='9876543210',
+            project_name='Keyset Towers', type='2BHK', area=1000.0,
+            agreement_cost=5000000, amount=4000000 + (index % 3) * 100000.5, tax_gst=0,
+            timeline=stamp, created_at=stamp + timedelta(hours=index // 4), created_by=admin.id
+        ))
+    db.session.commit()
+    
+    for sort_by, sort_order in [('created_at', 'desc'), ('amount', 'asc'), ('customer_name', 'desc')]:
+        column = getattr(Booking, sort_by)
+        order = (column.desc(), Booking.id.desc()) if sort_order == 'desc' else (column.asc(), Booking.id.asc())
+        expected = [booking.id for booking in Booking.query.order_by(*order).all()]
+        
+        pages = []
+        cursor = ''
+        while cursor is not None:
+            response = client.get('/api/bookings/', headers=auth_headers, query_string={
+                'cursor': cursor, 'per_page': 5, 'sort_by': sort_by, 'sort_order': sort_order
+            })
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert 'total' not in data['pagination']
+            pages.append(data)
+            cursor = data['pagination']['next_cursor']
+        
+        assert [item['id'] for page in pages for item in page['bookings']] == expected
+        assert pages[0]['pagination']['prev_cursor'] is None
+        
+        # Walking back from the last page revisits the same pages
+        prev_cursor = pages[-1]['pagination']['prev_cursor']
+        for page in reversed(pages[:-1]):
+            response = client.get('/api/bookings/', headers=auth_headers, query_string={
+                'cursor': prev_cursor, 'per_page': 5, 'sort_by': sort_by, 'sort_order': sort_order
+            })
+            data = json.loads(response.data)
+            assert data['bookings'] == page['bookings']
+            prev_cursor = data['pagination']['prev_cursor']
+        assert prev_cursor is None
+    
+    response = client.get('/api/bookings/?cursor=not-a-cursor', headers=auth_headers)
+    assert response.status_code == 400
+    response = client.get('/api/bookings/', headers=auth_headers,
+                          query_string={'cursor': pages[0]['pagination']['next_cursor'], 'sort_by': 'amount'})
+    assert response.status_code == 400
+
+
+def test_full_text_search(app, client, auth_headers):
+    """Test ranked prefix search, highlighting and index maintenance on writes."""
+    admin = User.query.filter_by(username='admin').first()
+    stamp = datetime(2025, 6, 1, 12, 0)
+    for customer, project in [('Harini Sunder', 'Sunder Nagar Sunder Heights'),
+                              ('Sundaram Iyer', 'Lake Shore'),
+                              ('Farah Khan', 'Sunder Nagar'),
+                              ('<img src=x onerror=alert(1)>', 'Xss & Sons')]:
+        db.session.add(Booking(
+            customer_name=customer, contact_number='9876543210', project_name=project,
+            type='3BHK', area=1400.0, agreement_cost=6000000, amount=5500000, tax_gst=0,
+            timeline=stamp, created_by=admin.id
+        ))
+    db.session.commit()
+    
+    # Every word must match as a prefix; denser matches rank first
+    response = client.get('/api/bookings/search?q=sunde&highlight=true', headers=auth_headers)
+    assert response.status_code == 200
+    results = json.loads(response.data)['results']
+    assert [result['customer_name'] for result in results] == ['Harini Sunder', 'Farah Khan']
+    assert results[0]['highlights']['project_name'] == '<mark>Sunder</mark> Nagar <mark>Sunder</mark> Heights'
+    
+    # Column text is HTML-escaped around the markers
+    response = client.get('/api/bookings/search?q=onerror&highlight=true', headers=auth_headers)
+    highlights = json.loads(response.data)['results'][0]['highlights']
+    assert highlights['customer_name'] == '&lt;img src=x <mark>onerror</mark>=alert(1)&gt;'
+    assert highlights['project_name'] == 'Xss &amp; Sons'
+    
+    response = client.get('/api/bookings/search?q=sund iyer', headers=auth_headers)
+    results = json.loads(response.data)['results']
+    assert [result['customer_name'] for result in results] == ['Sundaram Iyer']
+    assert 'highlights' not in results[0]
+    
+    # The list endpoint's search parameter uses the same index
+    response = client.get('/api/bookings/?search=sunder nagar', headers=auth_headers)
+    names = {booking['customer_name'] for booking in json.loads(response.data)['bookings']}
+    assert names == {'Harini Sunder', 'Farah Khan'}
+    
+    # Updates and deletes are reflected immediately
+    farah = Booking.query.filter_by(customer_name='Farah Khan').first()
+    farah.project_name = 'Lake Shore'
+    db.session.delete(Booking.query.filter_by(customer_name='Sundaram Iyer').first())
+    db.session.commit()
+    response = client.get('/api/bookings/search?q=lake', headers=auth_headers)
+    assert [result['customer_name'] for result in json.loads(response.data)['results']] == ['Farah Khan']
+    response = client.get('/api/bookings/search?q=nagar', headers=auth_headers)
+    assert [result['customer_name'] for result in json.loads(response.data)['results']] == ['Harini Sunder']
+    
+    # Text without words falls back to a substring scan
+    response = client.get('/api/bookings/search?q=%25%25', headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_bookings_include_total(app, client, auth_headers):
+    """Test exact, estimated and skipped totals on the booking list."""
+    def pagination(**params):
+        response = client.get('/api/bookings/', headers=auth_headers, query_string=params)
+        assert response.status_code == 200
+        return json.loads(response.data)['pagination']
+    
+    total = Booking.query.count()
+    assert pagination(per_page=3)['total'] == total
+    
+    # No count: has_next comes from the extra row
+    info = pagination(per_page=3, include_total='none')
+    assert info['total'] is None and info['pages'] is None
+    assert info['has_next'] is True and info['has_prev'] is False
+    last_page = (total + 2) // 3
+    info = pagination(per_page=3, page=last_page, include_total='none', status='active')
+    assert info['has_prev'] is True
+    assert pagination(per_page=3, page=last_page, include_total='none')['has_next'] is False
+    
+    # Filtered estimates are cached per filter signature and survive writes until the TTL
+    active = Booking.query.filter_by(status='active').count()
+    info = pagination(per_page=1, include_total='estimate', status='active')
+    assert info['total'] == active and info['total_estimated'] is True
+    booking = Booking.query.filter_by(status='active').first()
+    booking.status = 'complete'
+    db.session.commit()
+    assert pagination(per_page=1, include_total='estimate', status='active')['total'] == active
+    app.extensions['booking_count_cache'].clear()
+    assert pagination(per_page=1, include_total='estimate', status='active')['total'] == active - 1
+    
+    # Unfiltered estimates come from planner statistics once the table is analyzed
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+    admin = User.query.filter_by(username='admin').first()
+    db.session.add(Booking(
+        customer_name='Unanalyzed', contact_number='9876543210', project_name='Stats Park',
+        type='2BHK', area=900.0, agreement_cost=3000000, amount=2500000, tax_gst=0,
+        timeline=datetime.utcnow(), created_by=admin.id
+    ))
+    db.session.commit()
+    info = pagination(per_page=1, include_total='estimate')
+    assert info['total'] == total and info['pages'] == total
+    
+    # A page past the end does not inflate the estimate
+    info = pagination(per_page=1, page=total + 10, include_total='estimate')
+    assert info['total'] == total and info['total_estimated'] is True and info['has_next'] is False
+    
+    # Cursor listings count only on request
+    assert 'total' not in pagination(cursor='', per_page=2)
+    assert pagination(cursor='', per_page=2, include_total='exact')['total'] == total + 1
+    
+    response = client.get('/api/bookings/?include_total=sometimes', headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_bookings_sparse_fieldsets(client, auth_headers):
+    """Test that fields= returns the requested subset of to_dict for every read endpoint."""
+    fields = ['customer_name', 'amount', 'created_at', 'total_amount']
+    full = {booking.id: booking.to_dict() for booking in Booking.query.all()}
+    # Rows are JSON-native for callers serializing them without the app's provider
+    assert all(json.loads(json.dumps(row)) == row for row in full.values())
+    
+    def assert_subset(item):
+        assert set(item) == {'id', *fields}
+        assert item == {key: full[item['id']][key] for key in item}
+    
+    for params in [{}, {'cursor': '', 'sort_by': 'amount'}, {'include_total': 'none', 'sort_by': 'timeline'}]:
+        response = client.get('/api/bookings/', headers=auth_headers,
+                              query_string=dict(params, fields=','.join(reversed(fields)), per_page=4))
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert len(data['bookings']) == 4
+        for item in data['bookings']:
+            assert_subset(item)
+    
+    # Cursors issued for projected pages keep working
+    response = client.get('/api/bookings/', headers=auth_headers, query_string={
+        'cursor': '', 'per_page': 3, 'fields': 'status'
+    })
+    first = json.loads(response.data)
+    response = client.get('/api/bookings/', headers=auth_headers, query_string={
+        'cursor': first['pagination']['next_cursor'], 'per_page': 3, 'fields': 'status'
+    })
+    second = json.loads(response.data)
+    assert not {item['id'] for item in first['bookings']} & {item['id'] for item in second['bookings']}
+    
+    booking_id = next(iter(full))
+    response = client.get(f'/api/bookings/{booking_id}?fields={",".join(fields)}', headers=auth_headers)
+    assert_subset(json.loads(response.data)['booking'])
+    response = client.get('/api/bookings/999999?fields=amount', headers=auth_headers)
+    assert response.status_code == 404
+    
+    response = client.get(f'/api/bookings/search?q=green&highlight=true&fields={",".join(fields)}',
+                          headers=auth_headers)
+    results = json.loads(response.data)['results']
+    assert results
+    for result in results:
+        highlights = result.pop('highlights')
+        assert '<mark>' in highlights['project_name']
+        assert_subset(result)
+    
+    response = client.get('/api/bookings/?fields=amount,password', headers=auth_headers)
+    assert response.status_code == 400
+    assert 'password' in json.loads(response.data)['error']
+
+
+def _bulk_booking(index, **overrides):
+    """Build one valid bulk booking payload."""
+    booking = {
+        'customer_name': f'Bulk Customer {index}',
+        'contact_number': '9876543210',
+        'project_name': 'Bulk Residency',
+        'type': '2BHK',
+        'area': 950.0 + index,
+        'agreement_cost': 4000000.0,
+        'amount': 3800000.0 + index,
+        'tax_gst': 190000.0,
+        'timeline': (datetime.utcnow() + timedelta(days=60)).isoformat()
+    }
+    booking.update(overrides)
+    return booking
+
+
+def test_bulk_create_bookings(app, client, auth_headers):
+    """Test bulk creation with per-row results, NDJSON bodies, atomic mode and the size limit."""
+    before = Booking.query.count()
+    payload = [
+        _bulk_booking(0),
+        _bulk_booking(1, area=0),
+        _bulk_booking(2, loan_req='maybe', tax_gst=-1),
+        _bulk_booking(3, status='complete'),
+        'not a booking'
+    ]
+    response = client.post('/api/bookings/bulk', json=payload, headers=auth_headers)
+    assert response.status_code == 207
+    data = json.loads(response.data)
+    assert (data['created'], data['failed']) == (2, 3)
+    assert [result['status'] for result in data['results']] == ['created', 'invalid', 'invalid', 'created', 'invalid']
+    assert data['results'][1]['errors'] == ['Missing required fields: area']
+    assert len(data['results'][2]['errors']) == 2
+    
+    created = Booking.query.get(data['results'][3]['id'])
+    assert created.customer_name == 'Bulk Customer 3'
+    assert created.status == 'complete'
+    assert created.created_year == created.created_at.year
+    
+    # Atomic mode writes nothing when any row is invalid
+    response = client.post('/api/bookings/bulk?atomic=true', json=[_bulk_booking(4), _bulk_booking(5, amount=-5)],
+                           headers=auth_headers)
+    assert response.status_code == 400
+    assert [result['status'] for result in json.loads(response.data)['results']] == ['valid', 'invalid']
+    assert Booking.query.count() == before + 2
+    
+    body = '\n'.join(json.dumps(_bulk_booking(index)) for index in range(6, 9)) + '\n{broken\n'
+    response = client.post('/api/bookings/bulk?atomic=false', data=body,
+                           headers=dict(auth_headers, **{'Content-Type': 'application/x-ndjson'}))
+    assert response.status_code == 207
+    assert json.loads(response.data)['results'][3] == {'index': 3, 'status': 'invalid',
+                                                       'errors': ['Booking must be a JSON object']}
+    assert Booking.query.count() == before + 5
+    
+    # New bookings are immediately searchable and listed
+    response = client.get('/api/bookings/search?q=bulk customer 7', headers=auth_headers)
+    assert [result['customer_name'] for result in json.loads(response.data)['results']] == ['Bulk Customer 7']
+    
+    app.config['BOOKING_BULK_MAX_ROWS'] = 2
+    response = client.post('/api/bookings/bulk', json=[_bulk_booking(index) for index in range(3)],
+                           headers=auth_headers)
+    assert response.status_code == 413
+    response = client.post('/api/bookings/bulk', json={'customer_name': 'x'}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_bulk_update_and_delete_bookings(client, auth_headers):
+    """Test set-based status updates and admin-only bulk hard deletes."""
+    project = Booking.query.first().project_name
+    in_project = Booking.query.filter_by(project_name=project).all()
+    already_cancelled = in_project[0]
+    already_cancelled.status = 'cancelled'
+    db.session.commit()
+    untouched_stamp = Booking.query.get(already_cancelled.id).updated_at
+    
+    response = client.patch('/api/bookings/bulk', headers=auth_headers, json={
+        'filter': {'project_name': project}, 'set': {'status': 'cancelled'}
+    })
+    assert response.status_code == 200
+    assert json.loads(response.data)['updated'] == len(in_project) - 1
+    assert Booking.query.filter_by(project_name=project, status='cancelled').count() == len(in_project)
+    assert Booking.query.get(already_cancelled.id).updated_at == untouched_stamp
+    
+    # ids and filter combine with AND
+    ids = [booking.id for booking in Booking.query.order_by(Booking.id).limit(4)]
+    response = client.patch('/api/bookings/bulk', headers=auth_headers, json={
+        'ids': ids, 'filter': {'status': 'active'}, 'set': {'invoice_status': 'paid', 'loan_req': 'yes'}
+    })
+    expected = Booking.query.filter(Booking.id.in_(ids), Booking.status == 'active').count()
+    assert json.loads(response.data)['updated'] == expected
+    assert Booking.query.filter(Booking.invoice_status == 'paid', Booking.loan_req == 'yes').count() == expected
+    
+    for body in [{'set': {'status': 'complete'}},
+                 {'filter': {}, 'set': {'status': 'complete'}},
+                 {'filter': {'status': 'activ'}, 'set': {'status': 'complete'}},
+                 {'filter': {'colour': 'blue'}, 'set': {'status': 'complete'}},
+                 {'ids': [1], 'set': {'status': 'archived'}},
+                 {'ids': [1], 'set': {'amount': 5}},
+                 {'ids': 'all', 'set': {'status': 'complete'}}]:
+        response = client.patch('/api/bookings/bulk', headers=auth_headers, json=body)
+        assert response.status_code == 400, body
+    
+    # Hard delete is admin only
+    response = client.post('/api/auth/demo-login', json={'role': 'sales'})
+    sales_headers = {'Authorization': f"Bearer {json.loads(response.data)['data']['token']}"}
+    response = client.delete('/api/bookings/bulk/hard-delete', headers=sales_headers,
+                             json={'filter': {'project_name': project}})
+    assert response.status_code == 403
+    
+    total = Booking.query.count()
+    response = client.delete('/api/bookings/bulk/hard-delete', headers=auth_headers,
+                             json={'filter': {'project_name': project, 'status': 'cancelled'}})
+    assert response.status_code == 200
+    assert json.loads(response.data)['deleted'] == len(in_project)
+    assert Booking.query.count() == total - len(in_project)
+
+
+def test_export_bookings(client, auth_headers):
+    """Test streaming exports that follow the list endpoint's filters, sort and fields."""
+    import csv
+    import io
+    
+    params = {'status': 'active', 'sort_by': 'amount', 'sort_order': 'asc', 'per_page': 100}
+    listed = json.loads(client.get('/api/bookings/', headers=auth_headers, query_string=params).data)['bookings']
+    
+    response = client.get('/api/bookings/export', headers=auth_headers, query_string=dict(params, format='csv'))
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'attachment; filename="bookings_export_' in response.headers['Content-Disposition']
+    exported = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [int(row['id']) for row in exported] == [booking['id'] for booking in listed]
+    assert exported[0]['customer_name'] == listed[0]['customer_name']
+    assert float(exported[0]['total_amount']) == listed[0]['total_amount']
+    
+    response = client.get('/api/bookings/export?format=ndjson&fields=amount,created_at&search=green',
+                          headers=auth_headers)
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    expected = Booking.query.filter(Booking.project_name.ilike('green%')).order_by(
+        Booking.created_at.desc(), Booking.id.desc()
+    ).all()
+    assert lines == [{'id': booking.id, 'amount': float(booking.amount),
+                      'created_at': booking.created_at.isoformat()} for booking in expected]
+    
+    assert client.get('/api/bookings/export?format=xml', headers=auth_headers).status_code == 400
+    assert client.get('/api/bookings/export?fields=secret', headers=auth_headers).status_code == 400
+    assert client.get('/api/bookings/export?start_date=yesterday', headers=auth_headers).status_code == 400
+
+
+def test_booking_query_indexes(app, client, auth_headers):
+    """Test that upgrades install the query indexes and hot queries seek them."""
+    from sqlalchemy import inspect
+    from app.database import upgrade_booking_schema
+    
+    # Recreate a database from before the composite indexes existed, with indexes since retired
+    db.session.execute(db.text('DROP INDEX ix_bookings_status_created'))
+    db.session.execute(db.text('CREATE INDEX ix_bookings_project_name ON bookings (project_name)'))
+    db.session.execute(db.text(
+        "CREATE INDEX ix_bookings_live_created ON bookings (created_at, amount) WHERE status != 'cancelled'"
+    ))
+    db.session.commit()
+    
+    upgrade_booking_schema()
+    indexes = {index['name'] for index in inspect(db.engine).get_indexes('bookings')}
+    assert 'ix_bookings_status_created' in indexes
+    assert not {'ix_bookings_project_name', 'ix_bookings_live_created'} & indexes
+    
+    def plan(sql):
+        rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).all()
+        return ' '.join(row[3] for row in rows)
+    
+    assert 'ix_bookings_status_created' in plan(
+        "SELECT id FROM bookings WHERE status = 'active' ORDER BY created_at DESC LIMIT 50"
+    )
+    assert 'ix_bookings_created_at' in plan(
+        "SELECT id FROM bookings ORDER BY created_at DESC LIMIT 50"
+    )
+    
+    # Revenue still excludes cancelled bookings
+    live = Booking.query.filter(Booking.status != 'cancelled').all()
+    data = client.get('/api/bookings/stats', headers=auth_headers).get_json()
+    assert data['total_revenue'] == pytest.approx(sum(float(booking.amount) for booking in live))
+
+
+def test_booking_change_feed(client, auth_headers):
+    """Test snapshots, incremental changes with tombstones, and token validation."""
+    # A snapshot paged through small limits covers every booking once
+    seen = {}
+    token = None
+    while True:
+        url = '/api/bookings/changes?limit=3' + (f'&since={token}' if token else '')
+        data = json.loads(client.get(url, headers=auth_headers).data)
+        seen.update((booking['id'], booking) for booking in data['bookings'])
+        assert data['deleted'] == []
+        token = data['next_token']
+        if not data['has_more']:
+            break
+    assert sorted(seen) == sorted(booking.id for booking in Booking.query.all())
+    
+    response = client.get(f'/api/bookings/changes?since={token}', headers=auth_headers)
+    data = json.loads(response.data)
+    assert (data['bookings'], data['deleted'], data['next_token']) == ([], [], token)
+    
+    # Clients showing a page of bookings start following from the latest change
+    data = json.loads(client.get('/api/bookings/changes?since=now', headers=auth_headers).data)
+    assert (data['bookings'], data['deleted'], data['next_token'], data['has_more']) == ([], [], token, False)
+    
+    # Single-row and bulk writes all appear, each booking once in its latest state
+    created = json.loads(client.post('/api/bookings/bulk', headers=auth_headers,
+                                     json=[_bulk_booking(0), _bulk_booking(1)]).data)
+    new_ids = [result['id'] for result in created['results']]
+    first, second = sorted(seen)[:2]
+    client.put(f'/api/bookings/{first}', json={'customer_name': 'Renamed Buyer'}, headers=auth_headers)
+    client.patch('/api/bookings/bulk', headers=auth_headers,
+                 json={'ids': [new_ids[0]], 'set': {'invoice_status': 'paid'}})
+    client.delete(f'/api/bookings/{second}/hard-delete', headers=auth_headers)
+    
+    data = json.loads(client.get(f'/api/bookings/changes?since={token}', headers=auth_headers).data)
+    changed = {booking['id']: booking for booking in data['bookings']}
+    assert sorted(changed) == sorted(new_ids + [first])
+    assert changed[first]['customer_name'] == 'Renamed Buyer'
+    assert changed[new_ids[0]]['invoice_status'] == 'paid'
+    assert data['deleted'] == [second]
+    
+    # Tokens from another journal are refused so the client resynchronizes
+    from app.booking.changes import encode_change_token
+    response = client.get(f"/api/bookings/changes?since={encode_change_token('other', (0, 5))}",
+                          headers=auth_headers)
+    assert response.status_code == 410
+    response = client.get('/api/bookings/changes?since=garbage', headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_idempotency_keys(app, client, auth_headers):
+    """Test that repeated Idempotency-Keys replay the stored response without writing bookings."""
+    from sqlalchemy import event
+    from app.models import IdempotencyKey
+    
+    headers = dict(auth_headers, **{'Idempotency-Key': 'create-1'})
+    payload = _bulk_booking(0, customer_name='Retry Buyer')
+    before = Booking.query.count()
+    
+    first = client.post('/api/bookings/', json=payload, headers=headers)
+    assert first.status_code == 201
+    assert 'Idempotent-Replayed' not in first.headers
+    
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        retry = client.post('/api/bookings/', json=payload, headers=headers)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    assert retry.status_code == 201
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert json.loads(retry.data) == json.loads(first.data)
+    assert not [statement for statement in statements if 'bookings' in statement]
+    assert Booking.query.count() == before + 1
+    
+    # The same key with another body is refused
+    response = client.post('/api/bookings/', json=dict(payload, amount=1.0), headers=headers)
+    assert response.status_code == 422
+    
+    # Client errors are replayed too; keys are scoped per user
+    invalid = dict(auth_headers, **{'Idempotency-Key': 'create-2'})
+    assert client.post('/api/bookings/', json={'customer_name': 'x'}, headers=invalid).status_code == 400
+    replayed = client.post('/api/bookings/', json={'customer_name': 'x'}, headers=invalid)
+    assert replayed.status_code == 400
+    assert replayed.headers['Idempotent-Replayed'] == 'true'
+    
+    response = client.post('/api/auth/demo-login', json={'role': 'sales'})
+    sales_headers = {'Authorization': f"Bearer {json.loads(response.data)['data']['token']}",
+                     'Idempotency-Key': 'create-1'}
+    assert client.post('/api/bookings/', json=payload, headers=sales_headers).headers.get('Idempotent-Replayed') is None
+    assert Booking.query.count() == before + 2
+    
+    # Bulk writes and updates are covered as well
+    bulk_headers = dict(auth_headers, **{'Idempotency-Key': 'bulk-1'})
+    body = [_bulk_booking(1), _bulk_booking(2)]
+    assert client.post('/api/bookings/bulk', json=body, headers=bulk_headers).status_code == 201
+    assert client.post('/api/bookings/bulk', json=body, headers=bulk_headers).headers['Idempotent-Replayed'] == 'true'
+    assert Booking.query.count() == before + 4
+    
+    booking_id = json.loads(first.data)['booking']['id']
+    update_headers = dict(auth_headers, **{'Idempotency-Key': 'update-1'})
+    for _ in range(2):
+        response = client.put(f'/api/bookings/{booking_id}', json={'invoice_status': 'paid'}, headers=update_headers)
+        assert response.status_code == 200
+    assert response.headers['Idempotent-Replayed'] == 'true'
+    
+    # A rejected update saves none of its changes, and its rejection is replayed
+    before_update = client.get(f'/api/bookings/{booking_id}', headers=auth_headers).get_json()['booking']
+    rejected = {'contact_number': '12', 'timeline': (datetime.utcnow() - timedelta(days=400)).isoformat()}
+    rejected_headers = dict(auth_headers, **{'Idempotency-Key': 'update-2'})
+    for _ in range(2):
+        response = client.put(f'/api/bookings/{booking_id}', json=rejected, headers=rejected_headers)
+        assert response.status_code == 400
+    assert response.headers['Idempotent-Replayed'] == 'true'
+    db.session.expire_all()
+    after_update = client.get(f'/api/bookings/{booking_id}', headers=auth_headers).get_json()['booking']
+    assert after_update['contact_number'] == before_update['contact_number']
+    assert after_update['timeline'] == before_update['timeline']
+    
+    # Expired keys are forgotten and the request runs again
+    IdempotencyKey.query.update({'created_at': datetime.utcnow() - timedelta(days=2)})
+    db.session.commit()
+    assert client.post('/api/bookings/', json=payload, headers=headers).headers.get('Idempotent-Replayed') is None
+    assert Booking.query.count() == before + 5
+    
+    long_key = dict(auth_headers, **{'Idempotency-Key': 'k' * 256})
+    assert client.post('/api/bookings/', json=payload, headers=long_key).status_code == 400
@@ -0,0 +1,106 @@
+"""Test streaming CSV import of historical bookings."""
+import pytest
+import io
+import json
+from app import create_app, db
+from app.models import Booking, BookingDailyRollup
+
+HEADER = 'customer_name,contact_number,project_name,type,area,agreement_cost,amount,tax_gst,timeline,status,created_at\n'
+
+
+@pytest.fixture
+def app():
+    """Create test application."""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Get authentication headers for testing."""
+    response = client.post('/api/auth/demo-login', json={'role': 'admin'})
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    token = data['data']['token']
+    
+    return {'Authorization': f'Bearer {token}'}
+
+
+def _csv_row(index, **overrides):
+    """Build one CSV line for a historical booking."""
+    values = {
+        'customer_name': f'Imported {index}', 'contact_number': '9876543210',
+        'project_name': 'Heritage Court', 'type': '3BHK', 'area': '1500',
+        'agreement_cost': '6000000', 'amount': str(5000000 + index), 'tax_gst': '',
+        'timeline': '2021-03-01T00:00:00', 'status': 'complete', 'created_at': '2020-06-15T10:30:00'
+    }
+    values.update(overrides)
+    return ','.join(values[name] for name in HEADER.strip().split(',')) + '\n'
+
+
+def test_import_bookings_csv(client, auth_headers):
+    """Test chunked import with rejections and resuming from the last committed line."""
+    before = Booking.query.count()
+    body = HEADER + ''.join([
+        _csv_row(0),
+        _csv_row(1, area='-5'),
+        _csv_row(2, customer_name='"Rao, Suresh"'),
+        _csv_row(3, timeline='someday'),
+        _csv_row(4),
+        _csv_row(5, status='archived'),
+    ])
+    
+    response = client.post('/api/bookings/import?chunk_size=2', data=body,
+                           headers=dict(auth_headers, **{'Content-Type': 'text/csv'}))
+    assert response.status_code == 200
+    report = json.loads(response.data)['report']
+    assert (report['rows_read'], report['imported'], report['rejected'], report['chunks']) == (6, 3, 3, 2)
+    assert [rejection['line'] for rejection in report['rejections']] == [3, 5, 7]
+    assert report['last_committed_line'] == 7
+    assert report['rows_per_second'] > 0
+    
+    imported = Booking.query.filter_by(customer_name='Rao, Suresh').one()
+    assert imported.created_at.year == 2020 and imported.created_year == 2020
+    assert float(imported.tax_gst) == 0
+    assert Booking.query.count() == before + 3
+    assert db.session.query(db.func.sum(BookingDailyRollup.booking_count)).scalar() == before + 3
+    
+    # Resuming after line 4 only imports the rows that follow it
+    body = HEADER + ''.join(_csv_row(index) for index in range(10, 14))
+    response = client.post('/api/bookings/import?start_line=3', headers=auth_headers,
+                           data={'file': (io.BytesIO(body.encode('utf-8')), 'bookings.csv')})
+    report = json.loads(response.data)['report']
+    assert report['imported'] == 2
+    assert Booking.query.filter(Booking.customer_name.in_(['Imported 12', 'Imported 13'])).count() == 2
+    assert Booking.query.filter_by(customer_name='Imported 11').count() == 0
+    
+    response = client.post('/api/bookings/import', data='name,phone\nA,1\n',
+                           headers=dict(auth_headers, **{'Content-Type': 'text/csv'}))
+    assert response.status_code == 400
+    assert 'customer_name' in json.loads(response.data)['error']
+
+
+def test_import_csv_command(app, tmp_path):
+    """Test the CSV import CLI command and its resume hint."""
+    path = tmp_path / 'bookings.csv'
+    path.write_text(HEADER + _csv_row(0) + _csv_row(1, amount='lots') + _csv_row(2))
+    
+    result = app.test_cli_runner().invoke(args=['booking', 'import-csv', str(path), '--chunk-size', '1'])
+    
+    assert result.exit_code == 0
+    assert 'Line 3: Invalid data type' in result.output
+    assert 'Imported 2 bookings, rejected 1' in result.output
+    assert Booking.query.filter(Booking.customer_name.like('Imported %')).count() == 2
+    
+    result = app.test_cli_runner().invoke(args=['booking', 'import-csv', str(path), '--username', 'nobody'])
+    assert result.exit_code != 0
@@ -0,0 +1,204 @@
+"""Test daily booking rollup maintenance and rollup-backed analytics."""
+import pytest
+import json
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models import Booking, BookingCounter, BookingDailyRollup
+from app.analytics.analytics_service import AnalyticsService
+
+
+@pytest.fixture
+def app():
+    """Create test application."""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Get authentication headers for testing."""
+    response = client.post('/api/auth/demo-login', json={'role': 'admin'})
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    token = data['data']['token']
+    
+    return {'Authorization': f'Bearer {token}'}
+
+
+def _rollup_snapshot():
+    """Return non-empty rollup rows as comparable tuples."""
+    rows = BookingDailyRollup.query.filter(BookingDailyRollup.booking_count != 0).all()
+    return sorted(
+        (row.day, row.project_name, row.type, row.status, row.booking_count,
+         float(row.amount_total), float(row.tax_gst_total), row.area_total)
+        for row in rows
+    )
+
+
+def _assert_rollup_consistent():
+    """Check the incrementally maintained rollup and status counters against full rebuilds."""
+    db.session.expire_all()
+    assert BookingCounter.check() == {}
+    incremental = _rollup_snapshot()
+    BookingDailyRollup.rebuild()
+    db.session.commit()
+    assert incremental == _rollup_snapshot()
+
+
+def test_rollup_tracks_booking_writes(client, auth_headers):
+    """Test that create, update, cancel and hard-delete keep the rollup in sync."""
+    booking_data = {
+        'customer_name': 'John Doe',
+        'contact_number': '9876543210',
+        'project_name': 'Rollup Heights',
+        'type': '2BHK',
+        'area': 1200.5,
+        'agreement_cost': 5000000.0,
+        'amount': 4800000.0,
+        'tax_gst': 240000.0,
+        'timeline': (datetime.utcnow() + timedelta(days=30)).isoformat()
+    }
+    
+    response = client.post('/api/bookings/', json=booking_data, headers=auth_headers)
+    assert response.status_code == 201
+    booking_id = json.loads(response.data)['booking']['id']
+    _assert_rollup_consistent()
+    
+    response = client.put(f'/api/bookings/{booking_id}',
+                          json={'project_name': 'Rollup Towers', 'amount': 4700000.0},
+                          headers=auth_headers)
+    assert response.status_code == 200
+    _assert_rollup_consistent()
+    
+    response = client.delete(f'/api/bookings/{booking_id}', headers=auth_headers)
+    assert response.status_code == 200
+    _assert_rollup_consistent()
+    
+    response = client.delete(f'/api/bookings/{booking_id}/hard-delete', headers=auth_headers)
+    assert response.status_code == 200
+    _assert_rollup_consistent()
+    
+    assert not BookingDailyRollup.query.filter(
+        BookingDailyRollup.project_name.in_(['Rollup Heights', 'Rollup Towers']),
+        BookingDailyRollup.booking_count != 0
+    ).count()
+
+
+def test_rollup_matches_raw_analytics(app, client, auth_headers):
+    """Test that rollup-backed analytics match the raw bookings table."""
+    app.config['ANALYTICS_CACHE_ENABLED'] = False
+    now = datetime.utcnow()
+    ranges = [
+        (None, None, None),
+        (now - timedelta(days=30, hours=3), None, {'status': ['active', 'complete']}),
+        (now - timedelta(hours=1), now + timedelta(hours=1), {'project_name': 'green'}),
+        (None, now + timedelta(days=1), {'property_type': 'BHK'}),
+    ]
+    
+    for start_date, end_date, filters in ranges:
+        results = {}
+        for use_rollup in (True, False):
+            app.config['ANALYTICS_USE_ROLLUP'] = use_rollup
+            results[use_rollup] = json.dumps([
+                AnalyticsService.get_kpi_summary(start_date, end_date, filters),
+                AnalyticsService.get_monthly_trends(start_date, end_date, filters),
+                AnalyticsService.get_project_distribution(start_date, end_date, filters),
+                AnalyticsService.get_status_distribution(start_date, end_date, filters),
+                AnalyticsService.get_property_type_analysis(start_date, end_date, filters),
+                AnalyticsService.get_revenue_trends(start_date, end_date, filters),
+                AnalyticsService.get_dashboard_data(start_date, end_date, filters)
+            ])
+        assert results[True] == results[False]
+
+
+def test_rebuild_rollup_command(app):
+    """Test the rollup rebuild CLI command."""
+    db.session.execute(BookingDailyRollup.__table__.delete())
+    db.session.commit()
+    
+    result = app.test_cli_runner().invoke(args=['analytics', 'rebuild-rollup'])
+    
+    assert result.exit_code == 0
+    assert 'Rebuilt booking_daily_rollup' in result.output
+    assert db.session.query(db.func.sum(BookingDailyRollup.booking_count)).scalar() == Booking.query.count()
+
+
+def test_rollup_tracks_bulk_creation(client, auth_headers):
+    """Test that batched bulk inserts update the rollup and invalidate cached analytics."""
+    kpis = AnalyticsService.get_kpi_summary()
+    timeline = (datetime.utcnow() + timedelta(days=30)).isoformat()
+    bookings = [{
+        'customer_name': f'Bulk {index}', 'contact_number': '9876543210',
+        'project_name': 'Rollup Bulk', 'type': ['2BHK', '3BHK'][index % 2],
+        'area': 1000.0, 'agreement_cost': 5000000.0, 'amount': 4000000.0 + index,
+        'refund_buyer': 1000.0, 'timeline': timeline
+    } for index in range(5)]
+    
+    response = client.post('/api/bookings/bulk', json=bookings, headers=auth_headers)
+    assert response.status_code == 201
+    _assert_rollup_consistent()
+    assert AnalyticsService.get_kpi_summary()['total_bookings'] == kpis['total_bookings'] + 5
+
+
+def test_rollup_tracks_bulk_updates_and_deletes(client, auth_headers):
+    """Test that set-based status updates and bulk hard deletes keep the rollup in sync."""
+    project = Booking.query.first().project_name
+    
+    response = client.patch('/api/bookings/bulk', headers=auth_headers,
+                            json={'filter': {'project_name': project}, 'set': {'status': 'complete'}})
+    assert response.status_code == 200
+    _assert_rollup_consistent()
+    
+    ids = [booking.id for booking in Booking.query.order_by(Booking.id).limit(3)]
+    response = client.patch('/api/bookings/bulk', headers=auth_headers,
+                            json={'ids': ids, 'set': {'status': 'cancelled'}})
+    assert response.status_code == 200
+    _assert_rollup_consistent()
+    
+    response = client.delete('/api/bookings/bulk/hard-delete', headers=auth_headers,
+                             json={'filter': {'status': 'cancelled'}})
+    assert response.status_code == 200
+    _assert_rollup_consistent()
+    kpis = AnalyticsService.get_kpi_summary()
+    assert kpis['total_bookings'] == Booking.query.count()
+
+
+def test_stats_read_booking_counters(app, client, auth_headers):
+    """Test that /stats reports the counters and the check command repairs drift."""
+    response = client.get('/api/bookings/stats', headers=auth_headers)
+    data = json.loads(response.data)
+    
+    bookings = Booking.query.all()
+    assert data['total_bookings'] == len(bookings)
+    assert data['cancelled_bookings'] == sum(booking.status == 'cancelled' for booking in bookings)
+    assert data['total_revenue'] == pytest.approx(
+        sum(float(booking.amount) for booking in bookings if booking.status != 'cancelled')
+    )
+    
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['booking', 'check-counters'])
+    assert result.exit_code == 0
+    assert 'match' in result.output
+    
+    # Drift the counters behind the application's back
+    db.session.execute(BookingCounter.__table__.update().values(booking_count=BookingCounter.booking_count + 5))
+    db.session.commit()
+    
+    result = runner.invoke(args=['booking', 'check-counters'])
+    assert result.exit_code != 0
+    assert '--repair' in result.output
+    
+    result = runner.invoke(args=['booking', 'check-counters', '--repair'])
+    assert result.exit_code == 0
+    assert 'Rebuilt booking_counters' in result.output
+    assert BookingCounter.check() == {}
@@ -0,0 +1,188 @@
+"""Test the optional NumPy columnar analytics engine against SQL."""
+import pytest
+import json
+import random
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models import User, Booking
+from app.analytics.analytics_service import AnalyticsService
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def app():
+    """Create test application with extra bookings spread over two years."""
+    app = create_app('testing')
+    app.config['ANALYTICS_CACHE_ENABLED'] = False
+    with app.app_context():
+        db.create_all()
+
+        rng = random.Random(7)
+        admin = User.query.filter_by(role='admin').first()
+        now = datetime.utcnow()
+        for index in range(200):
+            db.session.add(Booking(
+                customer_name=f'Customer {index}',
+                contact_number='9876543210',
+                project_name=rng.choice(['Green Valley', 'green meadows', 'Sunrise Towers', 'Ocean View']),
+                type=rng.choice(['2BHK', '3BHK', 'Villa']),
+                area=rng.choice([850.5, 1200.25, 1650.0, 2400.75]),
+                agreement_cost=5000000,
+                amount=rng.randint(100000, 9000000) + rng.randint(0, 99) / 100,
+                tax_gst=rng.randint(0, 450000) + rng.randint(0, 99) / 100,
+                timeline=now + timedelta(days=30),
+                status=rng.choice(['active', 'active', 'complete', 'cancelled']),
+                created_at=now - timedelta(days=rng.randint(0, 700), seconds=rng.randint(0, 86399)),
+                created_by=admin.id
+            ))
+        db.session.commit()
+
+        yield app
+        db.drop_all()
+
+
+def _all_sections(start_date=None, end_date=None, filters=None):
+    """Collect every analytics section for comparison."""
+    return json.loads(json.dumps([
+        AnalyticsService.get_kpi_summary(start_date, end_date, filters),
+        AnalyticsService.get_monthly_trends(start_date, end_date, filters),
+        AnalyticsService.get_project_distribution(start_date, end_date, filters),
+        AnalyticsService.get_status_distribution(start_date, end_date, filters),
+        AnalyticsService.get_property_type_analysis(start_date, end_date, filters),
+        AnalyticsService.get_revenue_trends(start_date, end_date, filters, 'quarter'),
+        AnalyticsService.get_revenue_trends(start_date, end_date, filters, 'year'),
+        AnalyticsService.get_dashboard_data(start_date, end_date, filters)
+    ]))
+
+
+def _assert_close(actual, expected):
+    """Compare results exactly, except floats which may differ in the last bits of SQL summation."""
+    if isinstance(expected, dict):
+        assert list(actual) == list(expected)
+        for key in expected:
+            _assert_close(actual[key], expected[key])
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected)
+        for item, expected_item in zip(actual, expected):
+            _assert_close(item, expected_item)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-12)
+    else:
+        assert actual == expected
+
+
+def _assert_engines_match(app, start_date=None, end_date=None, filters=None):
+    """Check the columnar engine against SQL for one set of arguments."""
+    app.config['ANALYTICS_ENGINE'] = 'sql'
+    expected = _all_sections(start_date, end_date, filters)
+    app.config['ANALYTICS_ENGINE'] = 'columnar'
+    _assert_close(_all_sections(start_date, end_date, filters), expected)
+
+
+def test_columnar_matches_sql(app):
+    """Test that the columnar engine returns the same analytics as SQL."""
+    now = datetime.utcnow()
+    cases = [
+        (None, None, None),
+        (now - timedelta(days=90, hours=5), None, {'status': ['active', 'complete']}),
+        (now - timedelta(days=400), now - timedelta(days=20), {'project_name': 'GREEN'}),
+        (None, None, {'property_type': 'bhk', 'status': 'cancelled'}),
+        (None, None, {'min_amount': 2500000.07, 'max_amount': 7000000, 'min_area': 1000.0}),
+        (now + timedelta(days=1), None, None),
+    ]
+
+    for use_rollup in (True, False):
+        app.config['ANALYTICS_USE_ROLLUP'] = use_rollup
+        for start_date, end_date, filters in cases:
+            _assert_engines_match(app, start_date, end_date, filters)
+
+
+def test_columnar_snapshot_refreshes_incrementally(app):
+    """Test that writes reach the snapshot through incremental refreshes."""
+    from app.analytics.columnar import get_snapshot
+
+    app.config['ANALYTICS_ENGINE'] = 'columnar'
+    snapshot = get_snapshot()
+    assert len(snapshot) == Booking.query.count()
+    assert snapshot.full_loads == 1
+
+    booking = Booking.query.order_by(Booking.id).first()
+    booking.project_name = 'Renamed Project'
+    booking.amount = 1234567.89
+    db.session.commit()
+    _assert_engines_match(app)
+    assert snapshot.incremental_loads == 1
+    assert snapshot.full_loads == 1
+
+    # Hard deletes are invisible to the watermark and force a full reload
+    db.session.delete(Booking.query.order_by(Booking.id.desc()).first())
+    db.session.commit()
+    _assert_engines_match(app)
+    assert snapshot.full_loads == 2
+    assert len(snapshot) == Booking.query.count()
+
+
+def test_columnar_falls_back_for_unsupported_filters(app):
+    """Test that filters the snapshot cannot evaluate are answered by SQL."""
+    app.config['ANALYTICS_ENGINE'] = 'columnar'
+
+    kpis = AnalyticsService.get_kpi_summary(filters={'customer_name': 'customer 1'})
+
+    assert kpis['total_bookings'] == Booking.query.filter(Booking.customer_name.ilike('%customer 1%')).count()
+    assert 'columnar_snapshot' not in app.extensions
+
+
+def test_columnar_snapshot_reads_during_refresh():
+    """Test that readers racing full reloads of a different size always see one consistent version."""
+    import threading
+    from types import SimpleNamespace
+    from decimal import Decimal
+    from app.analytics.columnar import BookingSnapshot
+    from app.analytics.filters import BookingFilter
+
+    now = datetime(2024, 6, 1)
+
+    class Session:
+        """Stand-in session returning alternately 10 and 25 active bookings of 1000.00 each."""
+        sizes = [10, 25]
+        calls = 0
+
+        def execute(self, statement):
+            size = self.sizes[self.calls % 2]
+            self.calls += 1
+            rows = [(index, now - timedelta(days=index % 60), 'Green Valley', '2BHK', 'active',
+                     Decimal('1000.00'), Decimal('50.00'), 900.0) for index in range(size)]
+            return SimpleNamespace(all=lambda: rows)
+
+    snapshot = BookingSnapshot()
+    session = Session()
+    snapshot._load(session)
+    spec = BookingFilter(start_date=now - timedelta(days=90), filters={'status': 'active', 'min_amount': 10})
+    stop = threading.Event()
+    errors = []
+
+    def reload():
+        while not stop.is_set():
+            snapshot._load(session)
+
+    def read():
+        try:
+            while not stop.is_set():
+                kpis = snapshot.kpi_row(spec)
+                assert kpis.total_bookings in (10, 25)
+                assert kpis.total_revenue == kpis.total_bookings * Decimal('1000.00')
+                assert sum(row.booking_count for row in snapshot.monthly_rows(spec)) in (10, 25)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reload)] + [threading.Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    threading.Event().wait(1.0)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert session.calls > 10
@@ -0,0 +1,99 @@
+"""Test negotiated response compression."""
+import pytest
+import gzip
+import json
+import zlib
+from app import create_app, db, compression
+
+
+@pytest.fixture
+def app():
+    """Create test application."""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Get admin authentication headers for testing."""
+    response = client.post('/api/auth/demo-login', json={'role': 'admin'})
+
+    assert response.status_code == 200
+    token = json.loads(response.data)['data']['token']
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_json_responses_compressed_above_threshold(client, auth_headers):
+    """Test that large JSON is gzipped on request, small JSON is not, and revalidation still works."""
+    plain = client.get('/api/bookings/?per_page=100', headers=auth_headers)
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    headers = dict(auth_headers, **{'Accept-Encoding': 'gzip, deflate'})
+    response = client.get('/api/bookings/?per_page=100', headers=headers)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) < len(plain.data)
+    assert gzip.decompress(response.data) == plain.data
+
+    # The tag is weakened for the encoded body and still answers If-None-Match
+    etag = response.headers['ETag']
+    assert etag == 'W/' + plain.headers['ETag']
+    revalidated = client.get('/api/bookings/?per_page=100', headers=dict(headers, **{'If-None-Match': etag}))
+    assert revalidated.status_code == 304
+
+    refused = client.get('/api/bookings/?per_page=100', headers=dict(auth_headers, **{'Accept-Encoding': 'gzip;q=0'}))
+    assert 'Content-Encoding' not in refused.headers
+
+    small = client.get('/api/health', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+
+
+def test_streamed_and_static_responses(client, auth_headers):
+    """Test that exports are compressed chunk by chunk and only compressible static files are encoded."""
+    header, rows = client.get('/api/bookings/export?format=csv', headers=auth_headers).data.split(b'\n', 1)
+
+    response = client.get('/api/bookings/export?format=csv', buffered=False,
+                          headers=dict(auth_headers, **{'Accept-Encoding': 'gzip'}))
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+
+    # Each chunk is flushed, so the header row decodes before the rest arrives
+    decoder = zlib.decompressobj(31)
+    chunks = iter(response.response)
+    assert decoder.decompress(next(chunks)) == header + b'\n'
+    body = b''
+    for chunk in chunks:
+        body += decoder.decompress(chunk)
+    assert body == rows
+    response.close()
+
+    css = client.get('/static/css/style.css', headers={'Accept-Encoding': 'gzip'})
+    assert css.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(css.data) == client.get('/static/css/style.css').data
+    css.close()
+
+    logo = client.get('/static/logo.jpg', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in logo.headers
+    logo.close()
+
+
+def test_brotli_preferred_when_installed(client, auth_headers):
+    """Test that brotli is chosen over gzip when both are acceptable."""
+    if compression.brotli is None:
+        pytest.skip('brotli is not installed')
+
+    response = client.get('/api/bookings/?per_page=100',
+                          headers=dict(auth_headers, **{'Accept-Encoding': 'gzip, br'}))
+    assert response.headers['Content-Encoding'] == 'br'
+    assert compression.brotli.decompress(response.data) == client.get(
+        '/api/bookings/?per_page=100', headers=auth_headers).data
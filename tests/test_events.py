@@ -0,0 +1,131 @@
+"""Test the server-sent booking event stream."""
+import pytest
+import json
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.events.broker import get_broker
+
+
+@pytest.fixture
+def app():
+    """Create test application."""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_token(client):
+    """Get an admin JWT for testing."""
+    response = client.post('/api/auth/demo-login', json={'role': 'admin'})
+
+    assert response.status_code == 200
+    return json.loads(response.data)['data']['token']
+
+
+def _open_stream(client, token, **kwargs):
+    """Exchange a JWT for a stream ticket and open an event stream with it."""
+    response = client.post('/api/events/ticket', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 201
+    ticket = json.loads(response.data)['ticket']
+    return client.get(f'/api/events?ticket={ticket}', **kwargs), ticket
+
+
+def _parse_event(message):
+    """Split one server-sent event into (event name, data)."""
+    fields = dict(line.split(': ', 1) for line in message.decode('utf-8').strip().splitlines())
+    return fields['event'], json.loads(fields['data'])
+
+
+def test_event_stream_fans_out_booking_changes(app, client, auth_token):
+    """Test that one producer poll reaches every open stream with the change token and stats."""
+    broker = get_broker()
+    first, _ = _open_stream(client, auth_token, buffered=False)
+    second, _ = _open_stream(client, auth_token, buffered=False)
+    assert first.status_code == 200
+    assert first.mimetype == 'text/event-stream'
+    streams = [iter(first.response), iter(second.response)]
+    assert [next(stream) for stream in streams] == [b'retry: 5000\n\n'] * 2
+    assert broker.subscriber_count == 2
+
+    assert broker.poll_once()
+    assert not broker.poll_once()
+
+    response = client.post('/api/bookings/', headers={'Authorization': f'Bearer {auth_token}'}, json={
+        'customer_name': 'Event Buyer',
+        'contact_number': '9876543210',
+        'project_name': 'Event Heights',
+        'type': '2BHK',
+        'area': 1000.0,
+        'agreement_cost': 4000000.0,
+        'amount': 3900000.0,
+        'timeline': (datetime.utcnow() + timedelta(days=30)).isoformat()
+    })
+    assert response.status_code == 201
+    assert broker.poll_once()
+
+    stats = json.loads(client.get('/api/bookings/stats', headers={'Authorization': f'Bearer {auth_token}'}).data)
+    for stream in streams:
+        _parse_event(next(stream))
+        event, data = _parse_event(next(stream))
+        assert event == 'bookings'
+        assert data['stats'] == stats
+
+    # The pushed token resumes the change feed right after the new booking
+    changes = client.get(f"/api/bookings/changes?since={data['token']}",
+                         headers={'Authorization': f'Bearer {auth_token}'})
+    assert json.loads(changes.data)['bookings'] == []
+
+    first.close()
+    second.close()
+    assert broker.subscriber_count == 0
+
+
+def test_event_stream_access(app, client, auth_token):
+    """Test ticket authentication, the subscriber limit and resync of stalled streams."""
+    assert client.get('/api/events').status_code == 401
+    assert client.get('/api/events?ticket=invalid').status_code == 401
+    assert client.post('/api/events/ticket').status_code == 401
+    # A JWT in the URL is not accepted
+    assert client.get(f'/api/events?access_token={auth_token}').status_code == 401
+
+    broker = get_broker()
+    broker.max_subscribers = 1
+    stream, ticket = _open_stream(client, auth_token, buffered=False)
+    assert stream.status_code == 200
+    # Tickets are single use
+    assert client.get(f'/api/events?ticket={ticket}').status_code == 401
+    assert _open_stream(client, auth_token)[0].status_code == 503
+
+    messages = iter(stream.response)
+    next(messages)
+    for index in range(broker.queue_size + 1):
+        broker.publish('bookings', {'index': index})
+    assert _parse_event(next(messages)) == ('resync', {})
+    stream.close()
+
+    # Tickets not redeemed in time are refused
+    app.config['EVENTS_TICKET_TTL'] = 0
+    response = client.post('/api/events/ticket', headers={'Authorization': f'Bearer {auth_token}'})
+    assert client.get(f"/api/events?ticket={json.loads(response.data)['ticket']}").status_code == 401
+
+
+def test_event_stream_ends_when_token_expires(app, client):
+    """Test that a stream is closed with an expired event once its access token lapses."""
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(seconds=2)
+    login = client.post('/api/auth/demo-login', json={'role': 'sales'})
+    stream, _ = _open_stream(client, json.loads(login.data)['data']['token'], buffered=False)
+    assert stream.status_code == 200
+
+    messages = [message for message in stream.response if not message.startswith((b'retry', b':'))]
+    assert [_parse_event(message) for message in messages] == [('expired', {})]
+    assert get_broker().subscriber_count == 0
+    stream.close()